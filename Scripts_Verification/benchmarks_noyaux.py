@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+BENCHMARKS DES NOYAUX (portes, reverse-and-add, appartenance, fermeture)
+=======================================================================
+
+Les seules mesures de performance sont aujourd'hui dispersées dans les
+JSON de résultats (vitesse_scan_par_sec : 317506 pour K8) ou écrites en
+dur dans les affichages. Avant de lancer des heures de calcul sur K10,
+on veut savoir si le chemin critique a régressé.
+
+Pour chaque k, sur une sous-plage fixe [10^(k-1), 10^(k-1) + taille) :
+- porte_chaine     : calculer_porte_generale (chaîne → liste → tuple)
+- porte_codec      : code_porte_nombre (octets ASCII de str(n))
+- porte_tables     : codes par tables (noyau_portes)
+- reverse_and_add  : n + int(str(n)[::-1])
+- reverse_and_add_lot : une étape T vectorisée (lot_reverse_and_add, NumPy)
+- appartenance_bitmap / appartenance_store : test d'un code dans K_k
+- chargement_portes : charger_portes_k (JSON, ou .bin s'il est à jour)
+- fermeture_tranche : scanner_tranche sur la sous-plage (S = K3..K_(k+1))
+- fermeture_portes  : calculer_fermeture_portes sur tout K_k
+
+Chaque mesure, en opérations/s : le noyau est appelé en boucle jusqu'à
+durer au moins --duree-min secondes (les noyaux k=3 prennent 0.1 ms :
+une mesure isolée n'est que du bruit), puis le meilleur de
+--repetitions passages est retenu, ramasse-miettes suspendu, comme
+timeit. Les passages sont entrelacés (un tour = un passage de chaque noyau) : une période de
+machine chargée ne pénalise pas tous les passages d'un même noyau.
+Un étalon (travail fixe en pur Python) est mesuré dans les mêmes tours :
+la comparaison divise chaque ratio par celui de l'étalon, ce qui annule
+un ralentissement de toute la machine (hôte partagé, fréquence CPU).
+Le bruit d'un noyau est l'écart entre son passage médian et le meilleur.
+
+Historique : une ligne JSON par exécution (historique_benchmarks.jsonl).
+Comparaison avec la dernière référence explicite de mêmes paramètres
+(ligne marquée par --definir-reference ; sans elle, pas de
+comparaison) ; un noyau plus lent de plus de --tolerance et de son
+bruit (le plus grand des deux, mesuré ou de référence) est une
+régression : code de sortie 1.
+
+Utilisation :
+    python benchmarks_noyaux.py --definir-reference
+    python benchmarks_noyaux.py                      # compare à la référence
+    python benchmarks_noyaux.py --k 7 8 --noyaux porte_codec reverse_and_add --taille 500000
+
+Date : octobre 2025
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+
+from codec_portes import code_porte_nombre
+from moteur_fermeture_portes import (DOSSIER_PORTES_DEFAUT, calculer_fermeture_portes, charger_portes_k,
+                                     charger_portes_par_k)
+from noyau_portes import codes_plage
+from stockage_portes import StorePortes, chemin_store
+from verifier_fermeture_k8_exhaustif import calculer_porte_generale, reverse_add
+
+try:
+    import numpy as np
+except ImportError:  # Sans NumPy : reverse_and_add_lot est ignoré
+    np = None
+
+TAILLE_DEFAUT = 200_000
+REPETITIONS_DEFAUT = 5
+DUREE_MIN_DEFAUT = 0.2
+TOLERANCE_DEFAUT = 0.10
+HISTORIQUE_DEFAUT = Path("historique_benchmarks.jsonl")
+
+ETALON = "etalon"
+NOYAUX = ("porte_chaine", "porte_codec", "porte_tables", "reverse_and_add", "reverse_and_add_lot",
+          "appartenance_bitmap", "appartenance_store", "chargement_portes",
+          "fermeture_tranche", "fermeture_portes")
+
+
+def etalon() -> dict:
+    """Travail fixe en pur Python (boucle, str, dict), indépendant du code mesuré."""
+    sommes = {}
+    for n in range(10_000, 30_000):
+        s = str(n)
+        sommes[s[0]] = sommes.get(s[0], 0) + int(s[::-1])
+    return sommes
+
+
+def _chronometrer(fonction, boucles: int) -> float:
+    """Durée de `boucles` appels, ramasse-miettes suspendu (comme timeit)."""
+    actif = gc.isenabled()
+    gc.disable()
+    try:
+        debut = time.perf_counter()
+        for _ in range(boucles):
+            fonction()
+        return time.perf_counter() - debut
+    finally:
+        if actif:
+            gc.enable()
+
+
+def calibrer(fonction, duree_min: float = DUREE_MIN_DEFAUT):
+    """(appels par passage pour durer au moins duree_min, durée de ce premier passage)"""
+    boucles = 1
+    while True:
+        duree = _chronometrer(fonction, boucles)
+        if duree >= duree_min:
+            return boucles, duree
+        boucles *= 2 if duree <= 0 else min(max(2, int(duree_min / duree * 1.2)), 1000)
+
+
+def mesure(operations: int, boucles: int, meilleure: float, mediane: float = None) -> dict:
+    """bruit = écart relatif entre le passage médian et le meilleur."""
+    duree = meilleure / boucles
+    return {"secondes": round(duree, 9), "operations": operations, "boucles": boucles,
+            "ops_par_sec": round(operations / duree, 1) if duree > 0 else None,
+            "bruit": round(mediane / meilleure - 1, 4) if mediane and meilleure > 0 else 0.0}
+
+
+def mesurer(fonction, operations: int, repetitions: int = REPETITIONS_DEFAUT,
+            duree_min: float = DUREE_MIN_DEFAUT) -> dict:
+    """Durée d'un appel de fonction() (meilleur passage) ; operations = travail d'un appel."""
+    boucles, duree = calibrer(fonction, duree_min)
+    durees = [duree] + [_chronometrer(fonction, boucles) for _ in range(repetitions - 1)]
+    return mesure(operations, boucles, min(durees), statistics.median(durees))
+
+
+def preparer_noyaux(k: int, taille: int, dossier: Path) -> dict:
+    """{nom: (fonction, opérations)} pour la dimension k ; les noyaux sans données sont absents."""
+    debut = 10 ** (k - 1)
+    fin = min(10 ** k, debut + taille)
+    nombres = range(debut, fin)
+    operations = fin - debut
+    noyaux = {}
+
+    noyaux["porte_chaine"] = (lambda: [calculer_porte_generale(n) for n in nombres], operations)
+    noyaux["porte_codec"] = (lambda: [code_porte_nombre(n, k) for n in nombres], operations)
+    noyaux["porte_tables"] = (lambda: list(codes_plage(k, debut, fin)), operations)
+    noyaux["reverse_and_add"] = (lambda: [reverse_add(n) for n in nombres], operations)
+
+    if np is not None:
+        from lot_reverse_and_add import etape_lot, inverser_lignes, matrice_depuis_entiers
+        D, L = matrice_depuis_entiers(np.arange(debut, fin), capacite=k + 2)
+        noyaux["reverse_and_add_lot"] = (lambda: etape_lot(D, L, inverser_lignes(D, L)), operations)
+
+    ensemble, _ = charger_portes_k(k, dossier)
+    if ensemble is None:
+        return noyaux
+
+    noyaux["chargement_portes"] = (lambda: charger_portes_k(k, dossier), len(ensemble))
+    codes = list(codes_plage(k, debut, fin))
+    noyaux["appartenance_bitmap"] = (lambda: sum(1 for c in codes if c in ensemble), operations)
+
+    if chemin_store(k, dossier).exists():
+        def appartenance_store():
+            with StorePortes(chemin_store(k, dossier)) as store:
+                tableau, nombre = store.codes, len(store)
+                total = 0
+                for c in codes:
+                    i = bisect_left(tableau, c)
+                    total += i < nombre and tableau[i] == c
+                return total
+        noyaux["appartenance_store"] = (appartenance_store, operations)
+
+    from scanner_parallele import _initialiser_worker, charger_ensembles, scanner_tranche
+    ensembles = charger_ensembles(k, dossier)
+
+    def fermeture_tranche():
+        _initialiser_worker(k, ensembles)
+        return scanner_tranche(k, debut, fin)
+    noyaux["fermeture_tranche"] = (fermeture_tranche, operations)
+
+    ensembles_par_k = charger_portes_par_k((k, k + 1), dossier)
+    noyaux["fermeture_portes"] = (lambda: calculer_fermeture_portes(ensemble, k, ensembles_par_k), len(ensemble))
+    return noyaux
+
+
+def executer_benchmarks(dimensions, noyaux_choisis=NOYAUX, taille: int = TAILLE_DEFAUT,
+                        repetitions: int = REPETITIONS_DEFAUT, dossier: Path = DOSSIER_PORTES_DEFAUT,
+                        afficher: bool = True, duree_min: float = DUREE_MIN_DEFAUT) -> dict:
+    """
+    Calibre chaque noyau, puis `repetitions` - 1 tours d'un passage par
+    noyau (étalon compris).
+
+    Returns: {"etalon": mesure, "k{k}/{noyau}": mesure}
+    """
+    taches = {ETALON: [etalon, 20_000, *calibrer(etalon, duree_min), []]}
+    for k in dimensions:
+        noyaux = preparer_noyaux(k, taille, dossier)
+        for nom in noyaux_choisis:
+            if nom in noyaux:
+                fonction, operations = noyaux[nom]
+                boucles, duree = calibrer(fonction, duree_min)
+                taches[f"k{k}/{nom}"] = [fonction, operations, boucles, duree, []]
+    for tache in taches.values():
+        tache[4].append(tache[3])
+    for _ in range(repetitions - 1):
+        for tache in taches.values():
+            tache[4].append(_chronometrer(tache[0], tache[2]))
+
+    resultats = {}
+    for cle, (_, operations, boucles, _, durees) in taches.items():
+        resultats[cle] = mesure(operations, boucles, min(durees), statistics.median(durees))
+        if afficher:
+            libelle = cle if cle == ETALON else "k={} {}".format(cle.split("/")[0][1:], cle.split("/")[1])
+            print(f"   {libelle:<26} {resultats[cle]['ops_par_sec']:>15,.0f} ops/s "
+                  f"({resultats[cle]['secondes']:.6f}s × {boucles}, bruit {resultats[cle]['bruit']:.0%})")
+    return resultats
+
+
+def machine() -> dict:
+    return {
+        "python": platform.python_version(),
+        "plateforme": platform.platform(),
+        "processeur": platform.processor() or platform.machine(),
+        "coeurs": os.cpu_count(),
+        "numpy": np.__version__ if np is not None else None,
+    }
+
+
+def lire_historique(chemin: Path) -> list:
+    if not chemin.exists():
+        return []
+    entrees = []
+    with open(chemin, 'r', encoding='utf-8') as f:
+        for ligne in f:
+            if ligne.strip():
+                entrees.append(json.loads(ligne))
+    return entrees
+
+
+def ajouter_historique(chemin: Path, entree: dict):
+    with open(chemin, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entree, ensure_ascii=False) + "\n")
+
+
+def trouver_reference(historique: list, parametres: dict):
+    """Dernière entrée marquée par --definir-reference aux mêmes paramètres (None sinon)."""
+    marquees = [e for e in historique if e.get("parametres") == parametres and e.get("reference")]
+    return marquees[-1] if marquees else None
+
+
+def _ratio(mesure: dict, ancienne: dict):
+    if not mesure or not ancienne or not mesure.get("ops_par_sec") or not ancienne.get("ops_par_sec"):
+        return None
+    return mesure["ops_par_sec"] / ancienne["ops_par_sec"]
+
+
+def comparer(resultats: dict, reference: dict, tolerance: float = TOLERANCE_DEFAUT):
+    """
+    (facteur machine, [(noyau, ratio corrigé, régression)]) pour les noyaux
+    mesurés des deux côtés ; facteur = ratio de l'étalon (1 s'il manque).
+    Seuil de régression : 1 - max(tolerance, bruit des deux mesures).
+    """
+    facteur = _ratio(resultats.get(ETALON), reference["resultats"].get(ETALON)) or 1.0
+    comparaison = []
+    for nom, mesure in resultats.items():
+        ratio = _ratio(mesure, reference["resultats"].get(nom))
+        if nom == ETALON or ratio is None:
+            continue
+        ratio /= facteur
+        seuil = max(tolerance, mesure.get("bruit", 0.0), reference["resultats"][nom].get("bruit", 0.0))
+        comparaison.append((nom, ratio, ratio < 1 - seuil))
+    return facteur, comparaison
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks des noyaux, avec historique et référence")
+    parser.add_argument("--k", type=int, nargs="+", default=list(range(3, 10)))
+    parser.add_argument("--noyaux", nargs="+", choices=NOYAUX, default=list(NOYAUX))
+    parser.add_argument("--taille", type=int, default=TAILLE_DEFAUT, help="nombres par sous-plage")
+    parser.add_argument("--repetitions", type=int, default=REPETITIONS_DEFAUT, help="passages (meilleur retenu)")
+    parser.add_argument("--duree-min", type=float, default=DUREE_MIN_DEFAUT,
+                        help="secondes minimales d'un passage (le noyau est répété)")
+    parser.add_argument("--dossier", type=Path, default=DOSSIER_PORTES_DEFAUT)
+    parser.add_argument("--historique", type=Path, default=HISTORIQUE_DEFAUT)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE_DEFAUT,
+                        help="baisse relative tolérée (0.10 = 10%%)")
+    parser.add_argument("--definir-reference", action="store_true", help="marquer cette exécution comme référence")
+    parser.add_argument("--sans-historique", action="store_true", help="ne rien écrire")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print(f"⏱️  BENCHMARKS DES NOYAUX - k={args.k} - {args.taille:,} nombres par plage")
+    print("=" * 70 + "\n")
+
+    parametres = {"taille": args.taille, "repetitions": args.repetitions, "duree_min": args.duree_min}
+    reference = trouver_reference(lire_historique(args.historique), parametres)
+
+    resultats = executer_benchmarks(args.k, args.noyaux, args.taille, args.repetitions, args.dossier,
+                                    duree_min=args.duree_min)
+    entree = {
+        "date": datetime.now().isoformat(),
+        "machine": machine(),
+        "parametres": parametres,
+        "reference": args.definir_reference,
+        "resultats": resultats,
+    }
+    if not args.sans_historique:
+        ajouter_historique(args.historique, entree)
+        print(f"\n💾 Historique : {args.historique}")
+
+    regressions = []
+    if reference is None:
+        print("📏 Aucune référence (--definir-reference) aux mêmes paramètres : pas de comparaison")
+    else:
+        print(f"📏 Référence du {reference['date']}")
+        if reference.get("machine") != entree["machine"]:
+            print("   ⚠️  machine différente : comparaison indicative")
+        facteur, comparaison = comparer(resultats, reference, args.tolerance)
+        print(f"   étalon ×{facteur:.2f} : ratios ci-dessous divisés par ce facteur")
+        for nom, ratio, regression in comparaison:
+            marque = "❌" if regression else ("🚀" if ratio > 1 + args.tolerance else "  ")
+            print(f"   {marque} {nom:<30} ×{ratio:.2f}")
+            if regression:
+                regressions.append(nom)
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) au-delà de {args.tolerance:.0%} et du bruit\n")
+        sys.exit(1)
+    print("\n✅ Aucune régression\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CACHE DES ENSEMBLES DE PORTES PRÉTRAITÉS (clé : SHA-256 de la source)
+=====================================================================
+
+Chaque script reparsait le JSON au démarrage et reconstruisait les
+portes : les scripts K3-K6 recomposaient les portes symétriques à partir
+des demi-portes de portes_par_longueur (extraire_portes_par_k, retiré
+depuis), bitmaps_ensemble_S réencode tout, charger_portes_k relit
+K{k}_portes.json porte par porte.
+
+Ici, le résultat du prétraitement (un BitmapPortes ou CodesPortes par k)
+est écrit une fois dans un fichier .cache à côté de la source, avec
+l'empreinte SHA-256 du fichier source (K9_portes.json →
+K9_portes.json.cache). Au lancement suivant : hachage de
+la source (quelques ms), puis lecture des bitmaps tels quels ; la source
+n'est reparsée que si son contenu a changé (pas sa date : une copie ou
+un checkout ne l'invalide pas).
+
+Format .cache (petit-boutiste) :
+- en-tête : b"LYCACHEP", version, nombre de k, SHA-256 (32 octets),
+  taille de la source
+- une entrée par k : k, type (0 bitmap, 1 codes triés), largeur d'un
+  code, nombre de portes, taille de la section
+- les sections, alignées sur 8 octets : bits du bitmap, ou codes
+  (uint64, ou entiers de `largeur` octets au-delà de 64 bits)
+
+Le type suit la densité (codec_portes.est_dense), pas la dimension : un
+k creux (2 portes de S parmi 4·10^7 codes pour k=12) est écrit en codes
+et relu en CodesPortes, sans bitmap à allouer ni à parcourir. Version 2 :
+les caches de version 1 (bitmaps de 3 et 6 Mo pour k=11, 12) sont
+reconstruits.
+
+Les deux formes de portes se déduisent des codes (CachePortes) :
+- complète : les k sommes, milieu doublé (portes_S_completes)
+- demie : format portes_par_longueur de ensemble_S_ferme.json
+
+Utilisation :
+    cache = cache_ensemble_S("../ensemble_S_ferme.json")
+    bitmaps_S = cache.ensembles
+    S_k5 = cache.portes_S_completes(5)
+
+    python cache_portes.py construire ../ensemble_S_ferme.json ../Donnees_portes/K*/K*_portes.json
+    python cache_portes.py info ../ensemble_S_ferme.json.cache
+
+Date : octobre 2025
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from pathlib import Path
+
+from codec_portes import (BitmapPortes, CodesPortes, bitmaps_ensemble_S, decoder_porte_S,
+                          ensemble_depuis_codes, ensemble_depuis_portes, est_dense, taille_espace)
+from moteur_fermeture_portes import DOSSIER_PORTES_DEFAUT
+from stockage_portes import StorePortes, lire_portes_json
+
+MAGIC = b"LYCACHEP"
+VERSION_CACHE = 2
+# magic, version, nombre de k, réservé, sha256, taille de la source
+FORMAT_ENTETE = "<8sHHI32sQ"
+# k, type, largeur, nombre de portes, octets de la section
+FORMAT_ENTREE = "<HHIQQ"
+TAILLE_ENTETE = struct.calcsize(FORMAT_ENTETE)
+TAILLE_ENTREE = struct.calcsize(FORMAT_ENTREE)
+TYPE_BITMAP, TYPE_CODES = 0, 1
+
+
+def empreinte_sha256(chemin: Path) -> bytes:
+    h = hashlib.sha256()
+    with open(chemin, 'rb') as f:
+        for bloc in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloc)
+    return h.digest()
+
+
+def chemin_cache(source: Path, dossier_cache: Path = None) -> Path:
+    """ensemble_S_ferme.json → ensemble_S_ferme.json.cache (même dossier par défaut)."""
+    source = Path(source)
+    return Path(dossier_cache or source.parent) / (source.name + ".cache")
+
+
+def _largeur_code(k: int) -> int:
+    return max(1, ((taille_espace(k) - 1).bit_length() + 7) // 8)
+
+
+def ecrire_cache(chemin: Path, empreinte: bytes, taille_source: int, ensembles: dict):
+    """Écrit {k: BitmapPortes/CodesPortes} (écriture atomique)."""
+    entrees, sections = [], []
+    for k in sorted(ensembles):
+        ensemble = ensembles[k]
+        if isinstance(ensemble, BitmapPortes) and est_dense(len(ensemble), k):
+            type_section, largeur, donnees = TYPE_BITMAP, 0, bytes(ensemble.bits)
+        else:
+            largeur = _largeur_code(k)
+            codes = list(ensemble.codes())
+            if largeur <= 8:
+                largeur = 8
+                tableau = array('Q', codes)
+                if sys.byteorder != "little":
+                    tableau.byteswap()
+                donnees = tableau.tobytes()
+            else:
+                donnees = b"".join(c.to_bytes(largeur, "little") for c in codes)
+            type_section = TYPE_CODES
+        entrees.append(struct.pack(FORMAT_ENTREE, k, type_section, largeur, len(ensemble), len(donnees)))
+        sections.append(donnees)
+
+    chemin = Path(chemin)
+    temporaire = chemin.with_name(chemin.name + ".tmp")
+    with open(temporaire, 'wb') as f:
+        f.write(struct.pack(FORMAT_ENTETE, MAGIC, VERSION_CACHE, len(entrees), 0, empreinte, taille_source))
+        for entree in entrees:
+            f.write(entree)
+        position = TAILLE_ENTETE + TAILLE_ENTREE * len(entrees)
+        for donnees in sections:
+            remplissage = (-position) % 8
+            f.write(b"\0" * remplissage)
+            f.write(donnees)
+            position += remplissage + len(donnees)
+    os.replace(temporaire, chemin)
+
+
+def lire_entete(donnees: bytes) -> dict:
+    magic, version, nb_k, _, empreinte, taille_source = struct.unpack_from(FORMAT_ENTETE, donnees, 0)
+    if magic != MAGIC:
+        raise ValueError("pas un fichier de cache de portes")
+    if version != VERSION_CACHE:
+        raise ValueError(f"version de cache inconnue : {version}")
+    entrees = [struct.unpack_from(FORMAT_ENTREE, donnees, TAILLE_ENTETE + i * TAILLE_ENTREE)
+               for i in range(nb_k)]
+    return {"empreinte": empreinte, "taille_source": taille_source, "entrees": entrees}
+
+
+def lire_cache(chemin: Path, empreinte: bytes = None):
+    """
+    {k: ensemble} depuis un .cache, ou None s'il est absent, illisible,
+    ou construit depuis une autre source que `empreinte`.
+    """
+    try:
+        with open(chemin, 'rb') as f:
+            donnees = f.read()
+        entete = lire_entete(donnees)
+    except (OSError, ValueError, struct.error):
+        return None
+    if empreinte is not None and entete["empreinte"] != empreinte:
+        return None
+
+    ensembles = {}
+    vue = memoryview(donnees)
+    position = TAILLE_ENTETE + TAILLE_ENTREE * len(entete["entrees"])
+    for k, type_section, largeur, nombre, octets in entete["entrees"]:
+        position += (-position) % 8
+        section = vue[position:position + octets]
+        position += octets
+        if type_section == TYPE_BITMAP:
+            ensembles[k] = BitmapPortes(k, bytearray(section))
+            continue
+        if largeur == 8:
+            codes = array('Q')
+            codes.frombytes(section)
+            if sys.byteorder != "little":
+                codes.byteswap()
+        else:
+            codes = (int.from_bytes(section[i:i + largeur], "little") for i in range(0, octets, largeur))
+        ensembles[k] = CodesPortes(k, codes)
+    return ensembles
+
+
+class CachePortes:
+    """Ensembles {k: BitmapPortes/CodesPortes} d'une source, et leurs deux formes de portes."""
+
+    def __init__(self, source: Path, ensembles: dict, empreinte: bytes, depuis_cache: bool, duree: float):
+        self.source = Path(source)
+        self.ensembles = ensembles
+        self.empreinte = empreinte.hex()
+        self.depuis_cache = depuis_cache
+        self.duree = duree
+
+    def portes(self, k: int) -> set:
+        """Portes au format K*_portes.json (milieu brut)."""
+        ensemble = self.ensembles.get(k)
+        return set(ensemble.portes()) if ensemble is not None else set()
+
+    def portes_S_completes(self, k: int) -> set:
+        """Vecteurs complets des k sommes (milieu doublé), en tuples."""
+        ensemble = self.ensembles.get(k)
+        return {decoder_porte_S(c, k) for c in ensemble.codes()} if ensemble is not None else set()
+
+    def portes_S_demi(self, k: int) -> list:
+        """Demi-portes, milieu doublé (portes_par_longueur de ensemble_S_ferme.json)."""
+        ensemble = self.ensembles.get(k)
+        if ensemble is None:
+            return []
+        h = k // 2
+        return [list(p[:h]) + ([2 * p[h]] if k % 2 == 1 else []) for p in ensemble.portes()]
+
+    def toutes_portes_S_completes(self) -> set:
+        """portes_S_completes, toutes dimensions confondues."""
+        return set().union(*(self.portes_S_completes(k) for k in self.ensembles))
+
+    def __repr__(self) -> str:
+        origine = "cache" if self.depuis_cache else "reconstruit"
+        return f"CachePortes({self.source.name}, k={sorted(self.ensembles)}, {origine}, {self.duree * 1000:.1f} ms)"
+
+
+def charger_avec_cache(source: Path, construire, dossier_cache: Path = None,
+                       reconstruire: bool = False) -> CachePortes:
+    """
+    construire(source) → {k: ensemble}, appelé seulement si le cache est
+    absent ou d'une autre empreinte. Un dossier non inscriptible n'empêche
+    pas le chargement (le cache n'est simplement pas écrit).
+    """
+    debut = time.perf_counter()
+    source = Path(source)
+    empreinte = empreinte_sha256(source)
+    cache = chemin_cache(source, dossier_cache)
+    ensembles = None if reconstruire else lire_cache(cache, empreinte)
+    depuis_cache = ensembles is not None
+    if not depuis_cache:
+        ensembles = construire(source)
+        try:
+            ecrire_cache(cache, empreinte, source.stat().st_size, ensembles)
+        except OSError:
+            pass
+    return CachePortes(source, ensembles, empreinte, depuis_cache, time.perf_counter() - debut)
+
+
+def _construire_S(source: Path) -> dict:
+    with open(source, 'r', encoding='utf-8') as f:
+        return bitmaps_ensemble_S(json.load(f))
+
+
+def _construire_K(source: Path) -> dict:
+    if source.suffix == ".bin":
+        with StorePortes(source) as store:
+            return {store.k: ensemble_depuis_codes(store.codes, store.k)}
+    k, portes, _ = lire_portes_json(source)
+    return {k: ensemble_depuis_portes(portes, k)}
+
+
+def cache_ensemble_S(fichier_S: Path, dossier_cache: Path = None, reconstruire: bool = False) -> CachePortes:
+    """ensemble_S_ferme.json → toutes les dimensions de S (convention milieu doublé)."""
+    return charger_avec_cache(fichier_S, _construire_S, dossier_cache, reconstruire)
+
+
+def source_portes_k(k: int, dossier: Path = DOSSIER_PORTES_DEFAUT):
+    """Fichier que lirait charger_portes_k : le .bin s'il est à jour, sinon le JSON (None si absent)."""
+    json_path = Path(dossier) / f"K{k}" / f"K{k}_portes.json"
+    bin_path = json_path.with_suffix(".bin")
+    if bin_path.exists() and (not json_path.exists()
+                              or bin_path.stat().st_mtime >= json_path.stat().st_mtime):
+        return bin_path
+    return json_path if json_path.exists() else None
+
+
+def cache_portes_k(k: int, dossier: Path = DOSSIER_PORTES_DEFAUT, dossier_cache: Path = None,
+                   reconstruire: bool = False):
+    """K{k}_portes → CachePortes d'une seule dimension, ou None si K_k est absent."""
+    source = source_portes_k(k, dossier)
+    if source is None:
+        return None
+    return charger_avec_cache(source, _construire_K, dossier_cache, reconstruire)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache binaire des ensembles de portes")
+    sous = parser.add_subparsers(dest="commande", required=True)
+
+    p_cons = sous.add_parser("construire", help="(re)construire le cache de chaque source")
+    p_cons.add_argument("sources", type=Path, nargs="+", help="ensemble_S_ferme.json ou K*_portes.json/.bin")
+    p_cons.add_argument("--dossier-cache", type=Path, default=None)
+    p_cons.add_argument("--forcer", action="store_true", help="reconstruire même si l'empreinte correspond")
+
+    p_info = sous.add_parser("info", help="en-tête d'un fichier .cache")
+    p_info.add_argument("fichier", type=Path)
+
+    args = parser.parse_args()
+
+    if args.commande == "info":
+        with open(args.fichier, 'rb') as f:
+            entete = lire_entete(f.read())
+        print(f"🔑 SHA-256 source : {entete['empreinte'].hex()} ({entete['taille_source']:,} octets)")
+        for k, type_section, largeur, nombre, octets in entete["entrees"]:
+            nature = "bitmap" if type_section == TYPE_BITMAP else f"codes {largeur} octets"
+            print(f"   k={k}: {nombre:,} portes, {nature}, {octets:,} octets")
+        return
+
+    print("\n" + "=" * 70)
+    print("🗄️  CACHE DES ENSEMBLES DE PORTES")
+    print("=" * 70 + "\n")
+
+    for source in args.sources:
+        construire = _construire_S if source.suffix == ".json" and not source.stem.startswith("K") else _construire_K
+        cache = charger_avec_cache(source, construire, args.dossier_cache, args.forcer)
+        relu = charger_avec_cache(source, construire, args.dossier_cache)
+        etat = "à jour" if cache.depuis_cache else "construit"
+        print(f"✅ {source.name}: {etat}, {sum(len(e) for e in cache.ensembles.values()):,} portes "
+              f"(k={min(cache.ensembles)}..{max(cache.ensembles)}) - "
+              f"{cache.duree * 1000:.1f} ms, relecture {relu.duree * 1000:.1f} ms")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CODAGE ENTIER DES PORTES + BITMAP D'APPARTENANCE
+================================================
+
+Une porte π_k(n) = (s₁, ..., s_h[, milieu]) a :
+- h = k // 2 composantes s_j ∈ [0, 18] (sommes de paires)
+- pour k impair, un chiffre du milieu ∈ [0, 9]
+
+Elle tient donc dans UN entier en base mixte (19, ..., 19[, 10]),
+première composante en poids fort :
+
+    k=8 : code = ((s₁·19 + s₂)·19 + s₃)·19 + s₄        < 19⁴ = 130,321
+    k=9 : code = (((s₁·19 + s₂)·19 + s₃)·19 + s₄)·10 + m  < 19⁴·10 = 1,303,210
+
+Un ensemble de portes K_k devient un bitmap de taille_espace(k) bits :
+- K8 : 16 KB, K9 : 163 KB (au lieu de centaines de MB de tuples)
+- test d'appartenance = un accès à un bytearray, sans tuple ni hachage
+- au-delà de LIMITE_BITMAP_BITS (longues portes de ensemble_S, k ≤ 41),
+  CodesPortes garde la même interface sur un set d'entiers
+- construit depuis des portes connues (ensemble_depuis_codes), un
+  ensemble creux (densité < 1/64, est_dense) est aussi un CodesPortes :
+  les 2-4 portes par k de ensemble_S n'ont pas à remplir un bitmap de
+  6 Mo (k=12)
+
+Deux conventions coexistent dans les données :
+- K*_portes.json : milieu = chiffre brut (0..9)        → encoder_porte
+- ensemble_S_ferme.json / scripts K3-K6 : milieu doublé → encoder_porte_S
+
+Date : octobre 2025
+"""
+
+BASE_PAIRE = 19
+BASE_MILIEU = 10
+
+# Au-delà (k ≥ 13 : 19⁶·10 bits = 59 MB), on passe à un set de codes entiers
+LIMITE_BITMAP_BITS = 1 << 28
+
+
+def bases_porte(k: int) -> list:
+    """Bases de chaque composante de la porte (poids fort en tête)."""
+    bases = [BASE_PAIRE] * (k // 2)
+    if k % 2 == 1:
+        bases.append(BASE_MILIEU)
+    return bases
+
+
+def poids_porte(k: int) -> list:
+    """Poids de chaque composante : code = Σ porte[j] · poids[j]."""
+    bases = bases_porte(k)
+    poids = [1] * len(bases)
+    for j in range(len(bases) - 2, -1, -1):
+        poids[j] = poids[j + 1] * bases[j + 1]
+    return poids
+
+
+def taille_espace(k: int) -> int:
+    """Nombre de codes possibles pour la dimension k."""
+    taille = 1
+    for b in bases_porte(k):
+        taille *= b
+    return taille
+
+
+def encoder_porte(porte, k: int) -> int:
+    """Porte (format K*_portes.json) → code entier."""
+    bases = bases_porte(k)
+    if len(porte) != len(bases):
+        raise ValueError(f"Porte de longueur {len(porte)} au lieu de {len(bases)} pour k={k} : {porte}")
+    code = 0
+    for valeur, base in zip(porte, bases):
+        if not 0 <= valeur < base:
+            raise ValueError(f"Composante {valeur} hors de [0, {base - 1}] pour k={k} : {porte}")
+        code = code * base + valeur
+    return code
+
+
+def decoder_porte(code: int, k: int) -> tuple:
+    """Code entier → porte (format K*_portes.json)."""
+    bases = bases_porte(k)
+    porte = [0] * len(bases)
+    for j in range(len(bases) - 1, -1, -1):
+        code, porte[j] = divmod(code, bases[j])
+    return tuple(porte)
+
+
+def encoder_porte_S(porte_S, k: int) -> int:
+    """
+    Porte au format ensemble_S (milieu doublé) → code entier.
+
+    Accepte la demi-porte de portes_par_longueur comme le vecteur complet
+    des k sommes (calculer_porte_k3 / calculer_porte des scripts K3-K6).
+    """
+    h = k // 2
+    porte = list(porte_S[:h])
+    if k % 2 == 1:
+        double = porte_S[h]
+        if double % 2 != 0:
+            raise ValueError(f"Milieu doublé impair pour k={k} : {porte_S}")
+        porte.append(double // 2)
+    return encoder_porte(porte, k)
+
+
+def decoder_porte_S(code: int, k: int) -> tuple:
+    """Code entier → vecteur complet des k sommes (format scripts K3-K6)."""
+    porte = decoder_porte(code, k)
+    h = k // 2
+    debut = list(porte[:h])
+    if k % 2 == 1:
+        return tuple(debut + [2 * porte[h]] + debut[::-1])
+    return tuple(debut + debut[::-1])
+
+
+def code_porte_nombre(n: int, k: int = None) -> int:
+    """
+    Code de la porte de n, sans liste de chiffres ni tuple.
+
+    Lit les chiffres directement dans les octets ASCII de str(n).
+    """
+    s = str(n).encode()
+    if k is None:
+        k = len(s)
+    code = 0
+    for j in range(k // 2):
+        code = code * BASE_PAIRE + s[j] + s[k - 1 - j] - 96
+    if k % 2 == 1:
+        code = code * BASE_MILIEU + s[k // 2] - 48
+    return code
+
+
+class BitmapPortes:
+    """
+    Ensemble de portes d'une dimension k, un bit par code possible.
+
+    Utilisation :
+        bitmap = BitmapPortes.depuis_portes(portes_k8, k=8)
+        if code_porte_nombre(n) in bitmap: ...
+        if bitmap.contient_porte((1, 0, 2, 18)): ...
+    """
+
+    __slots__ = ("k", "taille", "bits", "_nombre")
+
+    def __init__(self, k: int, bits: bytearray = None):
+        self.k = k
+        self.taille = taille_espace(k)
+        if bits is None:
+            bits = bytearray((self.taille + 7) // 8)
+        elif len(bits) != (self.taille + 7) // 8:
+            raise ValueError(f"Bitmap de {len(bits)} octets incompatible avec k={k}")
+        self.bits = bits
+        self._nombre = None
+
+    @classmethod
+    def depuis_portes(cls, portes, k: int) -> "BitmapPortes":
+        """Construit le bitmap depuis des portes au format K*_portes.json."""
+        bitmap = cls(k)
+        for porte in portes:
+            bitmap.ajouter(encoder_porte(porte, k))
+        return bitmap
+
+    @classmethod
+    def depuis_portes_S(cls, portes_S, k: int) -> "BitmapPortes":
+        """Construit le bitmap depuis des portes au format ensemble_S."""
+        bitmap = cls(k)
+        for porte in portes_S:
+            bitmap.ajouter(encoder_porte_S(porte, k))
+        return bitmap
+
+    def ajouter(self, code: int):
+        self.bits[code >> 3] |= 1 << (code & 7)
+        self._nombre = None
+
+    def __contains__(self, code: int) -> bool:
+        return (self.bits[code >> 3] >> (code & 7)) & 1 == 1
+
+    def contient_porte(self, porte) -> bool:
+        return encoder_porte(porte, self.k) in self
+
+    def codes(self):
+        """Itère les codes présents, en ordre croissant (= ordre lexicographique des portes)."""
+        bits = self.bits
+        for octet_idx, octet in enumerate(bits):
+            if octet:
+                base = octet_idx << 3
+                for b in range(8):
+                    if (octet >> b) & 1:
+                        yield base + b
+
+    def portes(self):
+        """Itère les portes présentes, en ordre lexicographique."""
+        for code in self.codes():
+            yield decoder_porte(code, self.k)
+
+    def __len__(self) -> int:
+        if self._nombre is None:
+            self._nombre = sum(bin(octet).count("1") for octet in self.bits if octet)
+        return self._nombre
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.bits)
+
+    def __repr__(self) -> str:
+        return f"BitmapPortes(k={self.k}, portes={len(self):,}, octets={self.nbytes:,})"
+
+
+class CodesPortes:
+    """Même interface que BitmapPortes, sur un set de codes (grandes dimensions)."""
+
+    __slots__ = ("k", "taille", "_codes")
+
+    def __init__(self, k: int, codes=()):
+        self.k = k
+        self.taille = taille_espace(k)
+        self._codes = set(codes)
+
+    def ajouter(self, code: int):
+        self._codes.add(code)
+
+    def __contains__(self, code: int) -> bool:
+        return code in self._codes
+
+    def contient_porte(self, porte) -> bool:
+        return encoder_porte(porte, self.k) in self._codes
+
+    def codes(self):
+        return iter(sorted(self._codes))
+
+    def portes(self):
+        for code in self.codes():
+            yield decoder_porte(code, self.k)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __repr__(self) -> str:
+        return f"CodesPortes(k={self.k}, portes={len(self):,})"
+
+
+def ensemble_portes_vide(k: int):
+    """BitmapPortes si l'espace des codes tient en mémoire, sinon CodesPortes."""
+    if taille_espace(k) <= LIMITE_BITMAP_BITS:
+        return BitmapPortes(k)
+    return CodesPortes(k)
+
+
+def est_dense(nombre: int, k: int) -> bool:
+    """
+    Un bitmap vaut-il mieux que la liste des codes ? Oui dès qu'il est plus
+    petit qu'un code sur 8 octets par porte (densité >= 1/64) et qu'il
+    tient en mémoire.
+    """
+    taille = taille_espace(k)
+    return taille <= LIMITE_BITMAP_BITS and 64 * nombre >= taille
+
+
+def ensemble_depuis_codes(codes, k: int):
+    """
+    BitmapPortes si les codes sont denses, sinon CodesPortes : un ensemble
+    creux (2 portes parmi 4·10^7 codes pour k=12) n'alloue ni ne parcourt
+    jamais l'espace entier.
+    """
+    codes = set(codes)
+    if not est_dense(len(codes), k):
+        return CodesPortes(k, codes)
+    bitmap = BitmapPortes(k)
+    for code in codes:
+        bitmap.ajouter(code)
+    return bitmap
+
+
+def ensemble_depuis_portes(portes, k: int):
+    """Ensemble de portes au format K*_portes.json."""
+    return ensemble_depuis_codes((encoder_porte(porte, k) for porte in portes), k)
+
+
+def ensemble_depuis_portes_S(portes_S, k: int):
+    """Ensemble de portes au format ensemble_S (milieu doublé)."""
+    return ensemble_depuis_codes((encoder_porte_S(porte, k) for porte in portes_S), k)
+
+
+def bitmaps_ensemble_S(S_data: dict) -> dict:
+    """
+    Un ensemble de codes par longueur k depuis ensemble_S_ferme.json
+    (remplace le set de tuples reconstruit par les scripts K3-K6).
+    """
+    bitmaps = {}
+    for k_str, portes_list in S_data['ensemble_S']['portes_par_longueur'].items():
+        k = int(k_str)
+        bitmaps[k] = ensemble_depuis_portes_S(portes_list, k)
+    return bitmaps
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+COMPOSANTES FORTEMENT CONNEXES ET ACCESSIBILITÉ DU GRAPHE DE PORTES
+===================================================================
+
+Structure cyclique du graphe porte → image(porte) de graphe_portes :
+- composantes fortement connexes (Tarjan itératif : pile d'appels
+  explicite, pas de récursion, tableaux uint32 par nœud)
+- DAG de condensation (une arête par couple de composantes reliées)
+- accessibilité multi-sources, en avant (descendants) ou en arrière
+  (ancêtres), avec un bytearray de nœuds visités
+
+Tarjan numérote les composantes dans l'ordre topologique inverse : une
+arête du DAG va toujours d'un numéro plus grand vers un plus petit, d'où
+la profondeur (plus longue chaîne) en une passe.
+
+Résumés par signature (porte[0], porte[-1]), celle des 180 signatures
+stables : portes, portes dans un cycle, composantes cycliques.
+--familles compare les portes atteintes depuis 196 et 879 (deux familles).
+
+Utilisation :
+    python graphe_portes.py construire 3 4 5 6 7 8 9 -o graphe_K3_K9.bin
+    python composantes_graphe.py graphe_K3_K9.bin --familles 196 879
+    python composantes_graphe.py graphe_K3_K9.bin --sortie composantes_K3_K9.json
+
+Date : octobre 2025
+"""
+
+import argparse
+import json
+import time
+from array import array
+from pathlib import Path
+
+from fermeture_point_fixe import portes_graine
+from graphe_portes import GraphePortes, csr_depuis_paires
+
+NON_VISITE = 0xFFFFFFFF
+
+
+def composantes_fortement_connexes(graphe: GraphePortes):
+    """
+    Tarjan itératif.
+
+    Returns: (composante uint32[nœuds], nombre de composantes), numérotées
+    puits d'abord (ordre topologique inverse)
+    """
+    n = graphe.nombre_noeuds
+    offsets, cibles = graphe.offsets, graphe.cibles
+    index = array('I', [NON_VISITE]) * n
+    bas = array('I', [0]) * n
+    composante = array('I', [NON_VISITE]) * n
+    sur_pile = bytearray(n)
+    pile = []
+    compteur = 0
+    nombre = 0
+
+    for racine in range(n):
+        if index[racine] != NON_VISITE:
+            continue
+        index[racine] = bas[racine] = compteur
+        compteur += 1
+        pile.append(racine)
+        sur_pile[racine] = 1
+        appels = [[racine, offsets[racine]]]
+
+        while appels:
+            cadre = appels[-1]
+            v, position = cadre
+            if position < offsets[v + 1]:
+                cadre[1] = position + 1
+                w = cibles[position]
+                if index[w] == NON_VISITE:
+                    index[w] = bas[w] = compteur
+                    compteur += 1
+                    pile.append(w)
+                    sur_pile[w] = 1
+                    appels.append([w, offsets[w]])
+                elif sur_pile[w] and index[w] < bas[v]:
+                    bas[v] = index[w]
+                continue
+
+            appels.pop()
+            if appels:
+                u = appels[-1][0]
+                if bas[v] < bas[u]:
+                    bas[u] = bas[v]
+            if bas[v] == index[v]:
+                while True:
+                    w = pile.pop()
+                    sur_pile[w] = 0
+                    composante[w] = nombre
+                    if w == v:
+                        break
+                nombre += 1
+
+    return composante, nombre
+
+
+def graphe_condensation(graphe: GraphePortes, composante, nombre: int):
+    """DAG des composantes en CSR : (offsets, cibles), arêtes c → c' avec c > c'."""
+    paires = set()
+    offsets, cibles = graphe.offsets, graphe.cibles
+    for v in range(graphe.nombre_noeuds):
+        c = composante[v]
+        for position in range(offsets[v], offsets[v + 1]):
+            c_image = composante[cibles[position]]
+            if c_image != c:
+                paires.add((c, c_image))
+    return csr_depuis_paires(sorted(paires), nombre)
+
+
+def profondeurs_condensation(offsets, cibles, nombre: int):
+    """Plus longue chaîne de composantes partant de chacune (1 pour un puits)."""
+    profondeur = array('I', [1]) * nombre
+    for c in range(nombre):  # successeurs déjà traités : numéros plus petits
+        for position in range(offsets[c], offsets[c + 1]):
+            d = profondeur[cibles[position]] + 1
+            if d > profondeur[c]:
+                profondeur[c] = d
+    return profondeur
+
+
+def atteignables(graphe: GraphePortes, sources, inverse: bool = False) -> bytearray:
+    """
+    Nœuds accessibles depuis `sources` (inclus), en suivant les
+    successeurs, ou les prédécesseurs si inverse=True.
+    """
+    if inverse:
+        offsets, voisins = graphe.offsets_inverse, graphe.sources_inverse
+    else:
+        offsets, voisins = graphe.offsets, graphe.cibles
+    vus = bytearray(graphe.nombre_noeuds)
+    pile = []
+    for s in sources:
+        if not vus[s]:
+            vus[s] = 1
+            pile.append(s)
+    while pile:
+        v = pile.pop()
+        for position in range(offsets[v], offsets[v + 1]):
+            w = voisins[position]
+            if not vus[w]:
+                vus[w] = 1
+                pile.append(w)
+    return vus
+
+
+def signature(porte) -> str:
+    return f"({porte[0]}, {porte[-1]})"
+
+
+def resumer_composantes(graphe: GraphePortes, composante, nombre: int) -> dict:
+    """
+    Composantes cycliques (plus d'une porte, ou boucle sur elle-même) et
+    agrégats par signature.
+    """
+    tailles = array('I', [0]) * nombre
+    for c in composante:
+        tailles[c] += 1
+    cyclique = bytearray(nombre)
+    for c in range(nombre):
+        if tailles[c] > 1:
+            cyclique[c] = 1
+    for v in range(graphe.nombre_noeuds):
+        if v in graphe.successeurs(v):
+            cyclique[composante[v]] = 1
+
+    detail = {}
+    par_signature = {}
+    for v in range(graphe.nombre_noeuds):
+        k, porte = graphe.porte(v)
+        sig = signature(porte)
+        agregat = par_signature.setdefault(sig, {"portes": 0, "portes_cycliques": 0, "composantes_cycliques": set()})
+        agregat["portes"] += 1
+        c = composante[v]
+        if not cyclique[c]:
+            continue
+        agregat["portes_cycliques"] += 1
+        agregat["composantes_cycliques"].add(c)
+        resume = detail.get(c)
+        if resume is None:
+            resume = detail[c] = {"composante": c, "taille": tailles[c], "k_min": k, "k_max": k,
+                                  "representant": {"k": k, "porte": list(porte)}, "signatures": {}}
+        resume["k_min"] = min(resume["k_min"], k)
+        resume["k_max"] = max(resume["k_max"], k)
+        resume["signatures"][sig] = resume["signatures"].get(sig, 0) + 1
+
+    for agregat in par_signature.values():
+        agregat["composantes_cycliques"] = len(agregat["composantes_cycliques"])
+
+    return {
+        "composantes_cycliques": sorted(detail.values(), key=lambda r: -r["taille"]),
+        "par_signature": dict(sorted(par_signature.items(), key=lambda e: -e[1]["portes"])),
+    }
+
+
+def analyser_familles(graphe: GraphePortes, nombres) -> dict:
+    """Descendants et ancêtres de la porte de chaque nombre, et recouvrements deux à deux."""
+    atteintes = {}
+    resultats = {}
+    for n, (k, porte) in zip(nombres, portes_graine(nombres)):
+        i = graphe.identifiant(k, porte)
+        if i is None:
+            resultats[str(n)] = {"k": k, "porte": list(porte), "absente": True}
+            continue
+        descendants = atteignables(graphe, [i])
+        ancetres = atteignables(graphe, [i], inverse=True)
+        atteintes[n] = descendants
+        signatures = {signature(graphe.porte(v)[1]) for v in range(len(descendants)) if descendants[v]}
+        resultats[str(n)] = {"k": k, "porte": list(porte), "descendants": descendants.count(1),
+                             "ancetres": ancetres.count(1), "signatures_atteintes": len(signatures)}
+
+    communs = {}
+    cles = list(atteintes)
+    for a_idx, a in enumerate(cles):
+        for b in cles[a_idx + 1:]:
+            communs[f"{a}-{b}"] = sum(1 for x, y in zip(atteintes[a], atteintes[b]) if x and y)
+    return {"nombres": resultats, "descendants_communs": communs}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Composantes fortement connexes du graphe de portes")
+    parser.add_argument("graphe", type=Path, help="fichier .bin de graphe_portes.py")
+    parser.add_argument("--familles", type=int, nargs="+", default=None, help="ex. 196 879")
+    parser.add_argument("--afficher", type=int, default=10, help="signatures et composantes affichées")
+    parser.add_argument("--sortie", type=Path, default=None)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print(f"🔗 COMPOSANTES FORTEMENT CONNEXES - {args.graphe.name}")
+    print("=" * 70 + "\n")
+
+    with GraphePortes.charger(args.graphe) as graphe:
+        print(f"📂 {graphe}")
+        debut = time.time()
+        composante, nombre = composantes_fortement_connexes(graphe)
+        duree_tarjan = time.time() - debut
+        offsets_dag, cibles_dag = graphe_condensation(graphe, composante, nombre)
+        profondeur = profondeurs_condensation(offsets_dag, cibles_dag, nombre)
+        resume = resumer_composantes(graphe, composante, nombre)
+        familles = analyser_familles(graphe, args.familles) if args.familles else None
+        duree = time.time() - debut
+
+    puits = sum(1 for c in range(nombre) if offsets_dag[c + 1] == offsets_dag[c])
+    cycliques = resume["composantes_cycliques"]
+    print(f"🧩 Composantes : {nombre:,} (Tarjan {duree_tarjan:.2f}s), dont {len(cycliques):,} cycliques "
+          f"({sum(r['taille'] for r in cycliques):,} portes)")
+    print(f"🗺️  Condensation : {len(cibles_dag):,} arêtes, {puits:,} puits, "
+          f"plus longue chaîne {max(profondeur, default=0)} composantes")
+    for r in cycliques[:args.afficher]:
+        print(f"   🔄 {r['taille']} portes, k={r['k_min']}..{r['k_max']}, ex. k={r['representant']['k']} "
+              f"{r['representant']['porte']}")
+
+    print(f"\n✍️  Signatures : {len(resume['par_signature'])}")
+    for sig, agregat in list(resume["par_signature"].items())[:args.afficher]:
+        print(f"   {sig:>9} : {agregat['portes']:,} portes, {agregat['portes_cycliques']:,} dans un cycle")
+
+    if familles:
+        print("\n👪 Familles :")
+        for n, r in familles["nombres"].items():
+            if r.get("absente"):
+                print(f"   {n} : porte k={r['k']} {r['porte']} absente du graphe")
+            else:
+                print(f"   {n} : porte {r['porte']} → {r['descendants']:,} descendants, "
+                      f"{r['ancetres']:,} ancêtres, {r['signatures_atteintes']} signatures")
+        for paire, c in familles["descendants_communs"].items():
+            print(f"   {paire} : {c:,} descendants communs")
+
+    print(f"\n⏱️  Durée : {duree:.2f}s")
+    if args.sortie:
+        with open(args.sortie, 'w', encoding='utf-8') as f:
+            json.dump({
+                "graphe": str(args.graphe),
+                "noeuds": len(composante),
+                "composantes": nombre,
+                "aretes_condensation": len(cibles_dag),
+                "puits": puits,
+                "plus_longue_chaine": max(profondeur, default=0),
+                **resume,
+                "familles": familles,
+            }, f, indent=2, ensure_ascii=False)
+        print(f"💾 Résumé : {args.sortie}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+COMPTAGE DES CANDIDATS PAR PORTE (sans énumérer les nombres)
+============================================================
+
+Les chiffres publiés (K7 : 2,249,054 candidats, K8 : 31,918,913)
+viennent d'un scan de tous les nombres à k chiffres. Ils se déduisent
+directement de K_k :
+
+    candidats(K_k) = Σ_p multiplicite_porte(p, k)
+
+multiplicite_porte : produit, paire par paire, du nombre de (a, b) de
+somme s (a ≥ 1 pour la paire extérieure). Le chiffre du milieu est
+fixé par la porte (facteur 1, pas 10).
+
+La dimension de T(n) ne dépend que de la porte (image_porte) : la
+distribution des images se pondère de la même façon.
+
+Utilisation :
+    python comptage_candidats.py              # K3..K9 disponibles
+    python comptage_candidats.py 7 8 --detail 10 --json comptage.json
+
+Date : octobre 2025
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from moteur_fermeture_portes import (
+    DOSSIER_PORTES_DEFAUT,
+    charger_portes_k,
+    image_porte,
+    multiplicite_porte,
+)
+
+
+def comptage_par_porte(portes_k, k: int) -> dict:
+    """{porte: nombre de n à k chiffres ayant cette porte}"""
+    return {porte: multiplicite_porte(porte, k) for porte in portes_k}
+
+
+def comptage_dimension(portes_k, k: int) -> dict:
+    """
+    Candidats de K_k et distribution de la dimension de leurs images.
+
+    Returns: dict (candidats, portes, multiplicités extrêmes,
+             distribution_k_images pondérée et par porte)
+    """
+    multiplicites = comptage_par_porte(portes_k, k)
+
+    distribution_k_images = {}
+    distribution_portes_images = {}
+    for porte, m in multiplicites.items():
+        if m == 0:
+            continue
+        k_image, _ = image_porte(porte, k)
+        distribution_k_images[k_image] = distribution_k_images.get(k_image, 0) + m
+        distribution_portes_images[k_image] = distribution_portes_images.get(k_image, 0) + 1
+
+    non_vides = [m for m in multiplicites.values() if m > 0]
+    return {
+        "dimension": k,
+        "portes": len(multiplicites),
+        "portes_vides": len(multiplicites) - len(non_vides),
+        "candidats": sum(non_vides),
+        "intervalle": [10 ** (k - 1), 10 ** k - 1],
+        "multiplicite_min": min(non_vides, default=0),
+        "multiplicite_max": max(non_vides, default=0),
+        "distribution_k_images": dict(sorted(distribution_k_images.items())),
+        "distribution_portes_images": dict(sorted(distribution_portes_images.items())),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Candidats par porte et par dimension, sans scan")
+    parser.add_argument("k", type=int, nargs="*", default=list(range(3, 10)))
+    parser.add_argument("--dossier", type=Path, default=DOSSIER_PORTES_DEFAUT)
+    parser.add_argument("--detail", type=int, default=0, metavar="N",
+                        help="afficher les N portes de plus grande multiplicité")
+    parser.add_argument("--json", type=Path, default=None, help="écrire les comptages dans ce fichier")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print("🧮 COMPTAGE DES CANDIDATS PAR PORTE")
+    print("=" * 70 + "\n")
+
+    resultats = {}
+    for k in args.k:
+        ensemble_k, metadata = charger_portes_k(k, args.dossier)
+        if ensemble_k is None:
+            print(f"   k={k}: K{k}_portes absent, ignoré")
+            continue
+
+        debut = time.perf_counter()
+        comptage = comptage_dimension(ensemble_k.portes(), k)
+        duree = time.perf_counter() - debut
+        resultats[k] = comptage
+
+        print(f"📌 k={k}: {comptage['portes']:,} portes → {comptage['candidats']:,} candidats "
+              f"({duree * 1000:.1f} ms)")
+        print(f"   multiplicité : {comptage['multiplicite_min']:,}..{comptage['multiplicite_max']:,}")
+        for k_image, nb in comptage["distribution_k_images"].items():
+            print(f"   images à {k_image} chiffres : {nb:,} candidats "
+                  f"({comptage['distribution_portes_images'][k_image]:,} portes)")
+        if metadata and "nombre_lychrel" in metadata:
+            ecart = comptage["candidats"] - metadata["nombre_lychrel"]
+            print(f"   nombre_lychrel (metadata) : {metadata['nombre_lychrel']:,} (écart {ecart:+,})")
+
+        if args.detail:
+            multiplicites = comptage_par_porte(ensemble_k.portes(), k)
+            plus_grandes = sorted(multiplicites.items(), key=lambda x: (-x[1], x[0]))[:args.detail]
+            for porte, m in plus_grandes:
+                print(f"      {list(porte)} : {m:,}")
+        print()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({str(k): r for k, r in resultats.items()}, f, indent=2, ensure_ascii=False)
+        print(f"💾 Comptages sauvegardés : {args.json}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DÉCOUVERTE DES PORTES LYCHREL PAR PORTE (trajectoires mémoïsées)
+================================================================
+
+Règle qui produit exactement K3..K8_portes.json (portes ET nombre_lychrel) :
+- n est candidat s'il n'est pas palindrome et si T(n), T²(n), ... atteint
+  16 chiffres (10^15) sans passer par un palindrome
+- une porte appartient à K_k si elle a au moins un tel n
+
+Or tous les n d'une même porte ont le même T(n) :
+    T(n) = Σ_j s_j·(10^(k-1-j) + 10^j)  (+ 2·milieu·10^h si k impair)
+Une seule trajectoire par porte suffit (19^h portes au lieu de 9·10^(k-1)
+nombres), et le nombre de candidats vient de la multiplicité moins
+l'éventuel palindrome de la porte.
+
+Les trajectoires se rejoignent (887 → 1675 pour toute la famille de 196) :
+l'issue de chaque valeur T visitée est mémoïsée, et une trajectoire qui
+retombe sur une valeur connue s'arrête là. La mémoire est partagée entre
+les dimensions : K9 profite des trajectoires de K3..K8.
+
+Pour K10+, relever --seuil-chiffres (à 16 chiffres, K15 serait presque
+tout l'espace).
+
+Utilisation :
+    python decouverte_portes.py 3 4 5 6 7 8 --comparer
+    python decouverte_portes.py 9 10 --dossier-sortie Listes_Portes
+
+Date : octobre 2025
+"""
+
+import argparse
+import itertools
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+from moteur_fermeture_portes import charger_portes_k, multiplicite_porte
+
+SEUIL_CHIFFRES_DEFAUT = 16
+TAILLE_MEMO_DEFAUT = 4_000_000
+
+
+def formule_porte(k: int) -> str:
+    """'(A+C, B)' pour k=3, comme dans les metadata des K*_portes.json."""
+    noms = [chr(ord('A') + i) for i in range(k)] if k <= 26 else [f"c{i}" for i in range(k)]
+    composantes = [f"{noms[j]}+{noms[k - 1 - j]}" for j in range(k // 2)]
+    if k % 2 == 1:
+        composantes.append(noms[k // 2])
+    return "(" + ", ".join(composantes) + ")"
+
+
+def valeur_T_porte(porte: tuple, k: int) -> int:
+    """T(n), commun à tous les n de la porte, sans construire n."""
+    h = k // 2
+    valeur = sum(porte[j] * (10 ** (k - 1 - j) + 10 ** j) for j in range(h))
+    if k % 2 == 1:
+        valeur += 2 * porte[h] * 10 ** h
+    return valeur
+
+
+def palindromes_porte(porte: tuple, k: int) -> int:
+    """Nombre de palindromes parmi les n de la porte (0 ou 1 : a_j = s_j/2 partout)."""
+    if multiplicite_porte(porte, k) == 0:
+        return 0
+    if any(s % 2 for s in porte[:k // 2]):
+        return 0
+    return 1 if porte[0] >= 2 else 0
+
+
+def portes_espace(k: int, premieres=None):
+    """
+    Toutes les portes non vides à k chiffres, dans l'ordre lexicographique.
+
+    premieres : sommes de paire extérieure à parcourir (défaut : toutes),
+    pour répartir l'espace entre workers
+    """
+    plages = [range(19)] * (k // 2) + ([range(10)] if k % 2 == 1 else [])
+    if premieres is not None:
+        plages[0] = sorted(premieres)
+    for porte in itertools.product(*plages):
+        if multiplicite_porte(porte, k):
+            yield porte
+
+
+class MemoTrajectoires:
+    """
+    Issue des trajectoires, indexée par valeur T visitée.
+
+    issue(m) : True si m, T(m), ... atteint 10^(seuil-1) sans palindrome.
+    Chaque valeur stocke 2·longueur + issue (longueur = pas restants).
+    """
+
+    def __init__(self, seuil_chiffres: int = SEUIL_CHIFFRES_DEFAUT, taille_max: int = TAILLE_MEMO_DEFAUT):
+        self.seuil_chiffres = seuil_chiffres
+        self.limite = 10 ** (seuil_chiffres - 1)
+        self.taille_max = taille_max
+        self.memo = {}
+        self.pas_effectues = 0
+        self.trajectoires_fusionnees = 0
+
+    def issue(self, m: int):
+        """Returns: (candidat, longueur de la trajectoire depuis m)"""
+        chemin = []
+        v = m
+        while True:
+            code = self.memo.get(v)
+            if code is not None:
+                candidat, reste = bool(code & 1), code >> 1
+                self.trajectoires_fusionnees += 1
+                break
+            if v >= self.limite:
+                candidat, reste = True, 0
+                break
+            s = str(v)
+            inverse = s[::-1]
+            if s == inverse:
+                candidat, reste = False, 0
+                break
+            chemin.append(v)
+            v += int(inverse)
+            self.pas_effectues += 1
+
+        longueur = reste + len(chemin)
+        place = self.taille_max - len(self.memo)
+        if place > 0:
+            for i, valeur in enumerate(chemin[:place]):
+                self.memo[valeur] = 2 * (longueur - i) + candidat
+        return candidat, longueur
+
+    def __len__(self) -> int:
+        return len(self.memo)
+
+
+def decouvrir_portes(k: int, memo: MemoTrajectoires = None, afficher: bool = True) -> dict:
+    """
+    Parcourt les portes non vides à k chiffres et garde celles qui ont
+    au moins un candidat.
+
+    Returns: dict (portes, nombre_lychrel, pas T effectués / équivalent par nombre)
+    """
+    if memo is None:
+        memo = MemoTrajectoires()
+    pas_avant = memo.pas_effectues
+    fusions_avant = memo.trajectoires_fusionnees
+
+    portes = []
+    nombre_lychrel = 0
+    portes_testees = 0
+    pas_par_nombre = 0
+    debut = time.time()
+
+    for porte in portes_espace(k):
+        portes_testees += 1
+        m = multiplicite_porte(porte, k)
+        candidat, longueur = memo.issue(valeur_T_porte(porte, k))
+        # Approche par nombre : T(n) puis la trajectoire, pour chacun des m nombres
+        pas_par_nombre += m * (1 + longueur)
+        if candidat:
+            non_palindromes = m - palindromes_porte(porte, k)
+            if non_palindromes:
+                portes.append(porte)
+                nombre_lychrel += non_palindromes
+
+        if afficher and portes_testees % 500_000 == 0:
+            print(f"   ⏳ k={k}: {portes_testees:,} portes - {len(portes):,} retenues - "
+                  f"{time.time() - debut:.1f}s")
+
+    return {
+        "dimension": k,
+        "portes": portes,
+        "nombre_portes": len(portes),
+        "nombre_lychrel": nombre_lychrel,
+        "portes_testees": portes_testees,
+        "pas_effectues": memo.pas_effectues - pas_avant + portes_testees,
+        "pas_par_nombre": pas_par_nombre,
+        "trajectoires_fusionnees": memo.trajectoires_fusionnees - fusions_avant,
+        "seuil_chiffres": memo.seuil_chiffres,
+        "duree": time.time() - debut,
+    }
+
+
+def ecrire_portes_json(chemin: Path, resultat: dict):
+    """Écrit K{k}_portes.json au format des fichiers de Donnees_portes."""
+    k = resultat["dimension"]
+    data = {
+        "metadata": {
+            "dimension": k,
+            "formule": formule_porte(k),
+            "nombre_portes": resultat["nombre_portes"],
+            "nombre_lychrel": resultat["nombre_lychrel"],
+            "date_generation": datetime.now().isoformat(),
+            "description": f"Portes Lychrel pour k={k} (nombres à {k} chiffres)",
+            "seuil_chiffres": resultat["seuil_chiffres"],
+        },
+        "portes": [list(p) for p in resultat["portes"]],
+    }
+    chemin = Path(chemin)
+    chemin.parent.mkdir(parents=True, exist_ok=True)
+    with open(chemin, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Découverte des portes Lychrel porte par porte")
+    parser.add_argument("k", type=int, nargs="+")
+    parser.add_argument("--seuil-chiffres", type=int, default=SEUIL_CHIFFRES_DEFAUT,
+                        help="candidat si la trajectoire atteint ce nombre de chiffres sans palindrome")
+    parser.add_argument("--taille-memo", type=int, default=TAILLE_MEMO_DEFAUT)
+    parser.add_argument("--dossier-sortie", type=Path, default=Path("Donnees_portes_generees"))
+    parser.add_argument("--comparer", action="store_true",
+                        help="comparer avec les K*_portes.json de Donnees_portes")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print(f"🔍 DÉCOUVERTE DES PORTES - k={args.k} - seuil {args.seuil_chiffres} chiffres")
+    print("=" * 70 + "\n")
+
+    memo = MemoTrajectoires(args.seuil_chiffres, args.taille_memo)
+    identiques = True
+    for k in sorted(args.k):
+        resultat = decouvrir_portes(k, memo)
+        chemin = args.dossier_sortie / f"K{k}" / f"K{k}_portes.json"
+        ecrire_portes_json(chemin, resultat)
+
+        print(f"📌 k={k}: {resultat['nombre_portes']:,} portes, "
+              f"{resultat['nombre_lychrel']:,} candidats ({resultat['duree']:.2f}s)")
+        print(f"   pas T : {resultat['pas_effectues']:,} "
+              f"(par nombre : {resultat['pas_par_nombre']:,}) - "
+              f"{resultat['trajectoires_fusionnees']:,} trajectoires fusionnées")
+        print(f"   💾 {chemin}")
+
+        if args.comparer:
+            reference, metadata = charger_portes_k(k)
+            if reference is None:
+                print(f"   K{k}_portes de référence absent")
+            else:
+                egal = set(reference.portes()) == set(resultat["portes"])
+                identiques = identiques and egal
+                print(f"   {'✅ identique à' if egal else '⚠️  DIFFÉRENT de'} K{k}_portes.json "
+                      f"(nombre_lychrel de référence : {metadata.get('nombre_lychrel', '-')})")
+        print()
+
+    print(f"🧠 Mémo : {len(memo):,} valeurs")
+    if args.comparer:
+        print("✅ Toutes les dimensions comparées sont identiques\n" if identiques
+              else "⚠️  Des différences ont été trouvées\n")
+
+
+if __name__ == "__main__":
+    main()
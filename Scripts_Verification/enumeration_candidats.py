@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ÉNUMÉRATION DIRECTE DES CANDIDATS D'UNE PORTE
+=============================================
+
+verifier_fermeture_k8() parcourt les 90,000,000 nombres à 8 chiffres
+et en jette 65% (`if porte_n in portes_k8`).
+
+Ici on part de la porte : chaque somme de paire s_j se décompose en
+(a, s_j - a), a ∈ [max(lo, s_j-9), min(9, s_j)] (lo = 1 pour la paire
+extérieure), et le milieu est fixé. Les nombres ayant la porte sont
+exactement les combinaisons de ces décompositions :
+
+    n = milieu·10^h + Σ_j [ a_j·10^(k-1-j) + (s_j - a_j)·10^j ]
+
+Énumérer les a_j dans l'ordre lexicographique donne n croissant.
+
+Ordres proposés :
+- nombres_porte        : une porte, n croissant
+- candidats_portes     : un ensemble de portes, porte par porte
+                         (trie=True : fusion globale, n croissant)
+- tranches_portes      : portes réparties en tranches de poids
+                         (multiplicité) équilibré, pour des workers
+- blocs_candidats_numpy: tableaux int64 d'environ `taille_bloc` candidats
+
+Utilisation :
+    python enumeration_candidats.py 8
+    python enumeration_candidats.py 5 --porte 9 8 7 --afficher 20
+
+Date : octobre 2025
+"""
+
+import argparse
+import heapq
+import itertools
+import time
+
+from moteur_fermeture_portes import charger_portes_k, multiplicite_porte
+
+try:
+    import numpy as np
+except ImportError:  # NumPy optionnel : seul le chemin vectorisé en dépend
+    np = None
+
+
+def decompositions_paire(s: int, exterieure: bool = False):
+    """Chiffres de tête a possibles pour une paire de somme s (croissants)."""
+    return range(max(1 if exterieure else 0, s - 9), min(9, s) + 1)
+
+
+def contributions_porte(porte: tuple, k: int):
+    """
+    (base, listes de contributions) : n = base + Σ_j contributions[j][i_j].
+
+    base porte le chiffre du milieu ; contributions[j] suit les a_j croissants.
+    """
+    h = k // 2
+    base = porte[h] * 10 ** h if k % 2 == 1 else 0
+    contributions = []
+    for j in range(h):
+        s = porte[j]
+        poids_haut, poids_bas = 10 ** (k - 1 - j), 10 ** j
+        contributions.append([a * poids_haut + (s - a) * poids_bas
+                              for a in decompositions_paire(s, j == 0)])
+    return base, contributions
+
+
+def nombres_porte(porte: tuple, k: int):
+    """Génère, dans l'ordre croissant, les n à k chiffres ayant cette porte."""
+    if multiplicite_porte(porte, k) == 0:
+        return
+    base, contributions = contributions_porte(porte, k)
+    for combinaison in itertools.product(*contributions):
+        yield base + sum(combinaison)
+
+
+def candidats_portes(portes, k: int, trie: bool = False):
+    """
+    Génère les candidats de toutes les portes.
+
+    trie=False : porte par porte (ordre des portes triées), sans tas
+    trie=True  : fusion heapq des générateurs, n globalement croissant
+    """
+    portes = sorted(portes)
+    if trie:
+        yield from heapq.merge(*(nombres_porte(p, k) for p in portes))
+    else:
+        for porte in portes:
+            yield from nombres_porte(porte, k)
+
+
+def tranches_portes(portes, k: int, nb_tranches: int) -> list:
+    """
+    Répartit les portes en `nb_tranches` listes de candidats à peu près égaux
+    (plus lourde porte d'abord, vers la tranche la plus légère).
+    """
+    tas = [(0, i) for i in range(nb_tranches)]
+    tranches = [[] for _ in range(nb_tranches)]
+    for porte in sorted(portes, key=lambda p: (-multiplicite_porte(p, k), p)):
+        poids, i = heapq.heappop(tas)
+        tranches[i].append(porte)
+        heapq.heappush(tas, (poids + multiplicite_porte(porte, k), i))
+    return [sorted(t) for t in tranches]
+
+
+# ============================================================================
+# CHEMIN NUMPY
+# ============================================================================
+
+def nombres_porte_numpy(porte: tuple, k: int):
+    """Candidats d'une porte en un tableau int64 croissant (sommes externes)."""
+    if np is None:
+        raise ImportError("NumPy est requis pour le chemin vectorisé (pip install numpy)")
+    if multiplicite_porte(porte, k) == 0:
+        return np.zeros(0, dtype=np.int64)
+    base, contributions = contributions_porte(porte, k)
+    resultat = np.array([base], dtype=np.int64)
+    for liste in contributions:
+        resultat = np.add.outer(resultat, np.asarray(liste, dtype=np.int64)).ravel()
+    return resultat
+
+
+def blocs_candidats_numpy(portes, k: int, taille_bloc: int = 1 << 20):
+    """
+    Génère des tableaux d'environ `taille_bloc` candidats, porte par porte
+    (ordre des portes triées ; chaque bloc n'est pas trié globalement).
+    """
+    morceaux, taille = [], 0
+    for porte in sorted(portes):
+        nombres = nombres_porte_numpy(porte, k)
+        if len(nombres) == 0:
+            continue
+        morceaux.append(nombres)
+        taille += len(nombres)
+        if taille >= taille_bloc:
+            yield np.concatenate(morceaux)
+            morceaux, taille = [], 0
+    if morceaux:
+        yield np.concatenate(morceaux)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Énumération directe des candidats depuis les portes")
+    parser.add_argument("k", type=int)
+    parser.add_argument("--porte", type=int, nargs="+", default=None, help="une seule porte au lieu de K_k")
+    parser.add_argument("--trie", action="store_true", help="ordre croissant global (fusion)")
+    parser.add_argument("--afficher", type=int, default=0, metavar="N", help="afficher les N premiers")
+    parser.add_argument("--sans-numpy", action="store_true")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print(f"🔢 ÉNUMÉRATION DES CANDIDATS - k={args.k}")
+    print("=" * 70 + "\n")
+
+    if args.porte:
+        portes = {tuple(args.porte)}
+    else:
+        ensemble, _ = charger_portes_k(args.k)
+        if ensemble is None:
+            print(f"❌ K{args.k}_portes absent")
+            return
+        portes = list(ensemble.portes())
+    attendus = sum(multiplicite_porte(p, args.k) for p in portes)
+    print(f"🚪 Portes : {len(portes):,} → {attendus:,} candidats attendus")
+
+    if args.afficher:
+        premiers = list(itertools.islice(candidats_portes(portes, args.k, args.trie), args.afficher))
+        print(f"   {premiers}")
+
+    debut = time.time()
+    if np is not None and not args.sans_numpy and not args.trie:
+        total = sum(len(bloc) for bloc in blocs_candidats_numpy(portes, args.k))
+        chemin = "NumPy"
+    else:
+        total = sum(1 for _ in candidats_portes(portes, args.k, args.trie))
+        chemin = "pur Python" + (" (trié)" if args.trie else "")
+    duree = time.time() - debut
+
+    print(f"📊 Candidats énumérés : {total:,} [{chemin}]")
+    print(f"⏱️  Durée : {duree:.2f}s ({total / max(duree, 1e-9):,.0f} nb/s)")
+    print("✅ Conforme aux multiplicités\n" if total == attendus else "⚠️  Écart avec les multiplicités\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FERMETURE PAR POINT FIXE DEPUIS UNE GRAINE
+==========================================
+
+fermeture.est_ferme de ensemble_S_ferme.json vient des trajectoires
+observées, puis des scans séparés par k. Ici l'ensemble fermé est
+construit directement au niveau des portes :
+
+    S₀ = portes de la graine (196 par défaut)
+    S  = S ∪ image(S) jusqu'à ce que rien ne change
+
+image_porte calcule la porte de T(n) à partir de la seule porte de n
+(colonnes symétriques + propagation des retenues), en O(k) : aucun
+nombre n'est énuméré, et k peut valoir plusieurs centaines.
+
+- liste de travail : chaque porte nouvellement ajoutée est traitée une fois
+- ensemble visité par k : BitmapPortes tant que l'espace des codes tient
+  en mémoire, CodesPortes au-delà (ensemble_portes_vide)
+
+Une porte Lychrel a une image de longueur k ou k+1 : depuis 196, la
+fermeture n'est jamais finie. --k-max borne les longueurs ; les images
+au-delà sont rapportées comme sortantes (la frontière), pas ajoutées.
+Avec --k-max 101, on retrouve les 231 portes de ensemble_S_ferme.json,
+plus une seconde porte k=101 : la trajectoire enregistrée s'arrête avant
+(S n'est donc fermé que pour k ≤ 100).
+
+Utilisation :
+    python fermeture_point_fixe.py --k-max 101 --comparer-S ../ensemble_S_ferme.json
+    python fermeture_point_fixe.py --nombres 196 879 1997 --k-max 300
+    python fermeture_point_fixe.py --portes-K 8 --k-max 20 --sortie fermeture_K8.json
+
+Date : octobre 2025
+"""
+
+import argparse
+import json
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+from codec_portes import encoder_porte, ensemble_portes_vide
+from graphe_portes import porte_depuis_S
+from moteur_fermeture_portes import DOSSIER_PORTES_DEFAUT, charger_portes_par_k, image_porte, porte_des_chiffres
+
+K_MAX_DEFAUT = 101
+
+
+def portes_graine(nombres) -> list:
+    """Nombres de départ → liste de (k, porte)."""
+    return [(len(str(n)), porte_des_chiffres([int(c) for c in str(n)])) for n in nombres]
+
+
+def fermeture_point_fixe(graines, k_max: int = K_MAX_DEFAUT) -> dict:
+    """
+    Plus petit ensemble contenant les graines et stable par image, limité
+    aux longueurs ≤ k_max.
+
+    graines : itérable de (k, porte) au format K*_portes.json
+
+    Returns: dict (portes_par_k {k: [portes triées]}, sortantes, transitions, ...)
+    """
+    visites = {}
+    portes_par_k = {}
+    sortantes = set()
+    travail = deque()
+    transitions = 0
+
+    def ajouter(k, porte):
+        ensemble = visites.get(k)
+        if ensemble is None:
+            ensemble = visites[k] = ensemble_portes_vide(k)
+        code = encoder_porte(porte, k)
+        if code in ensemble:
+            return
+        ensemble.ajouter(code)
+        portes_par_k.setdefault(k, []).append(porte)
+        travail.append((k, porte))
+
+    debut = time.time()
+    for k, porte in graines:
+        if k <= k_max:
+            ajouter(k, tuple(porte))
+
+    while travail:
+        k, porte = travail.popleft()
+        k_image, porte_image = image_porte(porte, k)
+        transitions += 1
+        if k_image > k_max:
+            sortantes.add((k_image, porte_image))
+        else:
+            ajouter(k_image, porte_image)
+
+    return {
+        "k_max": k_max,
+        "portes_par_k": {k: sorted(portes_par_k[k]) for k in sorted(portes_par_k)},
+        "sortantes": sorted(sortantes),
+        "transitions": transitions,
+        "duree": time.time() - debut,
+    }
+
+
+def comparer_ensemble_S(resultat: dict, S_data: dict) -> dict:
+    """Écarts entre la fermeture calculée et ensemble_S (longueurs ≤ k_max)."""
+    reference = {
+        (int(k), porte_depuis_S(p, int(k)))
+        for k, portes in S_data["ensemble_S"]["portes_par_longueur"].items()
+        for p in portes if int(k) <= resultat["k_max"]
+    }
+    calcule = {(k, p) for k, portes in resultat["portes_par_k"].items() for p in portes}
+    return {
+        "absentes_du_calcul": sorted(reference - calcule),
+        "absentes_de_S": sorted(calcule - reference),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fermeture des portes par point fixe depuis une graine")
+    parser.add_argument("--nombres", type=int, nargs="+", default=None, help="graine (défaut : 196)")
+    parser.add_argument("--portes-K", type=int, nargs="+", default=None, metavar="K",
+                        help="graine : toutes les portes de K*_portes.json pour ces k")
+    parser.add_argument("--ensemble-S", type=Path, default=None,
+                        help="graine : toutes les portes de ensemble_S_ferme.json")
+    parser.add_argument("--dossier", type=Path, default=DOSSIER_PORTES_DEFAUT)
+    parser.add_argument("--k-max", type=int, default=K_MAX_DEFAUT)
+    parser.add_argument("--comparer-S", type=Path, default=None, help="ensemble_S_ferme.json de référence")
+    parser.add_argument("--sortie", type=Path, default=None)
+    args = parser.parse_args()
+
+    graines = []
+    if args.portes_K:
+        for k, ensemble in charger_portes_par_k(args.portes_K, args.dossier).items():
+            graines.extend((k, p) for p in ensemble.portes())
+    if args.ensemble_S:
+        with open(args.ensemble_S, 'r', encoding='utf-8') as f:
+            S_data = json.load(f)
+        for k, portes in S_data["ensemble_S"]["portes_par_longueur"].items():
+            graines.extend((int(k), porte_depuis_S(p, int(k))) for p in portes)
+    if args.nombres or not graines:
+        graines.extend(portes_graine(args.nombres or [196]))
+
+    print("\n" + "=" * 70)
+    print(f"🔁 FERMETURE PAR POINT FIXE - {len(graines):,} portes graines - k ≤ {args.k_max}")
+    print("=" * 70 + "\n")
+
+    resultat = fermeture_point_fixe(graines, args.k_max)
+    portes_par_k = resultat["portes_par_k"]
+    total = sum(len(p) for p in portes_par_k.values())
+
+    print(f"✅ Point fixe atteint : {total:,} portes sur {len(portes_par_k)} longueurs "
+          f"({resultat['transitions']:,} images calculées, {resultat['duree']:.2f}s)")
+    for k, portes in list(portes_par_k.items())[:12]:
+        print(f"   k={k:>3} : {len(portes):,} portes")
+    if len(portes_par_k) > 12:
+        print(f"   ... jusqu'à k={max(portes_par_k)}")
+    if resultat["sortantes"]:
+        print(f"🚪 Sortantes (k > {args.k_max}) : {len(resultat['sortantes']):,}")
+
+    if args.comparer_S:
+        with open(args.comparer_S, 'r', encoding='utf-8') as f:
+            ecarts = comparer_ensemble_S(resultat, json.load(f))
+        if not ecarts["absentes_du_calcul"] and not ecarts["absentes_de_S"]:
+            print(f"✅ Identique à {args.comparer_S.name} pour k ≤ {args.k_max}")
+        else:
+            print(f"⚠️  {len(ecarts['absentes_du_calcul'])} portes de S non atteintes, "
+                  f"{len(ecarts['absentes_de_S'])} portes atteintes hors de S")
+
+    if args.sortie:
+        with open(args.sortie, 'w', encoding='utf-8') as f:
+            json.dump({
+                "metadata": {
+                    "date_generation": datetime.now().isoformat(),
+                    "k_max": args.k_max,
+                    "portes_graines": len(graines),
+                    "format_portes": "K*_portes.json (milieu brut)",
+                },
+                "statistiques": {
+                    "total_portes": total,
+                    "distribution_par_k": {str(k): len(p) for k, p in portes_par_k.items()},
+                    "transitions": resultat["transitions"],
+                    "sortantes": len(resultat["sortantes"]),
+                },
+                "portes_par_k": {str(k): [list(p) for p in portes] for k, portes in portes_par_k.items()},
+                "sortantes": [{"k": k, "porte": list(p)} for k, p in resultat["sortantes"]],
+            }, f, indent=2, ensure_ascii=False)
+        print(f"💾 Fermeture : {args.sortie}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
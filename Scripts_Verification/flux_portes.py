@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EXTRACTION EN FLUX DES PORTES LE LONG D'UNE TRAJECTOIRE
+=======================================================
+
+ensemble_S_ferme.json s'arrête à 101 chiffres (231 portes) et se
+reconstruit en entier à chaque génération.
+
+Ici la trajectoire (trajectoire_grands_nombres) tourne sans fin et,
+à chaque itération :
+- la porte est lue en O(k) sur le tableau de chiffres, sans chaîne :
+  composante j = d[j] + d[k-1-j], le milieu sort doublé (format S)
+- un enregistrement (itération, k, porte) est ajouté au fichier de flux
+- portes_par_longueur et graphe_transitions sont mis à jour en mémoire
+
+Fichier de flux (gzip, ouvert en ajout) : une suite d'enregistrements
+    <QI> itération, k   puis   ⌈k/2⌉ octets (composantes ≤ 18)
+Une reprise ajoute un nouveau membre gzip ; la lecture les enchaîne et
+s'arrête proprement sur un dernier enregistrement tronqué. Un membre
+tronqué par un arrêt brutal cacherait tout membre ajouté derrière lui :
+--reprendre recopie d'abord le préfixe lisible (reparer_flux).
+
+S est sauvegardé avec le point de reprise de la trajectoire
+(traj_196.ckpt → traj_196.ckpt.S.json) : --reprendre repart de cet S,
+sans avoir à repasser --ensemble-S. Les deux sont réécrits toutes les
+--intervalle-sauvegarde secondes, après avoir vidé le flux sur disque :
+le flux est toujours au moins aussi avancé que le point de reprise.
+
+Utilisation :
+    python flux_portes.py --iterations 5000 --flux portes_196.bin.gz
+    python flux_portes.py --iterations 20000 --flux portes_196.bin.gz \\
+        --point-reprise traj_196.ckpt --reprendre --ensemble-S ../ensemble_S_ferme.json
+
+Date : octobre 2025
+"""
+
+import argparse
+import gzip
+import json
+import os
+import struct
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+
+from trajectoire_grands_nombres import TrajectoireChiffres
+
+try:
+    import numpy as np
+except ImportError:  # NumPy optionnel : chemin bytearray sinon
+    np = None
+
+FORMAT_ENREGISTREMENT = "<QI"
+TAILLE_ENREGISTREMENT = struct.calcsize(FORMAT_ENREGISTREMENT)
+
+
+# ============================================================================
+# PORTE DEPUIS LE TABLEAU DE CHIFFRES
+# ============================================================================
+
+def porte_S_chiffres(chiffres) -> bytes:
+    """
+    Porte au format S (milieu doublé) d'un tableau de chiffres poids faible
+    en tête : ⌈k/2⌉ sommes de paires, la paire extérieure en premier.
+    """
+    L = len(chiffres)
+    m = (L + 1) // 2
+    if np is not None and isinstance(chiffres, np.ndarray):
+        return (chiffres[:m] + chiffres[::-1][:m]).tobytes()
+    return bytes(chiffres[i] + chiffres[L - 1 - i] for i in range(m))
+
+
+def flux_portes(traj: TrajectoireChiffres, iterations: int):
+    """
+    Génère (itération, k, porte_S) pour le nombre courant puis chaque image,
+    jusqu'à l'itération `iterations` incluse ou un palindrome.
+    """
+    yield traj.iteration, len(traj), porte_S_chiffres(traj.chiffres)
+    while traj.iteration < iterations:
+        palindrome = traj.etape()
+        yield traj.iteration, len(traj), porte_S_chiffres(traj.chiffres)
+        if palindrome:
+            return
+
+
+# ============================================================================
+# FICHIER DE FLUX (AJOUT SEUL, COMPRESSÉ)
+# ============================================================================
+
+class EcrivainFlux:
+    """Ajoute des enregistrements (itération, k, porte) à un fichier gzip."""
+
+    def __init__(self, chemin: Path, niveau: int = 1, mode: str = 'ab'):
+        self.chemin = Path(chemin)
+        self._f = gzip.open(self.chemin, mode, compresslevel=niveau)
+        self.nombre = 0
+
+    def ecrire(self, iteration: int, k: int, porte: bytes):
+        self._f.write(struct.pack(FORMAT_ENREGISTREMENT, iteration, k))
+        self._f.write(porte)
+        self.nombre += 1
+
+    def vider(self):
+        """Vide le tampon de compression (Z_SYNC_FLUSH) : tout ce qui précède reste lisible."""
+        self._f.flush()
+
+    def fermer(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+def _enregistrements_flux(chemin: Path, etat: dict = None):
+    """
+    Génère (itération, k, porte bytes) jusqu'à la fin lisible du fichier.
+    etat (optionnel) reçoit "tronque" : True si la lecture s'est arrêtée
+    sur un membre gzip ou un enregistrement incomplet.
+    """
+    with gzip.open(chemin, 'rb') as f:
+        while True:
+            try:
+                entete = f.read(TAILLE_ENREGISTREMENT)
+                if not entete:
+                    return
+                if len(entete) < TAILLE_ENREGISTREMENT:
+                    break
+                iteration, k = struct.unpack(FORMAT_ENREGISTREMENT, entete)
+                m = (k + 1) // 2
+                porte = f.read(m)
+            except (EOFError, zlib.error, gzip.BadGzipFile):
+                break
+            if len(porte) < m:
+                break
+            yield iteration, k, porte
+    if etat is not None:
+        etat["tronque"] = True
+
+
+def lire_flux(chemin: Path):
+    """
+    Relit un fichier de flux : génère (itération, k, porte tuple).
+
+    Un arrêt brutal peut laisser un membre gzip ou un enregistrement
+    incomplet en fin de fichier : la lecture s'arrête avant.
+    """
+    for iteration, k, porte in _enregistrements_flux(chemin):
+        yield iteration, k, tuple(porte)
+
+
+def reparer_flux(chemin: Path) -> bool:
+    """
+    Ramène le fichier de flux à son préfixe lisible avant d'y ajouter.
+
+    Un membre gzip tronqué arrête la lecture : un membre ajouté derrière
+    lui serait perdu. Le préfixe est recopié dans un fichier temporaire
+    qui remplace l'original (os.replace) ; un fichier intact n'est que lu.
+
+    Returns: True si le fichier a été réécrit
+    """
+    chemin = Path(chemin)
+    if not chemin.exists():
+        return False
+    etat = {"tronque": False}
+    for _ in _enregistrements_flux(chemin, etat):
+        pass
+    if not etat["tronque"]:
+        return False
+
+    temporaire = chemin.with_name(chemin.name + ".tmp")
+    with EcrivainFlux(temporaire, mode='wb') as ecrivain:
+        for iteration, k, porte in _enregistrements_flux(chemin):
+            ecrivain.ecrire(iteration, k, porte)
+    os.replace(temporaire, chemin)
+    return True
+
+
+def derniere_iteration_flux(chemin: Path):
+    """Dernière itération enregistrée, ou None si le fichier est vide ou absent."""
+    if not Path(chemin).exists():
+        return None
+    derniere = None
+    for iteration, _, _ in lire_flux(chemin):
+        derniere = iteration
+    return derniere
+
+
+# ============================================================================
+# ENSEMBLE S INCRÉMENTAL
+# ============================================================================
+
+class EnsembleSIncremental:
+    """
+    portes_par_longueur et graphe_transitions tenus en ensembles Python,
+    mis à jour porte par porte ; vers_json() redonne le format de
+    ensemble_S_ferme.json.
+    """
+
+    def __init__(self, nombre_initial=196):
+        self.portes_par_longueur = {}    # k -> set de tuples
+        self.transitions = {}            # porte -> set de (k, porte)
+        self.nombre_initial = nombre_initial
+        self.iterations_calculees = 0
+        self.fermeture = None
+        self._precedente = None
+
+    @classmethod
+    def depuis_json(cls, chemin: Path):
+        with open(chemin, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        ensemble = cls(data.get("metadata", {}).get("nombre_initial", 196))
+        ensemble.iterations_calculees = data.get("metadata", {}).get("iterations_calculees", 0)
+        ensemble.fermeture = data.get("fermeture")
+
+        for k_str, portes in data["ensemble_S"]["portes_par_longueur"].items():
+            ensemble.portes_par_longueur[int(k_str)] = {tuple(p) for p in portes}
+        for source, destinations in data.get("graphe_transitions", {}).get("transitions", {}).items():
+            cible = ensemble.transitions.setdefault(tuple(json.loads(source)), set())
+            for dest in destinations:
+                cible.add((dest["k"], tuple(dest["porte"])))
+        return ensemble
+
+    def ajouter(self, iteration: int, k: int, porte: tuple) -> bool:
+        """
+        Enregistre une porte de la trajectoire (et la transition depuis la
+        précédente si elle suit d'une itération).
+
+        Returns: True si la porte est nouvelle dans S
+        """
+        portes_k = self.portes_par_longueur.setdefault(k, set())
+        nouvelle = porte not in portes_k
+        portes_k.add(porte)
+
+        if self._precedente is not None and self._precedente[0] == iteration - 1:
+            self.transitions.setdefault(self._precedente[1], set()).add((k, porte))
+        self._precedente = (iteration, porte)
+        self.iterations_calculees = max(self.iterations_calculees, iteration)
+        return nouvelle
+
+    def __len__(self) -> int:
+        return sum(len(p) for p in self.portes_par_longueur.values())
+
+    def vers_json(self) -> dict:
+        longueurs = sorted(self.portes_par_longueur)
+        nombre_transitions = sum(len(d) for d in self.transitions.values())
+        data = {
+            "metadata": {
+                "titre": f"Ensemble S des portes accessibles depuis {self.nombre_initial}",
+                "description": "Portes observées dans la trajectoire de "
+                               f"{self.nombre_initial} et graphe de transitions",
+                "date_generation": datetime.now().isoformat(),
+                "nombre_initial": self.nombre_initial,
+                "iterations_calculees": self.iterations_calculees,
+            },
+            "statistiques": {
+                "total_portes_distinctes": len(self),
+                "longueurs_observees": longueurs,
+                "distribution_par_k": {str(k): len(self.portes_par_longueur[k]) for k in longueurs},
+                "nombre_transitions": nombre_transitions,
+            },
+            "ensemble_S": {
+                "portes_par_longueur": {
+                    str(k): [list(p) for p in sorted(self.portes_par_longueur[k])] for k in longueurs
+                },
+                "description": "Pour chaque longueur k, liste des portes π_k observées dans la trajectoire",
+            },
+            "graphe_transitions": {
+                "transitions": {
+                    str(list(source)): [{"k": k, "porte": list(p)} for k, p in sorted(dest)]
+                    for source, dest in self.transitions.items()
+                },
+                "description": "Pour chaque porte source, liste des portes destinations possibles",
+            },
+        }
+        if self.fermeture is not None:
+            data["fermeture"] = self.fermeture
+        return data
+
+    def sauvegarder(self, chemin: Path):
+        """Écriture atomique (fichier temporaire + os.replace)."""
+        chemin = Path(chemin)
+        temporaire = chemin.with_name(chemin.name + ".tmp")
+        with open(temporaire, 'w', encoding='utf-8') as f:
+            json.dump(self.vers_json(), f, indent=2, ensure_ascii=False)
+        os.replace(temporaire, chemin)
+
+
+def chemin_S_reprise(point_reprise: Path) -> Path:
+    """S sauvegardé à côté du point de reprise de la trajectoire."""
+    point_reprise = Path(point_reprise)
+    return point_reprise.with_name(point_reprise.name + ".S.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Portes en flux le long d'une trajectoire")
+    parser.add_argument("--graine", type=str, default="196")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--flux", type=Path, default=None, help="fichier d'enregistrements (gzip, ajout)")
+    parser.add_argument("--point-reprise", type=Path, default=None, help="état de la trajectoire")
+    parser.add_argument("--reprendre", action="store_true")
+    parser.add_argument("--ensemble-S", type=Path, default=None, help="ensemble S de départ")
+    parser.add_argument("--intervalle-sauvegarde", type=float, default=300.0,
+                        help="secondes entre deux points de reprise (avec --point-reprise)")
+    parser.add_argument("--sortie-S", type=Path, default=Path("ensemble_S_etendu.json"))
+    parser.add_argument("--sans-numpy", action="store_true")
+    args = parser.parse_args()
+
+    utiliser_numpy = np is not None and not args.sans_numpy
+
+    print("\n" + "=" * 70)
+    print(f"🌊 PORTES EN FLUX - trajectoire de {args.graine}, {args.iterations:,} itérations")
+    print("=" * 70 + "\n")
+
+    reprise = args.reprendre and args.point_reprise and args.point_reprise.exists()
+    if reprise:
+        traj = TrajectoireChiffres.charger(args.point_reprise, utiliser_numpy)
+        print(f"♻️  Reprise à l'itération {traj.iteration:,} ({len(traj):,} chiffres)")
+    else:
+        traj = TrajectoireChiffres.depuis_chaine(args.graine, utiliser_numpy=utiliser_numpy)
+
+    if reprise and chemin_S_reprise(args.point_reprise).exists():
+        ensemble = EnsembleSIncremental.depuis_json(chemin_S_reprise(args.point_reprise))
+        print(f"📂 Ensemble S de la session précédente : {len(ensemble):,} portes")
+    elif reprise and traj.iteration > 0 and not args.ensemble_S:
+        parser.error(f"{chemin_S_reprise(args.point_reprise)} absent : "
+                     f"--ensemble-S est requis pour reprendre sans repartir d'un S vide")
+    elif args.ensemble_S:
+        ensemble = EnsembleSIncremental.depuis_json(args.ensemble_S)
+        print(f"📂 Ensemble S de départ : {len(ensemble):,} portes")
+    else:
+        ensemble = EnsembleSIncremental(traj.graine)
+
+    # En reprise, le nombre courant est déjà dans le flux : ne pas le réécrire
+    deja_ecrite = None
+    if args.flux and args.reprendre:
+        if reparer_flux(args.flux):
+            print(f"🩹 Flux tronqué : préfixe lisible recopié dans {args.flux}")
+        deja_ecrite = derniere_iteration_flux(args.flux)
+        manquantes = traj.iteration - (-1 if deja_ecrite is None else deja_ecrite) - 1
+        if manquantes > 0:
+            print(f"⚠️  {manquantes:,} itérations avant {traj.iteration:,} absentes du flux "
+                  f"(perdues à l'arrêt, non régénérables depuis le point de reprise)")
+
+    def sauvegarder_reprise():
+        # Flux d'abord (jamais en retard sur le point de reprise), puis S avant
+        # la trajectoire : un S en avance se recharge sans perte (ensembles)
+        if ecrivain:
+            ecrivain.vider()
+        ensemble.sauvegarder(chemin_S_reprise(args.point_reprise))
+        traj.sauvegarder(args.point_reprise)
+
+    ecrivain = EcrivainFlux(args.flux) if args.flux else None
+    debut = derniere_sauvegarde = time.time()
+    nouvelles = 0
+    k_max = 0
+    try:
+        for iteration, k, porte in flux_portes(traj, args.iterations):
+            porte = tuple(porte)
+            nouvelles += ensemble.ajouter(iteration, k, porte)
+            k_max = k
+            if ecrivain and (deja_ecrite is None or iteration > deja_ecrite):
+                ecrivain.ecrire(iteration, k, bytes(porte))
+            if args.point_reprise and time.time() - derniere_sauvegarde >= args.intervalle_sauvegarde:
+                sauvegarder_reprise()
+                derniere_sauvegarde = time.time()
+    finally:
+        if args.point_reprise:
+            sauvegarder_reprise()
+        if ecrivain:
+            ecrivain.fermer()
+    duree = time.time() - debut
+
+    ensemble.sauvegarder(args.sortie_S)
+
+    print()
+    print(f"🔢 Itération atteinte : {traj.iteration:,} ({k_max:,} chiffres)")
+    print(f"🚪 Portes dans S : {len(ensemble):,} (+{nouvelles:,} nouvelles)")
+    print(f"📏 Longueurs : {min(ensemble.portes_par_longueur)}..{max(ensemble.portes_par_longueur)}")
+    print(f"⏱️  Durée : {duree:.2f}s")
+    if ecrivain:
+        print(f"💾 Flux : {args.flux} ({ecrivain.nombre:,} enregistrements ajoutés)")
+    print(f"💾 Ensemble S : {args.sortie_S}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+GRAPHE DE TRANSITIONS DES PORTES (CSR, fichier binaire)
+=======================================================
+
+ensemble_S_ferme.json stocke graphe_transitions sous forme de dict
+{"[1, 7, 11, 10]": [{"k": 8, "porte": [...]}, ...]} : lent à parser,
+inutilisable à l'échelle K9 (601,051 portes).
+
+Ici :
+- chaque nœud est une porte (k, porte au format K*_portes.json, milieu
+  simple), numérotée par ordre (k, porte) croissant
+- arêtes en CSR : offsets[i]..offsets[i+1] indexent cibles
+- CSR inverse (prédécesseurs) calculé à la construction
+- fichier .bin lu par mmap (même principe que stockage_portes)
+
+Format (petit-boutiste), chaque section alignée sur 8 octets :
+    en-tête <8sHHQQQ> : b"LYGRAPHE", version, réservé, nœuds, arêtes, octets d'étiquettes
+    noeuds_k           uint16[nœuds]
+    etiquettes_offsets uint64[nœuds+1]   (composantes de chaque porte, 1 octet chacune)
+    etiquettes         uint8[...]
+    offsets, cibles    uint64[nœuds+1], uint32[arêtes]
+    offsets_inverse, sources_inverse
+
+Utilisation :
+    python graphe_portes.py convertir ../ensemble_S_ferme.json -o graphe_S.bin
+    python graphe_portes.py construire 3 4 5 6 7 8 -o graphe_K3_K8.bin
+    python graphe_portes.py info graphe_K3_K8.bin --porte 8 10 8 9 9
+
+Date : octobre 2025
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+MAGIC = b"LYGRAPHE"
+VERSION_GRAPHE = 1
+FORMAT_ENTETE = "<8sHHQQQ"
+TAILLE_ENTETE = struct.calcsize(FORMAT_ENTETE)
+
+
+def _aligner(position: int) -> int:
+    return position + (-position) % 8
+
+
+def porte_depuis_S(porte_S, k: int) -> tuple:
+    """Demi-porte de ensemble_S (milieu doublé) → porte au format K*_portes.json."""
+    h = k // 2
+    porte = list(porte_S[:h])
+    if k % 2 == 1:
+        if porte_S[h] % 2 != 0:
+            raise ValueError(f"Milieu doublé impair pour k={k} : {list(porte_S)}")
+        porte.append(porte_S[h] // 2)
+    return tuple(porte)
+
+
+def porte_vers_S(porte, k: int) -> tuple:
+    """Porte au format K*_portes.json → demi-porte de ensemble_S."""
+    h = k // 2
+    if k % 2 == 1:
+        return tuple(porte[:h]) + (2 * porte[h],)
+    return tuple(porte)
+
+
+def csr_depuis_paires(paires_triees, nb: int):
+    """Paires (source, cible) triées par source → (offsets uint64, cibles uint32)."""
+    offsets = array('Q', [0] * (nb + 1))
+    cibles = array('I', (c for _, c in paires_triees))
+    for s, _ in paires_triees:
+        offsets[s + 1] += 1
+    for i in range(nb):
+        offsets[i + 1] += offsets[i]
+    return offsets, cibles
+
+
+class GraphePortes:
+    """
+    Graphe porte → porte en CSR, en mémoire ou projeté depuis un .bin.
+
+    Utilisation :
+        graphe = GraphePortes.charger("graphe_K3_K8.bin")
+        i = graphe.identifiant(8, (10, 8, 9, 9))
+        [graphe.porte(j) for j in graphe.successeurs(i)]
+    """
+
+    def __init__(self, noeuds_k, etiquettes_offsets, etiquettes, offsets, cibles,
+                 offsets_inverse, sources_inverse):
+        self.noeuds_k = noeuds_k
+        self.etiquettes_offsets = etiquettes_offsets
+        self.etiquettes = etiquettes
+        self.offsets = offsets
+        self.cibles = cibles
+        self.offsets_inverse = offsets_inverse
+        self.sources_inverse = sources_inverse
+        self._plages_k = None
+        self._fichier = None
+        self._mm = None
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def depuis_aretes(cls, aretes, noeuds=()):
+        """
+        aretes : itérable de ((k, porte), (k, porte)) ; noeuds : nœuds isolés
+        éventuels. Les doublons sont retirés.
+        """
+        aretes = [((ks, tuple(ps)), (kd, tuple(pd))) for (ks, ps), (kd, pd) in aretes]
+        ensemble = {(k, tuple(p)) for k, p in noeuds}
+        for source, cible in aretes:
+            ensemble.add(source)
+            ensemble.add(cible)
+        ordonnes = sorted(ensemble)
+        index = {noeud: i for i, noeud in enumerate(ordonnes)}
+        nb = len(ordonnes)
+
+        noeuds_k = array('H', (k for k, _ in ordonnes))
+        etiquettes_offsets = array('Q', [0])
+        etiquettes = bytearray()
+        for _, porte in ordonnes:
+            etiquettes.extend(porte)
+            etiquettes_offsets.append(len(etiquettes))
+
+        paires = sorted({(index[s], index[c]) for s, c in aretes})
+        offsets, cibles = csr_depuis_paires(paires, nb)
+        offsets_inverse, sources_inverse = csr_depuis_paires(sorted((c, s) for s, c in paires), nb)
+        return cls(noeuds_k, etiquettes_offsets, bytes(etiquettes), offsets, cibles,
+                   offsets_inverse, sources_inverse)
+
+    # ------------------------------------------------------------------
+    # Requêtes
+    # ------------------------------------------------------------------
+
+    @property
+    def nombre_noeuds(self) -> int:
+        return len(self.noeuds_k)
+
+    @property
+    def nombre_aretes(self) -> int:
+        return len(self.cibles)
+
+    def __len__(self) -> int:
+        return self.nombre_noeuds
+
+    def _etiquette(self, i: int) -> bytes:
+        return bytes(self.etiquettes[self.etiquettes_offsets[i]:self.etiquettes_offsets[i + 1]])
+
+    def porte(self, i: int):
+        """Nœud i → (k, porte)."""
+        return self.noeuds_k[i], tuple(self._etiquette(i))
+
+    def plage_k(self, k: int):
+        """(premier, fin) : les nœuds de dimension k sont contigus."""
+        if self._plages_k is None:
+            plages = {}
+            for i, k_i in enumerate(self.noeuds_k):
+                debut, _ = plages.get(k_i, (i, i))
+                plages[k_i] = (debut, i + 1)
+            self._plages_k = plages
+        return self._plages_k.get(k, (0, 0))
+
+    def identifiant(self, k: int, porte):
+        """(k, porte) → numéro du nœud, ou None s'il est absent (recherche dichotomique)."""
+        debut, fin = self.plage_k(k)
+        cible = bytes(porte)
+        i = bisect_left(range(debut, fin), cible, key=self._etiquette) + debut
+        if i < fin and self._etiquette(i) == cible:
+            return i
+        return None
+
+    def successeurs(self, i: int):
+        return self.cibles[self.offsets[i]:self.offsets[i + 1]]
+
+    def predecesseurs(self, i: int):
+        return self.sources_inverse[self.offsets_inverse[i]:self.offsets_inverse[i + 1]]
+
+    def degre_sortant(self, i: int) -> int:
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def degre_entrant(self, i: int) -> int:
+        return self.offsets_inverse[i + 1] - self.offsets_inverse[i]
+
+    def successeurs_porte(self, k: int, porte) -> list:
+        """Raccourci : portes images de (k, porte), [] si le nœud est absent."""
+        i = self.identifiant(k, porte)
+        return [] if i is None else [self.porte(j) for j in self.successeurs(i)]
+
+    # ------------------------------------------------------------------
+    # Fichier binaire
+    # ------------------------------------------------------------------
+
+    def sauvegarder(self, chemin: Path):
+        sections = [self.noeuds_k, self.etiquettes_offsets, array('B', self.etiquettes),
+                    self.offsets, self.cibles, self.offsets_inverse, self.sources_inverse]
+        entete = struct.pack(FORMAT_ENTETE, MAGIC, VERSION_GRAPHE, 0,
+                             self.nombre_noeuds, self.nombre_aretes, len(self.etiquettes))
+        with open(chemin, 'wb') as f:
+            f.write(entete)
+            position = TAILLE_ENTETE
+            for section in sections:
+                section = array(section.typecode, section)
+                if sys.byteorder != "little":
+                    section.byteswap()
+                f.write(b"\0" * (_aligner(position) - position))
+                position = _aligner(position)
+                donnees = section.tobytes()
+                f.write(donnees)
+                position += len(donnees)
+
+    @classmethod
+    def charger(cls, chemin: Path):
+        """Projette un .bin en mémoire : aucune copie des tableaux (petit-boutiste)."""
+        fichier = open(chemin, 'rb')
+        mm = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, nb, nb_aretes, taille_etiquettes = struct.unpack_from(FORMAT_ENTETE, mm, 0)
+        if magic != MAGIC:
+            mm.close()
+            fichier.close()
+            raise ValueError(f"{chemin} n'est pas un graphe de portes")
+        if version != VERSION_GRAPHE:
+            mm.close()
+            fichier.close()
+            raise ValueError(f"Version de graphe inconnue : {version}")
+
+        tailles = [('H', nb), ('Q', nb + 1), ('B', taille_etiquettes),
+                   ('Q', nb + 1), ('I', nb_aretes), ('Q', nb + 1), ('I', nb_aretes)]
+        vue = memoryview(mm)
+        sections = []
+        position = TAILLE_ENTETE
+        for typecode, nombre in tailles:
+            position = _aligner(position)
+            fin = position + nombre * array(typecode).itemsize
+            if sys.byteorder == "little":
+                sections.append(vue[position:fin].cast(typecode))
+            else:
+                section = array(typecode, mm[position:fin])
+                section.byteswap()
+                sections.append(section)
+            position = fin
+
+        graphe = cls(*sections)
+        graphe._fichier, graphe._mm = fichier, mm
+        return graphe
+
+    def fermer(self):
+        if self._mm is None:
+            return
+        for nom in ("noeuds_k", "etiquettes_offsets", "etiquettes", "offsets", "cibles",
+                    "offsets_inverse", "sources_inverse"):
+            valeur = getattr(self, nom)
+            if isinstance(valeur, memoryview):
+                valeur.release()
+            setattr(self, nom, None)
+        self._mm.close()
+        self._fichier.close()
+        self._mm = self._fichier = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def __repr__(self) -> str:
+        return f"GraphePortes(noeuds={self.nombre_noeuds:,}, aretes={self.nombre_aretes:,})"
+
+
+# ============================================================================
+# CONVERTISSEURS
+# ============================================================================
+
+def graphe_depuis_ensemble_S(S_data: dict) -> GraphePortes:
+    """
+    ensemble_S_ferme.json → graphe (toutes les portes de S comme nœuds).
+
+    Les clés de graphe_transitions ne portent pas k : on le retrouve dans
+    portes_par_longueur (une demi-porte de longueur m vient de k = 2m-1 ou 2m).
+    """
+    portes_par_longueur = S_data["ensemble_S"]["portes_par_longueur"]
+    ensembles_S = {int(k): {tuple(p) for p in portes} for k, portes in portes_par_longueur.items()}
+    noeuds = [(k, porte_depuis_S(p, k)) for k, portes in ensembles_S.items() for p in portes]
+
+    def dimension_source(porte_S):
+        m = len(porte_S)
+        for k in (2 * m - 1, 2 * m):
+            if porte_S in ensembles_S.get(k, ()):
+                return k
+        # Absente de S : un milieu doublé est pair, sinon k est pair
+        return 2 * m - 1 if porte_S[-1] % 2 == 0 else 2 * m
+
+    aretes = []
+    transitions = S_data.get("graphe_transitions", {}).get("transitions", {})
+    for cle, destinations in transitions.items():
+        source_S = tuple(json.loads(cle))
+        k_source = dimension_source(source_S)
+        source = (k_source, porte_depuis_S(source_S, k_source))
+        for dest in destinations:
+            aretes.append((source, (dest["k"], porte_depuis_S(dest["porte"], dest["k"]))))
+
+    return GraphePortes.depuis_aretes(aretes, noeuds)
+
+
+def graphe_depuis_portes_K(ensembles_par_k: dict) -> GraphePortes:
+    """
+    Une arête p → image_porte(p) par porte de K_k (une seule image : T ne
+    dépend que de p) ; ensembles_par_k comme charger_portes_par_k.
+    """
+    from moteur_fermeture_portes import image_porte
+
+    aretes = []
+    noeuds = []
+    for k, ensemble in ensembles_par_k.items():
+        for porte in ensemble.portes():
+            noeuds.append((k, porte))
+            aretes.append(((k, porte), image_porte(porte, k)))
+    return GraphePortes.depuis_aretes(aretes, noeuds)
+
+
+def main():
+    from moteur_fermeture_portes import DOSSIER_PORTES_DEFAUT, charger_portes_par_k
+
+    parser = argparse.ArgumentParser(description="Graphe de transitions des portes (CSR)")
+    sous = parser.add_subparsers(dest="commande", required=True)
+
+    p_conv = sous.add_parser("convertir", help="ensemble_S_ferme.json → .bin")
+    p_conv.add_argument("fichier_S", type=Path)
+    p_conv.add_argument("-o", "--sortie", type=Path, default=Path("graphe_S.bin"))
+
+    p_cons = sous.add_parser("construire", help="K*_portes.json → .bin (p → image de p)")
+    p_cons.add_argument("k", type=int, nargs="+")
+    p_cons.add_argument("--dossier", type=Path, default=DOSSIER_PORTES_DEFAUT)
+    p_cons.add_argument("-o", "--sortie", type=Path, default=Path("graphe_portes.bin"))
+
+    p_info = sous.add_parser("info", help="résumé d'un .bin, voisins d'une porte")
+    p_info.add_argument("fichier", type=Path)
+    p_info.add_argument("--porte", type=int, nargs="+", metavar="K C",
+                        help="k puis les composantes de la porte")
+
+    args = parser.parse_args()
+
+    if args.commande in ("convertir", "construire"):
+        debut = time.time()
+        if args.commande == "convertir":
+            with open(args.fichier_S, 'r', encoding='utf-8') as f:
+                graphe = graphe_depuis_ensemble_S(json.load(f))
+        else:
+            graphe = graphe_depuis_portes_K(charger_portes_par_k(args.k, args.dossier))
+        graphe.sauvegarder(args.sortie)
+        print(f"✅ {graphe} → {args.sortie} ({args.sortie.stat().st_size:,} octets, "
+              f"{time.time() - debut:.2f}s)")
+        return
+
+    debut = time.perf_counter()
+    with GraphePortes.charger(args.fichier) as graphe:
+        duree = time.perf_counter() - debut
+        print(f"📂 {graphe} - ouverture {duree * 1000:.2f} ms")
+        if args.porte:
+            k, porte = args.porte[0], tuple(args.porte[1:])
+            i = graphe.identifiant(k, porte)
+            if i is None:
+                print(f"   porte k={k} {list(porte)} absente")
+                return
+            print(f"   nœud {i} : degré sortant {graphe.degre_sortant(i)}, entrant {graphe.degre_entrant(i)}")
+            for j in graphe.successeurs(i):
+                k_j, p_j = graphe.porte(j)
+                print(f"   → k={k_j} {list(p_j)}")
+            for j in list(graphe.predecesseurs(i))[:10]:
+                k_j, p_j = graphe.porte(j)
+                print(f"   ← k={k_j} {list(p_j)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+INDEX DES SIGNATURES ET CLASSIFICATION PAR FAMILLE
+==================================================
+
+Signature d'une porte = (première composante, dernière composante) :
+les 180 signatures stables du README. analyser_distribution_palindromes
+(verifier_fermeture_k9_exhaustif.py) les regroupe par une boucle sur un
+dict à chaque appel.
+
+Index K{k}_signatures.bin, à côté de K{k}_portes.bin (stockage_portes) :
+- signatures triées (premier, dernier), chacune avec sa plage [debut, fin)
+  dans `ordre`
+- ordre : numéros des portes du store, triés par (signature, code)
+Une signature → une tranche contiguë ; une plage de premières
+composantes → une tranche contiguë de signatures. Lecture par mmap,
+comme le store. L'en-tête garde le CRC-32 des codes du store : un store
+reconstruit (même nombre de portes, portes différentes) est refusé.
+
+Familles : S1 = portes atteintes depuis 196, S2 = depuis 879
+(fermeture_point_fixe). Deux nombres de même porte ont le même T(n) :
+une porte dont l'orbite rejoint S1 est de la famille de 196. Le
+classifieur étiquette les fermetures une fois (dict code → famille par
+k), puis chaque porte inconnue suit son orbite jusqu'à une porte
+étiquetée et mémorise tout le chemin : O(1) amorti par porte ou par pas
+de trajectoire.
+
+Utilisation :
+    python stockage_portes.py convertir
+    python index_signatures.py indexer 3 4 5 6 7 8 9
+    python index_signatures.py rapport 3 4 5 6 7 8 9
+    python index_signatures.py familles 196 295 879 978 89 --iterations 50
+
+Date : octobre 2025
+"""
+
+import argparse
+import mmap
+import struct
+import sys
+import time
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+from codec_portes import bases_porte, decoder_porte, encoder_porte, poids_porte
+from fermeture_point_fixe import fermeture_point_fixe, portes_graine
+from moteur_fermeture_portes import DOSSIER_PORTES_DEFAUT, image_porte, porte_des_chiffres
+from stockage_portes import StorePortes, chemin_store
+
+MAGIC = b"LYSIGNAT"
+VERSION_INDEX = 2
+# magic, version, k, nombre de signatures, nombre de portes, CRC-32 des codes du store, réservé
+FORMAT_ENTETE = "<8sHHIQII"
+TAILLE_ENTETE = struct.calcsize(FORMAT_ENTETE)
+
+FAMILLES_DEFAUT = {"S1": 196, "S2": 879}
+K_MAX_FAMILLES = 60
+
+
+def _aligner(position: int) -> int:
+    return position + (-position) % 8
+
+
+def chemin_index(k: int, dossier: Path) -> Path:
+    return Path(dossier) / f"K{k}" / f"K{k}_signatures.bin"
+
+
+def signature_code(code: int, k: int) -> tuple:
+    """(première, dernière composante) directement depuis le code."""
+    return code // poids_porte(k)[0], code % bases_porte(k)[-1]
+
+
+def empreinte_store(store: StorePortes) -> int:
+    """CRC-32 des codes du store, octets petit-boutistes (tels que sur disque)."""
+    if sys.byteorder == "little":
+        return zlib.crc32(store.codes)
+    codes = array(store.codes.typecode, store.codes)
+    codes.byteswap()
+    return zlib.crc32(codes)
+
+
+def construire_index(codes, k: int):
+    """
+    codes triés d'un store → (premiers, derniers, bornes, ordre).
+
+    Le tri par signature est stable : dans une signature, l'ordre des
+    codes (lexicographique) est conservé.
+    """
+    premier_poids = poids_porte(k)[0]
+    base_derniere = bases_porte(k)[-1]
+    cles = [(c // premier_poids) * base_derniere + c % base_derniere for c in codes]
+    ordre = array('I', sorted(range(len(cles)), key=cles.__getitem__))
+
+    premiers, derniers, bornes = array('B'), array('B'), array('Q', [0])
+    precedente = None
+    for position, i in enumerate(ordre):
+        cle = cles[i]
+        if cle != precedente:
+            if precedente is not None:
+                bornes.append(position)
+            premiers.append(cle // base_derniere)
+            derniers.append(cle % base_derniere)
+            precedente = cle
+    if precedente is not None:
+        bornes.append(len(ordre))
+    return premiers, derniers, bornes, ordre
+
+
+def ecrire_index(chemin: Path, k: int, premiers, derniers, bornes, ordre, empreinte: int):
+    entete = struct.pack(FORMAT_ENTETE, MAGIC, VERSION_INDEX, k, len(premiers), len(ordre), empreinte, 0)
+    with open(chemin, 'wb') as f:
+        f.write(entete)
+        position = TAILLE_ENTETE
+        for section in (premiers, derniers, bornes, ordre):
+            section = array(section.typecode, section)
+            if sys.byteorder != "little":
+                section.byteswap()
+            f.write(b"\0" * (_aligner(position) - position))
+            position = _aligner(position)
+            donnees = section.tobytes()
+            f.write(donnees)
+            position += len(donnees)
+
+
+def indexer_store(k: int, dossier: Path = DOSSIER_PORTES_DEFAUT) -> Path:
+    """K{k}_portes.bin → K{k}_signatures.bin dans le même dossier."""
+    with StorePortes(chemin_store(k, dossier)) as store:
+        ecrire_index(chemin_index(k, dossier), k, *construire_index(store.codes, k),
+                     empreinte=empreinte_store(store))
+    return chemin_index(k, dossier)
+
+
+class IndexSignatures:
+    """
+    Lecteur mmap de K{k}_signatures.bin, adossé au store des portes.
+
+    Utilisation :
+        with IndexSignatures(9) as index:
+            for code in index.codes_signature(17, 7): ...
+            index.plage_premiere(16, 18)     # signatures (16..18, *)
+    """
+
+    def __init__(self, k: int, dossier: Path = DOSSIER_PORTES_DEFAUT):
+        self.k = k
+        self.store = StorePortes(chemin_store(k, dossier))
+        try:
+            chemin = chemin_index(k, dossier)
+            self._fichier = open(chemin, 'rb')
+            self._mm = mmap.mmap(self._fichier.fileno(), 0, access=mmap.ACCESS_READ)
+
+            magic, version, k_index, nombre_signatures, nombre, empreinte, _ = struct.unpack_from(
+                FORMAT_ENTETE, self._mm, 0)
+            if magic != MAGIC or version != VERSION_INDEX:
+                raise ValueError(f"{chemin} n'est pas un index de signatures (version {VERSION_INDEX})")
+            if k_index != k or nombre != len(self.store) or empreinte != empreinte_store(self.store):
+                raise ValueError(f"{chemin} ne correspond plus à {self.store.chemin.name} : relancer indexer")
+
+            vue = memoryview(self._mm)
+            self._sections = []
+            position = TAILLE_ENTETE
+            for typecode, taille in (('B', nombre_signatures), ('B', nombre_signatures),
+                                     ('Q', nombre_signatures + 1), ('I', nombre)):
+                position = _aligner(position)
+                fin = position + taille * array(typecode).itemsize
+                if sys.byteorder == "little":
+                    section = vue[position:fin].cast(typecode)
+                else:
+                    section = array(typecode, self._mm[position:fin])
+                    section.byteswap()
+                self._sections.append(section)
+                position = fin
+            self.premiers, self.derniers, self.bornes, self.ordre = self._sections
+            base = bases_porte(k)[-1]
+            self._cles = [p * base + d for p, d in zip(self.premiers, self.derniers)]
+            self._base = base
+        except BaseException:
+            # Index absent, illisible ou périmé : ne pas laisser le store ouvert
+            self.fermer()
+            raise
+
+    def __len__(self) -> int:
+        return len(self.premiers)
+
+    def signatures(self):
+        """(premier, dernier, nombre de portes), dans l'ordre de l'index."""
+        for i in range(len(self)):
+            yield self.premiers[i], self.derniers[i], self.bornes[i + 1] - self.bornes[i]
+
+    def plage_signature(self, premier: int, dernier: int):
+        """[debut, fin) dans `ordre` ; vide si la signature est absente."""
+        i = bisect_left(self._cles, premier * self._base + dernier)
+        if i < len(self) and self._cles[i] == premier * self._base + dernier:
+            return self.bornes[i], self.bornes[i + 1]
+        return 0, 0
+
+    def plage_premiere(self, premier_min: int, premier_max: int):
+        """Indices [i, j) des signatures dont la première composante est dans l'intervalle."""
+        return (bisect_left(self._cles, premier_min * self._base),
+                bisect_right(self._cles, premier_max * self._base + self._base - 1))
+
+    def codes_signature(self, premier: int, dernier: int):
+        debut, fin = self.plage_signature(premier, dernier)
+        codes = self.store.codes
+        for position in range(debut, fin):
+            yield codes[self.ordre[position]]
+
+    def portes_signature(self, premier: int, dernier: int):
+        for code in self.codes_signature(premier, dernier):
+            yield decoder_porte(code, self.k)
+
+    def fermer(self):
+        for section in getattr(self, "_sections", ()):
+            if isinstance(section, memoryview):
+                section.release()
+        self._sections = []
+        # getattr : fermer() sert aussi quand __init__ échoue à mi-chemin
+        for ressource in (getattr(self, "_mm", None), getattr(self, "_fichier", None)):
+            if ressource is not None:
+                ressource.close()
+        self.store.fermer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def __repr__(self) -> str:
+        return f"IndexSignatures(k={self.k}, signatures={len(self)}, portes={len(self.store):,})"
+
+
+class ClassifieurFamilles:
+    """
+    Famille d'une porte, d'un nombre ou de chaque pas d'une trajectoire.
+
+    Utilisation :
+        classifieur = ClassifieurFamilles()
+        classifieur.famille_nombre(295)      # 'S1' : rejoint 196 (887)
+        classifieur.famille_nombre(978)      # 'S2'
+    """
+
+    def __init__(self, familles: dict = None, k_max: int = K_MAX_FAMILLES):
+        self.familles = dict(familles or FAMILLES_DEFAUT)
+        self.k_max = k_max
+        self.etiquettes = {}   # k → {code: nom de famille, ou None}
+        for nom, graine in self.familles.items():
+            resultat = fermeture_point_fixe(portes_graine([graine]), k_max)
+            for k, portes in resultat["portes_par_k"].items():
+                par_code = self.etiquettes.setdefault(k, {})
+                for porte in portes:
+                    par_code.setdefault(encoder_porte(porte, k), nom)
+
+    def famille_porte(self, k: int, porte):
+        """Nom de la famille, ou None si l'orbite dépasse k_max sans en rejoindre une."""
+        chemin = []
+        famille = None
+        while True:
+            if k > self.k_max:
+                break
+            code = encoder_porte(porte, k)
+            par_code = self.etiquettes.setdefault(k, {})
+            if code in par_code:
+                famille = par_code[code]
+                break
+            chemin.append((par_code, code))
+            k, porte = image_porte(porte, k)
+        for par_code, code in chemin:
+            par_code[code] = famille
+        return famille
+
+    def famille_nombre(self, n: int):
+        k, porte = portes_graine([n])[0]
+        return self.famille_porte(k, porte)
+
+    def familles_trajectoire(self, n: int, iterations: int):
+        """Génère (pas, n, famille) pour n, T(n), ... ; la famille d'un pas ne coûte qu'un accès."""
+        for pas in range(iterations + 1):
+            chiffres = [int(c) for c in str(n)]
+            yield pas, n, self.famille_porte(len(chiffres), porte_des_chiffres(chiffres))
+            n += int(str(n)[::-1])
+
+
+def rapport_signatures(dimensions, dossier: Path = DOSSIER_PORTES_DEFAUT, afficher: int = 3):
+    """Tableau portes / signatures / nouvelles signatures par k, depuis les index."""
+    print(f"{'k':>3} {'portes':>10} {'signatures':>11} {'nouvelles':>10}  plus peuplées")
+    vues = set()
+    for k in dimensions:
+        try:
+            index = IndexSignatures(k, dossier)
+        except FileNotFoundError:
+            print(f"{k:>3}  index absent (python index_signatures.py indexer {k})")
+            continue
+        with index:
+            signatures = list(index.signatures())
+            courantes = {(p, d) for p, d, _ in signatures}
+            nouvelles = len(courantes - vues) if vues else len(courantes)
+            vues |= courantes
+            top = sorted(signatures, key=lambda s: -s[2])[:afficher]
+            print(f"{k:>3} {len(index.store):>10,} {len(signatures):>11} {nouvelles:>10}  "
+                  + ", ".join(f"({p}, {d}) : {c:,}" for p, d, c in top))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index des signatures et familles")
+    sous = parser.add_subparsers(dest="commande", required=True)
+
+    p_idx = sous.add_parser("indexer", help="K*_portes.bin → K*_signatures.bin")
+    p_idx.add_argument("k", type=int, nargs="*", default=list(range(3, 10)))
+    p_idx.add_argument("--dossier", type=Path, default=DOSSIER_PORTES_DEFAUT)
+
+    p_rap = sous.add_parser("rapport", help="signatures par dimension")
+    p_rap.add_argument("k", type=int, nargs="*", default=list(range(3, 10)))
+    p_rap.add_argument("--dossier", type=Path, default=DOSSIER_PORTES_DEFAUT)
+
+    p_fam = sous.add_parser("familles", help="famille de nombres et de leurs trajectoires")
+    p_fam.add_argument("nombres", type=int, nargs="+")
+    p_fam.add_argument("--iterations", type=int, default=0, help="classer aussi chaque pas")
+    p_fam.add_argument("--k-max", type=int, default=K_MAX_FAMILLES)
+
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print("✍️  SIGNATURES ET FAMILLES")
+    print("=" * 70 + "\n")
+
+    debut = time.perf_counter()
+    if args.commande == "indexer":
+        for k in args.k:
+            if not chemin_store(k, args.dossier).exists():
+                print(f"   k={k}: K{k}_portes.bin absent (stockage_portes.py convertir {k})")
+                continue
+            chemin = indexer_store(k, args.dossier)
+            with IndexSignatures(k, args.dossier) as index:
+                print(f"✅ {index} → {chemin.name} ({chemin.stat().st_size:,} octets)")
+    elif args.commande == "rapport":
+        rapport_signatures(args.k, args.dossier)
+    else:
+        classifieur = ClassifieurFamilles(k_max=args.k_max)
+        print("🧬 Familles : " + ", ".join(f"{nom} ({n})" for nom, n in classifieur.familles.items())
+              + f", k ≤ {args.k_max}")
+        for n in args.nombres:
+            if args.iterations:
+                pas_par_famille = {}
+                for _, _, famille in classifieur.familles_trajectoire(n, args.iterations):
+                    pas_par_famille[famille] = pas_par_famille.get(famille, 0) + 1
+                detail = ", ".join(f"{f or 'aucune'} : {c}" for f, c in pas_par_famille.items())
+                print(f"   {n} → {classifieur.famille_nombre(n) or 'aucune'} ({args.iterations} pas : {detail})")
+            else:
+                print(f"   {n} → {classifieur.famille_nombre(n) or 'aucune'}")
+    print(f"\n⏱️  Durée : {(time.perf_counter() - debut) * 1000:.1f} ms\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+REVERSE-AND-ADD EN LOT (matrice de chiffres, NumPy)
+===================================================
+
+reverse_and_add(n) traite un entier à la fois : pour les 10^9 premiers
+nombres, c'est la boucle Python qui coûte, pas l'arithmétique.
+
+Ici N nombres avancent ensemble :
+- matrice D (N × C) uint8 de chiffres, poids faible en colonne 0
+- vecteur L des longueurs (les colonnes ≥ L valent 0)
+
+Une étape T sur tout le lot :
+1. renversement par groupe de lignes de même longueur (D[a:b, ℓ-1::-1]),
+   les lignes étant gardées triées par longueur
+2. sommes de paires S = D + renversé
+3. retenues en une passe : la retenue entrant en colonne i vient de la
+   dernière colonne j < i où S ≠ 9 (np.maximum.accumulate) ; la colonne L_r
+   reçoit la retenue finale, la ligne grandit d'un chiffre
+4. les lignes palindromes sont notées puis retirées du lot
+
+Convention : itérations vers un palindrome = nombre de T appliqués
+(0 si n est déjà palindrome), -1 si non atteint dans le budget.
+
+Utilisation :
+    python lot_reverse_and_add.py --fin 10000000
+    python lot_reverse_and_add.py --debut 1 --fin 1000000000 --workers 8 --iterations-max 300
+
+Date : octobre 2025
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from scanner_parallele import decouper_intervalle
+
+try:
+    import numpy as np
+except ImportError:  # NumPy requis pour ce module
+    np = None
+
+ITERATIONS_MAX_DEFAUT = 300
+
+
+def _exiger_numpy():
+    if np is None:
+        raise ImportError("NumPy est requis pour le reverse-and-add en lot (pip install numpy)")
+
+
+def matrice_depuis_entiers(nombres, capacite: int = None):
+    """
+    Entiers (< 2^63) → (D, L) : chiffres poids faible en tête, longueurs.
+
+    capacite : nombre de colonnes (au moins max(L) + 1 pour la première retenue).
+    """
+    _exiger_numpy()
+    restes = np.asarray(nombres, dtype=np.int64).copy()
+    L = np.ones(len(restes), dtype=np.int64)
+    t = restes // 10
+    while t.any():
+        L += t > 0
+        t //= 10
+    largeur = int(L.max(initial=1)) + 1
+    D = np.zeros((len(restes), max(largeur, capacite or 0)), dtype=np.uint8)
+    for i in range(largeur - 1):
+        D[:, i] = restes % 10
+        restes //= 10
+    return D, L
+
+
+def entiers_depuis_matrice(D, L) -> list:
+    """(D, L) → liste d'entiers Python (pour les vérifications)."""
+    return [int("".join(map(str, D[r, :L[r]][::-1].tolist()))) for r in range(len(L))]
+
+
+def groupes_longueur(L):
+    """
+    Génère (longueur, lignes) ; `lignes` est une tranche contiguë quand L
+    est trié (cas du lot, voir trier_par_longueur), des indices sinon.
+    """
+    if len(L) > 1 and (L[1:] < L[:-1]).any():
+        for longueur in np.unique(L):
+            yield int(longueur), np.nonzero(L == longueur)[0]
+        return
+    longueurs, debuts = np.unique(L, return_index=True)
+    fins = list(debuts[1:]) + [len(L)]
+    for longueur, a, b in zip(longueurs.tolist(), debuts.tolist(), fins):
+        yield longueur, slice(a, b)
+
+
+def trier_par_longueur(L, *tableaux):
+    """Réordonne les lignes par longueur croissante (tri stable, déjà presque trié)."""
+    if len(L) < 2 or not (L[1:] < L[:-1]).any():
+        return (L,) + tableaux
+    ordre = np.argsort(L, kind='stable')
+    return (L[ordre],) + tuple(t[ordre] for t in tableaux)
+
+
+def inverser_lignes(D, L):
+    """Chaque ligne renversée sur sa propre longueur, zéros au-delà."""
+    inverse = np.zeros_like(D)
+    for longueur, lignes in groupes_longueur(L):
+        inverse[lignes, :longueur] = D[lignes, longueur - 1::-1]
+    return inverse
+
+
+def lignes_palindromes(D, L, inverse=None):
+    """Masque des lignes dont les L_r premiers chiffres forment un palindrome."""
+    if inverse is None:
+        inverse = inverser_lignes(D, L)
+    return (D == inverse).all(axis=1)
+
+
+def retenues_entrantes(S):
+    """
+    Retenue entrant dans chaque colonne, en une passe.
+
+    Elle vient de la dernière colonne j à droite dont la somme n'est pas 9
+    (un 9 ne fait que relayer) et vaut 1 si S[j] ≥ 10. On code chaque
+    colonne non-9 par 2·j + (S[j] ≥ 10), les 9 par -2, puis
+    np.maximum.accumulate propage le code de la plus récente : le bit de
+    poids faible est la retenue, sans gather.
+    """
+    C = S.shape[1]
+    dtype = np.int16 if 2 * C + 1 < 2 ** 15 else np.int32
+    codes = np.where(S != 9, (2 * np.arange(C, dtype=dtype))[None, :] + (S >= 10), dtype(-2))
+    np.maximum.accumulate(codes, axis=1, out=codes)
+    codes &= 1
+    retenue = np.zeros_like(S)
+    retenue[:, 1:] = codes[:, :-1]
+    return retenue
+
+
+def etape_lot(D, L, inverse=None):
+    """
+    Applique T à toutes les lignes.
+
+    inverse : inverser_lignes(D, L) s'il est déjà calculé (test de palindrome)
+
+    Returns: (D, L) — D élargi si une ligne atteint le bord
+    """
+    if int(L.max()) + 1 > D.shape[1]:
+        D = np.pad(D, ((0, 0), (0, max(8, D.shape[1] // 4))))
+        inverse = None
+    if inverse is None:
+        inverse = inverser_lignes(D, L)
+
+    S = D + inverse
+    S += retenues_entrantes(S)
+    S -= 10 * (S >= 10).view(np.uint8)
+
+    L = L + (S[np.arange(len(L)), L] != 0)
+    return S, L
+
+
+def iterations_vers_palindrome(nombres, iterations_max: int = ITERATIONS_MAX_DEFAUT):
+    """
+    Nombre de T avant le premier palindrome, pour chaque nombre du lot.
+
+    Les lignes résolues quittent le lot : le coût suit les survivants.
+
+    Returns: tableau int32 (-1 : pas de palindrome en iterations_max étapes)
+    """
+    _exiger_numpy()
+    nombres = np.asarray(nombres, dtype=np.int64)
+    resultat = np.full(len(nombres), -1, dtype=np.int32)
+    D, L = matrice_depuis_entiers(nombres)
+    L, D, ids = trier_par_longueur(L, D, np.arange(len(nombres)))
+
+    inverse = None  # calculé à l'itération 0, avant la première étape
+    for iteration in range(iterations_max + 1):
+        if len(ids) == 0:
+            break
+        if iteration > 0:
+            D, L = etape_lot(D, L, inverse)
+            L, D, ids = trier_par_longueur(L, D, ids)
+        inverse = inverser_lignes(D, L)
+        palindromes = lignes_palindromes(D, L, inverse)
+        if palindromes.any():
+            resultat[ids[palindromes]] = iteration
+            garder = ~palindromes
+            ids, D, L, inverse = ids[garder], D[garder], L[garder], inverse[garder]
+            # Retirer les colonnes devenues inutiles
+            if len(L) and D.shape[1] > int(L.max()) + 16:
+                D, inverse = D[:, :int(L.max()) + 1], inverse[:, :int(L.max()) + 1]
+
+    return resultat
+
+
+# ============================================================================
+# BALAYAGE D'UN INTERVALLE (multiprocessus)
+# ============================================================================
+
+def histogramme_tranche(a: int, b: int, iterations_max: int, taille_lot: int) -> dict:
+    """{itérations: nombre de n} sur [a, b), par lots de taille_lot."""
+    histogramme = np.zeros(iterations_max + 2, dtype=np.int64)  # dernière case : non résolus
+    for debut in range(a, b, taille_lot):
+        resultat = iterations_vers_palindrome(np.arange(debut, min(debut + taille_lot, b)), iterations_max)
+        histogramme += np.bincount(np.where(resultat < 0, iterations_max + 1, resultat),
+                                   minlength=iterations_max + 2)
+    return {i: int(c) for i, c in enumerate(histogramme) if c}
+
+
+def _histogramme_tranche_worker(args):
+    return histogramme_tranche(*args)
+
+
+def balayer_intervalle(debut: int, fin: int, iterations_max: int = ITERATIONS_MAX_DEFAUT,
+                       workers: int = None, taille_lot: int = 1 << 18, afficher: bool = True) -> dict:
+    """
+    Histogramme des itérations vers un palindrome sur [debut, fin).
+
+    Returns: {itérations: nombre de n}, clé iterations_max + 1 = non résolus
+    """
+    _exiger_numpy()
+    if workers is None:
+        workers = os.cpu_count() or 1
+    tranches = decouper_intervalle(debut, fin, max(1, workers * 8, (fin - debut) // (taille_lot * 4)))
+    taches = [(a, b, iterations_max, taille_lot) for a, b in tranches]
+
+    total = {}
+    debut_temps = time.time()
+    traites = 0
+
+    def cumuler(partiel, a, b):
+        nonlocal traites
+        for i, c in partiel.items():
+            total[i] = total.get(i, 0) + c
+        traites += b - a
+        if afficher:
+            duree = time.time() - debut_temps
+            print(f"   ⏳ {traites:,}/{fin - debut:,} ({100 * traites / (fin - debut):.1f}%) - "
+                  f"{traites / max(duree, 1e-9):,.0f} nb/s")
+
+    if workers == 1:
+        for tache in taches:
+            cumuler(_histogramme_tranche_worker(tache), tache[0], tache[1])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_histogramme_tranche_worker, t): t for t in taches}
+            for future in as_completed(futures):
+                tache = futures[future]
+                cumuler(future.result(), tache[0], tache[1])
+
+    return dict(sorted(total.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Itérations vers un palindrome, en lot vectorisé")
+    parser.add_argument("--debut", type=int, default=1)
+    parser.add_argument("--fin", type=int, default=10_000_000, help="borne exclue")
+    parser.add_argument("--iterations-max", type=int, default=ITERATIONS_MAX_DEFAUT)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--taille-lot", type=int, default=1 << 18)
+    parser.add_argument("--sortie", type=Path, default=None, help="histogramme JSON")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print(f"⚡ REVERSE-AND-ADD EN LOT - [{args.debut:,}, {args.fin:,})")
+    print("=" * 70 + "\n")
+
+    debut = time.time()
+    histogramme = balayer_intervalle(args.debut, args.fin, args.iterations_max, args.workers, args.taille_lot)
+    duree = time.time() - debut
+
+    non_resolus = histogramme.pop(args.iterations_max + 1, 0)
+    total = sum(histogramme.values()) + non_resolus
+    print()
+    print(f"📊 Nombres traités : {total:,}")
+    print(f"🎯 Palindrome atteint : {total - non_resolus:,} (max {max(histogramme, default=0)} itérations)")
+    print(f"🔬 Sans palindrome en {args.iterations_max} itérations : {non_resolus:,}")
+    print(f"⏱️  Durée : {duree:.2f}s ({total / max(duree, 1e-9):,.0f} nb/s)")
+
+    if args.sortie:
+        with open(args.sortie, 'w', encoding='utf-8') as f:
+            json.dump({
+                "intervalle": [args.debut, args.fin],
+                "iterations_max": args.iterations_max,
+                "histogramme": {str(i): c for i, c in histogramme.items()},
+                "non_resolus": non_resolus,
+            }, f, indent=2)
+        print(f"💾 Histogramme : {args.sortie}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MOTEUR DE FERMETURE PAR PORTES (sans énumérer les nombres)
+==========================================================
+
+Observation clé :
+- Les colonnes de T(n) = n + reverse(n) valent s_i = chiffre_i + chiffre_(k-1-i)
+- Ces sommes de paires SONT la porte π_k(n) (le milieu compte double)
+- Donc T(n), et par suite π(T(n)), ne dépend QUE de la porte de n
+
+Méthode:
+1. Charger K_k (et K3..K_max pour S) depuis Donnees_portes/K*/K*_portes.json
+2. Pour CHAQUE porte p ∈ K_k (et non chaque nombre):
+   - Reconstruire les colonnes de T(n) et propager les retenues
+   - Calculer la porte de l'image et sa dimension
+   - Pondérer par la multiplicité de p (nombre de n ayant cette porte)
+3. Produire le même rapport que verifier_fermeture_k8()
+   (candidats_testes, fermeture_verifiee, distribution_images, ...)
+
+K8 : 46,036 portes au lieu de 90,000,000 nombres.
+K9 : 601,051 portes au lieu de 900,000,000 nombres.
+
+Date : octobre 2025
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+from codec_portes import encoder_porte, ensemble_portes_vide
+from stockage_portes import StorePortes
+
+
+DOSSIER_PORTES_DEFAUT = Path(__file__).resolve().parent.parent / "Donnees_portes"
+
+
+def charger_portes_k(k: int, dossier: Path = DOSSIER_PORTES_DEFAUT):
+    """
+    Charge K{k}_portes.json sous forme de codes (BitmapPortes, ou
+    CodesPortes pour les grandes dimensions).
+
+    Gère les deux formats : liste de portes, ou entrées dict {"porte": [...]}
+    (variante K8). Si K{k}_portes.bin (stockage_portes) existe et n'est pas
+    plus ancien que le JSON, ses codes sont copiés tels quels, sans passer
+    par des tuples. Les appelants qui ont besoin des portes les décodent
+    explicitement (ensemble.portes()).
+
+    Returns: (ensemble de codes, metadata) ou (None, None) si absent
+    """
+    json_path = Path(dossier) / f"K{k}" / f"K{k}_portes.json"
+    bin_path = json_path.with_suffix(".bin")
+    if bin_path.exists() and (not json_path.exists()
+                              or bin_path.stat().st_mtime >= json_path.stat().st_mtime):
+        with StorePortes(bin_path) as store:
+            ensemble = ensemble_portes_vide(k)
+            for code in store.codes:
+                ensemble.ajouter(code)
+            return ensemble, store.metadata
+    if not json_path.exists():
+        return None, None
+
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    ensemble = ensemble_portes_vide(k)
+    for entry in data.get("portes", []):
+        if isinstance(entry, dict):
+            entry = entry["porte"]
+        ensemble.ajouter(encoder_porte(entry, k))
+
+    return ensemble, data.get("metadata", {})
+
+
+def charger_portes_par_k(dimensions, dossier: Path = DOSSIER_PORTES_DEFAUT) -> dict:
+    """Charge toutes les dimensions disponibles parmi `dimensions` ({k: ensemble de codes})."""
+    ensembles = {}
+    for k in dimensions:
+        ensemble, _ = charger_portes_k(k, dossier)
+        if ensemble is not None:
+            ensembles[k] = ensemble
+    return ensembles
+
+
+# Nombre de (a, b) ∈ [0,9]² avec a+b = s, puis avec a ≥ 1 (paire extérieure)
+PAIRES_INTERIEURES = tuple(min(s, 18 - s) + 1 for s in range(19))
+PAIRES_EXTERIEURES = tuple(c - (1 if s <= 9 else 0) for s, c in enumerate(PAIRES_INTERIEURES))
+
+
+def multiplicite_porte(porte: tuple, k: int) -> int:
+    """
+    Nombre de n à k chiffres ayant cette porte.
+
+    Paire j de somme s : nombre de (a, b) ∈ [0,9]² avec a+b = s,
+    avec a ≥ 1 pour la paire extérieure (pas de zéro en tête).
+    Le chiffre du milieu (k impair) est fixé par la porte.
+    """
+    if k % 2 == 1 and not 0 <= porte[k // 2] <= 9:
+        return 0
+    s = porte[0]
+    if not 0 <= s <= 18:
+        return 0
+    m = PAIRES_EXTERIEURES[s]
+    for j in range(1, k // 2):
+        s = porte[j]
+        if not 0 <= s <= 18:
+            return 0
+        m *= PAIRES_INTERIEURES[s]
+    return m
+
+
+def representant_porte(porte: tuple, k: int):
+    """Plus petit n à k chiffres ayant cette porte (None si aucun)."""
+    if multiplicite_porte(porte, k) == 0:
+        return None
+    chiffres = [0] * k
+    for j in range(k // 2):
+        s = porte[j]
+        a = max(1 if j == 0 else 0, s - 9)
+        chiffres[j] = a
+        chiffres[k - 1 - j] = s - a
+    if k % 2 == 1:
+        chiffres[k // 2] = porte[k // 2]
+    return int(''.join(map(str, chiffres)))
+
+
+def colonnes_T(porte: tuple, k: int) -> list:
+    """
+    Sommes par colonne de n + reverse(n), du poids fort au poids faible.
+
+    Colonnes symétriques ; le chiffre du milieu (k impair) est additionné
+    à lui-même.
+    """
+    h = k // 2
+    colonnes = [0] * k
+    for j in range(h):
+        colonnes[j] = porte[j]
+        colonnes[k - 1 - j] = porte[j]
+    if k % 2 == 1:
+        colonnes[h] = 2 * porte[h]
+    return colonnes
+
+
+def chiffres_T(porte: tuple, k: int) -> list:
+    """Chiffres de T(n) (poids fort en tête) par propagation des retenues."""
+    colonnes = colonnes_T(porte, k)
+    chiffres = [0] * k
+    retenue = 0
+    for i in range(k - 1, -1, -1):
+        t = colonnes[i] + retenue
+        chiffres[i] = t % 10
+        retenue = t // 10
+    if retenue:
+        chiffres.insert(0, retenue)
+    return chiffres
+
+
+def porte_des_chiffres(chiffres: list) -> tuple:
+    """Porte π_k d'une liste de chiffres (même formule que calculer_porte_generale)."""
+    k = len(chiffres)
+    porte = [chiffres[i] + chiffres[k - 1 - i] for i in range(k // 2)]
+    if k % 2 == 1:
+        porte.append(chiffres[k // 2])
+    return tuple(porte)
+
+
+def image_porte(porte: tuple, k: int):
+    """
+    Porte de T(n) pour tout n de porte `porte`.
+
+    Returns: (k_image, porte_image) — k_image vaut k ou k+1
+    """
+    chiffres = chiffres_T(porte, k)
+    return len(chiffres), porte_des_chiffres(chiffres)
+
+
+def calculer_fermeture_portes(ensemble_k, k: int, ensembles_par_k: dict) -> dict:
+    """
+    Vérifie image(K_k) ⊆ S porte par porte.
+
+    ensemble_k et ensembles_par_k : codes (BitmapPortes/CodesPortes), comme
+    les renvoie charger_portes_par_k. Une image de dimension k' est testée
+    contre K_k' si cette dimension est chargée ; sinon elle est simplement
+    observée (comme les portes k=9 dans verifier_fermeture_k8()).
+    """
+    candidats_testes = 0
+    violations = []
+    portes_observees = {}
+    distribution_images = {}
+    distribution_k_images = {}
+
+    for porte in ensemble_k.portes():  # ordre des codes = ordre lexicographique
+        m = multiplicite_porte(porte, k)
+        if m == 0:
+            continue
+        candidats_testes += m
+
+        k_image, porte_image = image_porte(porte, k)
+        dim_image = len(porte_image)
+        distribution_images[dim_image] = distribution_images.get(dim_image, 0) + m
+        distribution_k_images[k_image] = distribution_k_images.get(k_image, 0) + m
+
+        if k_image not in ensembles_par_k:
+            portes_observees.setdefault(k_image, set()).add(porte_image)
+        elif encoder_porte(porte_image, k_image) not in ensembles_par_k[k_image]:
+            violations.append({
+                "porte_n": list(porte),
+                "multiplicite": m,
+                "n_exemple": representant_porte(porte, k),
+                "k_image": k_image,
+                "porte_image": list(porte_image)
+            })
+
+    resultats = {
+        "dimension": k,
+        "methode": "portes",
+        "portes_testees": len(ensemble_k),
+        "candidats_testes": candidats_testes,
+        "intervalle": [10 ** (k - 1), 10 ** k - 1],
+        "fermeture_verifiee": len(violations) == 0,
+        "violations_count": len(violations),
+        "violations_candidats": sum(v["multiplicite"] for v in violations),
+        "violations": violations[:100],
+        "distribution_images": distribution_images,
+        "distribution_k_images": distribution_k_images,
+        "dimensions_S": sorted(ensembles_par_k.keys()),
+    }
+    for k_obs, portes_obs in sorted(portes_observees.items()):
+        resultats[f"portes_k{k_obs}_observees"] = [list(p) for p in sorted(portes_obs)]
+        resultats[f"portes_k{k_obs}_count"] = len(portes_obs)
+
+    return resultats
+
+
+def verifier_fermeture_portes(k: int, dossier: Path = DOSSIER_PORTES_DEFAUT,
+                              k_max: int = None, sauvegarder: bool = True):
+    """
+    🌟 VÉRIFICATION DE FERMETURE k PAR PORTES 🌟
+
+    S = K3 ∪ ... ∪ K_k_max (par défaut k_max = k+1, pour tester aussi
+    les images qui montent d'une dimension quand ce fichier existe).
+    """
+    if k_max is None:
+        k_max = k + 1
+
+    print("\n" + "=" * 70)
+    print(f"🌟 VÉRIFICATION k={k} PAR PORTES (sans énumération) 🌟")
+    print("=" * 70 + "\n")
+
+    print("📂 Chargement des portes...")
+    debut_chargement = time.time()
+    portes_par_k = charger_portes_par_k(range(3, k_max + 1), dossier)
+    duree_chargement = time.time() - debut_chargement
+
+    for k_charge in sorted(portes_par_k):
+        print(f"   k={k_charge}: {len(portes_par_k[k_charge]):,} portes")
+    print(f"⏱️  Chargement : {duree_chargement:.2f}s\n")
+
+    if k not in portes_par_k:
+        raise FileNotFoundError(f"K{k}_portes.json introuvable dans {dossier}")
+
+    debut = time.time()
+    resultats = calculer_fermeture_portes(portes_par_k[k], k, portes_par_k)
+    duree = time.time() - debut
+
+    resultats["duree_chargement_secondes"] = duree_chargement
+    resultats["duree_secondes"] = duree
+    resultats["vitesse_portes_par_sec"] = resultats["portes_testees"] / duree if duree > 0 else 0
+    resultats["timestamp"] = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    # RÉSULTATS
+    print("=" * 70)
+    print(f"📊 RÉSULTATS k={k}")
+    print("=" * 70 + "\n")
+
+    print(f"🚪 Portes testées : {resultats['portes_testees']:,}")
+    print(f"📌 Candidats couverts : {resultats['candidats_testes']:,}")
+    print(f"⏱️  Durée : {duree:.2f}s\n")
+
+    if resultats["fermeture_verifiee"]:
+        print("✅✅✅ FERMETURE 100% VÉRIFIÉE ! ✅✅✅")
+        print(f"🏆 Théorème : Candidats K{k} → images ∈ S **PROUVÉ** !\n")
+    else:
+        print(f"❌ VIOLATIONS DÉTECTÉES : {resultats['violations_count']} portes "
+              f"({resultats['violations_candidats']:,} candidats)")
+        for v in resultats["violations"][:5]:
+            print(f"  • porte={v['porte_n']} (ex. n={v['n_exemple']}) → "
+                  f"k={v['k_image']}, porte_image={v['porte_image']}")
+        print()
+
+    if resultats["distribution_images"]:
+        print("📊 DISTRIBUTION DES IMAGES :")
+        total_images = resultats["candidats_testes"]
+        for dim_img in sorted(resultats["distribution_images"]):
+            count = resultats["distribution_images"][dim_img]
+            pourcentage = (count / total_images * 100) if total_images > 0 else 0
+            barre = "█" * min(50, int(pourcentage / 2))
+            print(f"   Porte dim {dim_img} : {count:,} images ({pourcentage:>5.1f}%) {barre}")
+        print()
+
+    for cle in resultats:
+        if cle.startswith("portes_k") and cle.endswith("_count"):
+            print(f"🔭 {cle} : {resultats[cle]:,} (dimension non chargée)")
+
+    if sauvegarder:
+        fichier_resultats = f"verification_k{k}_portes_{resultats['timestamp']}.json"
+        with open(fichier_resultats, 'w', encoding='utf-8') as f:
+            json.dump(resultats, f, indent=2, ensure_ascii=False)
+        print(f"💾 Résultats sauvegardés : {fichier_resultats}\n")
+
+    return resultats["fermeture_verifiee"], resultats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fermeture de K_k vérifiée porte par porte")
+    parser.add_argument("k", type=int, nargs="+", help="dimension(s) à vérifier")
+    parser.add_argument("--dossier", type=Path, default=DOSSIER_PORTES_DEFAUT,
+                        help="dossier contenant K*/K*_portes.json")
+    parser.add_argument("--k-max", type=int, default=None,
+                        help="plus grande dimension incluse dans S (défaut : k+1)")
+    parser.add_argument("--sans-sauvegarde", action="store_true")
+    args = parser.parse_args()
+
+    succes = True
+    for k in args.k:
+        fermeture, _ = verifier_fermeture_portes(k, args.dossier, args.k_max,
+                                                 sauvegarder=not args.sans_sauvegarde)
+        succes = succes and fermeture
+
+    if succes:
+        print("\n✅ Script terminé avec succès !")
+    else:
+        print("\n⚠️  Script terminé avec violations détectées.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NOYAU DE CALCUL DES PORTES PAR TABLES (demi-nombres)
+====================================================
+
+Identité utilisée :
+- Découper n = haut·10^b + bas (b = nombre de chiffres de `bas`)
+- Chaque paire (chiffre_j, chiffre_(k-1-j)) a un chiffre dans `haut`
+  et son partenaire dans `bas` (lu à l'envers)
+- Donc  code(n) = TABLE_HAUT[haut] + TABLE_BAS[bas]
+
+Deux tables de 10^h entrées remplacent str(n) + liste de chiffres
+(calculer_porte_k8, calculer_porte_k7, calculer_porte).
+
+Pour k impair, le chiffre du milieu est le chiffre de tête de `bas`
+(b = h + 1) et reste en base 10 dans le code (voir codec_portes).
+
+Chemin NumPy (optionnel) : un bloc de lignes `haut` × toutes les colonnes
+`bas` est calculé en UN np.add.outer ; k=8 fait 9,000 × 10,000 codes.
+
+Date : octobre 2025
+"""
+
+import argparse
+import time
+
+from codec_portes import BASE_MILIEU, BASE_PAIRE, taille_espace
+
+try:
+    import numpy as np
+except ImportError:  # NumPy optionnel : seul le chemin vectorisé en dépend
+    np = None
+
+
+def decoupage(k: int):
+    """(chiffres de haut, chiffres de bas) pour un nombre à k chiffres."""
+    h = k // 2
+    return h, k - h
+
+
+def tables_porte(k: int):
+    """
+    Construit (TABLE_HAUT, TABLE_BAS, 10^b) pour la dimension k.
+
+    TABLE_HAUT[x] : contribution des h chiffres de tête (x sur h chiffres)
+    TABLE_BAS[y]  : contribution des b chiffres de queue (y complété de zéros)
+    """
+    h, b = decoupage(k)
+    facteur_milieu = BASE_MILIEU if k % 2 == 1 else 1
+
+    # Σ chiffre_j · 19^(h-1-j), chiffres de x lus de gauche à droite
+    table_haut = [0] * (10 ** h)
+    for x in range(10 ** h):
+        valeur, reste = 0, x
+        puissance = 1
+        for _ in range(h):
+            reste, c = divmod(reste, 10)
+            valeur += c * puissance
+            puissance *= BASE_PAIRE
+        table_haut[x] = valeur * facteur_milieu
+
+    # Les h derniers chiffres de y, lus à l'envers, + le milieu éventuel
+    table_bas = [0] * (10 ** b)
+    for y in range(10 ** b):
+        valeur, reste = 0, y
+        chiffres_bas = []
+        for _ in range(h):
+            reste, c = divmod(reste, 10)
+            chiffres_bas.append(c)
+        # chiffres_bas[0] = dernier chiffre de n → partenaire du premier chiffre
+        for c in chiffres_bas:
+            valeur = valeur * BASE_PAIRE + c
+        if k % 2 == 1:
+            valeur = valeur * BASE_MILIEU + reste
+        table_bas[y] = valeur
+
+    return table_haut, table_bas, 10 ** b
+
+
+def code_porte_tables(n: int, tables) -> int:
+    """Code de la porte de n à partir des tables de sa dimension."""
+    table_haut, table_bas, diviseur = tables
+    haut, bas = divmod(n, diviseur)
+    return table_haut[haut] + table_bas[bas]
+
+
+def blocs_codes(k: int, debut: int = None, fin: int = None, tables=None):
+    """
+    Génère (n_debut, codes) pour [debut, fin) par blocs d'un même `haut`.
+
+    codes[i] est le code de la porte de n_debut + i. Aucune conversion
+    en chaîne ; un bloc complet fait 10^b codes.
+    """
+    if debut is None:
+        debut = 10 ** (k - 1)
+    if fin is None:
+        fin = 10 ** k
+    if tables is None:
+        tables = tables_porte(k)
+    table_haut, table_bas, diviseur = tables
+
+    n = debut
+    while n < fin:
+        haut, bas = divmod(n, diviseur)
+        bas_fin = min(diviseur, bas + (fin - n))
+        base = table_haut[haut]
+        yield n, [base + t for t in table_bas[bas:bas_fin]]
+        n += bas_fin - bas
+
+
+def codes_plage(k: int, debut: int = None, fin: int = None):
+    """Génère le code de chaque n de [debut, fin), dans l'ordre."""
+    for _, codes in blocs_codes(k, debut, fin):
+        yield from codes
+
+
+def compter_codes(k: int, debut: int = None, fin: int = None) -> list:
+    """Histogramme (liste de taille_espace(k)) des codes sur [debut, fin), pur Python."""
+    compte = [0] * taille_espace(k)
+    for _, codes in blocs_codes(k, debut, fin):
+        for code in codes:
+            compte[code] += 1
+    return compte
+
+
+# ============================================================================
+# CHEMIN NUMPY
+# ============================================================================
+
+def _exiger_numpy():
+    if np is None:
+        raise ImportError("NumPy est requis pour le chemin vectorisé (pip install numpy)")
+
+
+def tables_porte_numpy(k: int):
+    """Tables en tableaux NumPy (uint32 : les codes K12 < 19⁶ tiennent)."""
+    _exiger_numpy()
+    table_haut, table_bas, diviseur = tables_porte(k)
+    dtype = np.uint32 if taille_espace(k) < 2 ** 32 else np.uint64
+    return np.asarray(table_haut, dtype=dtype), np.asarray(table_bas, dtype=dtype), diviseur
+
+
+def bloc_codes_numpy(haut_debut: int, haut_fin: int, tables_np):
+    """
+    Codes des nombres haut·10^b + bas pour haut ∈ [haut_debut, haut_fin),
+    bas ∈ [0, 10^b), en une seule somme externe : tableau (lignes, 10^b).
+    """
+    table_haut, table_bas, _ = tables_np
+    return np.add.outer(table_haut[haut_debut:haut_fin], table_bas)
+
+
+def blocs_codes_numpy(k: int, lignes: int = 1000, tables_np=None):
+    """Génère (haut_debut, bloc 2D de codes) sur toute la plage des k chiffres."""
+    _exiger_numpy()
+    if tables_np is None:
+        tables_np = tables_porte_numpy(k)
+    h, _ = decoupage(k)
+    haut_min, haut_max = 10 ** (h - 1), 10 ** h
+    for haut in range(haut_min, haut_max, lignes):
+        yield haut, bloc_codes_numpy(haut, min(haut + lignes, haut_max), tables_np)
+
+
+def compter_codes_numpy(k: int, lignes: int = 1000):
+    """Histogramme des codes sur les 9·10^(k-1) nombres à k chiffres (np.bincount par bloc)."""
+    _exiger_numpy()
+    taille = taille_espace(k)
+    compte = np.zeros(taille, dtype=np.int64)
+    for _, bloc in blocs_codes_numpy(k, lignes):
+        compte += np.bincount(bloc.ravel(), minlength=taille)
+    return compte
+
+
+def masque_bitmap_numpy(bitmap):
+    """BitmapPortes → tableau booléen indexable par code."""
+    _exiger_numpy()
+    bits = np.frombuffer(bytes(bitmap.bits), dtype=np.uint8)
+    return np.unpackbits(bits, bitorder='little')[:bitmap.taille].astype(bool)
+
+
+# ============================================================================
+# SCAN EXHAUSTIF
+# ============================================================================
+
+def scanner_exhaustif(k: int, utiliser_numpy: bool = None, lignes: int = 1000) -> dict:
+    """
+    Histogramme exhaustif des codes pour les 9·10^(k-1) nombres à k chiffres.
+
+    Returns: {code: nombre de n} pour chaque code atteint
+    """
+    if utiliser_numpy is None:
+        utiliser_numpy = np is not None
+    if utiliser_numpy:
+        compte = compter_codes_numpy(k, lignes)
+        codes = np.nonzero(compte)[0]
+        return dict(zip(codes.tolist(), compte[codes].tolist()))
+    compte = compter_codes(k)
+    return {code: c for code, c in enumerate(compte) if c}
+
+
+def main():
+    from codec_portes import decoder_porte
+    from moteur_fermeture_portes import charger_portes_k, multiplicite_porte
+
+    parser = argparse.ArgumentParser(description="Scan exhaustif des portes par tables")
+    parser.add_argument("k", type=int)
+    parser.add_argument("--sans-numpy", action="store_true", help="forcer le chemin pur Python")
+    parser.add_argument("--lignes", type=int, default=1000, help="lignes `haut` par bloc NumPy")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print(f"🚀 SCAN EXHAUSTIF PAR TABLES - k={args.k}")
+    print("=" * 70 + "\n")
+
+    debut = time.time()
+    histogramme = scanner_exhaustif(args.k, not args.sans_numpy and np is not None, args.lignes)
+    duree = time.time() - debut
+    total = sum(histogramme.values())
+
+    print(f"📊 Nombres scannés : {total:,}")
+    print(f"🚪 Portes distinctes atteintes : {len(histogramme):,}")
+    print(f"⏱️  Durée : {duree:.2f}s ({total / duree:,.0f} nb/s)\n")
+
+    bitmap, _ = charger_portes_k(args.k)
+    if bitmap is not None:
+        candidats = sum(c for code, c in histogramme.items() if code in bitmap)
+        ecarts = [code for code, c in histogramme.items()
+                  if c != multiplicite_porte(decoder_porte(code, args.k), args.k)]
+        print(f"📌 Candidats K{args.k} : {candidats:,}")
+        print(f"🔬 Écarts avec la multiplicité théorique : {len(ecarts)}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PALINDROMES ET PORTES : GÉNÉRATION ET APPARTENANCE VECTORISÉE
+=============================================================
+
+verifier_palindromes_dans_k9 dépend d'un fichier externe
+(resultats_analyse_palindromes.json, 260 palindromes) et teste chaque
+palindrome un par un (est_palindrome, calculer_porte_complete).
+
+Or la porte d'un palindrome ne dépend que de sa première moitié
+a_0 ... a_(m-1) :
+    porte = (2·a_0, ..., 2·a_(h-1)[, a_h])      (milieu brut si k impair)
+Son code (codec_portes) est donc une somme Σ a_j · c_j : les codes de
+TOUS les palindromes à k chiffres (9·10^(m-1)) se calculent par lots
+NumPy, puis np.searchsorted contre les codes triés de K_k.
+
+Quand il y a plus de palindromes que de portes (k grand), on parcourt
+plutôt les portes de K_k : une porte contient un palindrome si toutes
+ses sommes de paires sont paires et la première ≥ 2. Les deux chemins
+donnent la même intersection ; le plus court est choisi.
+
+Utilisation :
+    python palindromes_portes.py verifier 3 4 5 6 7 8 9 10 11 12
+    python palindromes_portes.py verifier 9 --dossier F:/.../Listes_Portes --sortie palindromes_K9.json
+    python palindromes_portes.py generer 7 --limite 20
+    python palindromes_portes.py generer 12 --codes --limite 5
+
+Date : octobre 2025
+"""
+
+import argparse
+import itertools
+import json
+import time
+from pathlib import Path
+
+from codec_portes import decoder_porte, poids_porte, taille_espace
+from moteur_fermeture_portes import DOSSIER_PORTES_DEFAUT, charger_portes_k
+from stockage_portes import StorePortes, chemin_store
+
+try:
+    import numpy as np
+except ImportError:  # Sans NumPy : même résultat, palindrome par palindrome
+    np = None
+
+TAILLE_LOT_DEFAUT = 1 << 20
+
+
+def nombre_palindromes(k: int) -> int:
+    return 9 * 10 ** ((k + 1) // 2 - 1)
+
+
+def coefficients_palindrome(k: int) -> list:
+    """c_j tels que code(porte du palindrome) = Σ a_j · c_j (a_j : chiffres de la moitié)."""
+    poids = poids_porte(k)
+    h = k // 2
+    coefficients = [2 * poids[j] for j in range(h)]
+    if k % 2 == 1:
+        coefficients.append(poids[h])
+    return coefficients
+
+
+def palindrome_depuis_moitie(moitie: int, k: int) -> int:
+    s = str(moitie)
+    return int(s + s[::-1][k % 2:])
+
+
+def palindrome_de_porte(porte, k: int):
+    """Palindrome de la porte, ou None (une porte en contient au plus un)."""
+    h = k // 2
+    if porte[0] < 2 or any(s % 2 for s in porte[:h]):
+        return None
+    moitie = [s // 2 for s in porte[:h]] + ([porte[h]] if k % 2 == 1 else [])
+    return palindrome_depuis_moitie(int("".join(map(str, moitie))), k)
+
+
+def palindromes(k: int):
+    """Tous les palindromes à k chiffres, croissants."""
+    m = (k + 1) // 2
+    for moitie in range(10 ** (m - 1), 10 ** m):
+        yield palindrome_depuis_moitie(moitie, k)
+
+
+def codes_palindromes(k: int):
+    """Codes des portes des palindromes à k chiffres, dans l'ordre des palindromes (tout k)."""
+    coefficients = coefficients_palindrome(k)
+    plages = [range(1, 10)] + [range(10)] * (len(coefficients) - 1)
+    for chiffres in itertools.product(*plages):
+        yield sum(a * c for a, c in zip(chiffres, coefficients))
+
+
+def lots_codes_palindromes_numpy(k: int, taille_lot: int = TAILLE_LOT_DEFAUT):
+    """Génère des tableaux uint64 de codes (espace des codes < 2^64 : k ≤ 31)."""
+    if taille_espace(k) >= 2 ** 64:
+        raise ValueError(f"k={k} : codes au-delà de 64 bits, utiliser codes_palindromes")
+    coefficients = np.asarray(coefficients_palindrome(k), dtype=np.uint64)
+    m = len(coefficients)
+    for debut in range(10 ** (m - 1), 10 ** m, taille_lot):
+        moities = np.arange(debut, min(debut + taille_lot, 10 ** m), dtype=np.uint64)
+        codes = np.zeros(len(moities), dtype=np.uint64)
+        for j in range(m - 1, -1, -1):
+            codes += (moities % np.uint64(10)) * coefficients[j]
+            moities //= np.uint64(10)
+        yield codes
+
+
+def codes_portes_k(k: int, dossier: Path = DOSSIER_PORTES_DEFAUT):
+    """Codes triés de K_k : K{k}_portes.bin si présent, sinon le JSON (None si absent)."""
+    chemin = chemin_store(k, dossier)
+    if chemin.exists():
+        with StorePortes(chemin) as store:
+            return np.array(store.codes, dtype=np.uint64) if np is not None else list(store.codes)
+    ensemble, _ = charger_portes_k(k, dossier)
+    if ensemble is None:
+        return None
+    codes = list(ensemble.codes())
+    if np is not None and taille_espace(k) < 2 ** 64:
+        return np.asarray(codes, dtype=np.uint64)
+    return codes
+
+
+def _intersection_par_palindromes(codes_k, k: int, taille_lot: int) -> list:
+    """Chaque lot de codes de palindromes cherché dans les codes triés de K_k."""
+    if len(codes_k) == 0:
+        return []
+    if np is None or not hasattr(codes_k, "dtype"):
+        ensemble = set(codes_k)
+        return [c for c in codes_palindromes(k) if c in ensemble]
+    trouves = []
+    for lot in lots_codes_palindromes_numpy(k, taille_lot):
+        positions = np.searchsorted(codes_k, lot)
+        positions[positions == len(codes_k)] = 0
+        trouves.extend(lot[codes_k[positions] == lot].tolist())
+    return trouves
+
+
+def _intersection_par_portes(codes_k, k: int) -> list:
+    """Filtre les portes de K_k : sommes de paires toutes paires, première ≥ 2."""
+    h = k // 2
+    poids = poids_porte(k)
+    if np is None or not hasattr(codes_k, "dtype"):
+        return [c for c in codes_k if palindrome_de_porte(decoder_porte(c, k), k) is not None]
+    masque = codes_k // np.uint64(poids[0]) >= 2
+    for j in range(h):
+        masque &= (codes_k // np.uint64(poids[j])) % np.uint64(19) % np.uint64(2) == 0
+    return codes_k[masque].tolist()
+
+
+def palindromes_dans_K(k: int, dossier: Path = DOSSIER_PORTES_DEFAUT,
+                       taille_lot: int = TAILLE_LOT_DEFAUT, methode: str = None):
+    """
+    Portes de K_k qui contiennent un palindrome.
+
+    methode : "palindromes", "portes", ou None (le parcours le plus court)
+
+    Returns: dict, ou None si K_k est absent
+    """
+    codes_k = codes_portes_k(k, dossier)
+    if codes_k is None:
+        return None
+    if methode is None:
+        methode = "palindromes" if nombre_palindromes(k) <= len(codes_k) else "portes"
+
+    debut = time.time()
+    if methode == "palindromes":
+        codes = _intersection_par_palindromes(codes_k, k, taille_lot)
+    else:
+        codes = _intersection_par_portes(codes_k, k)
+    codes = sorted(codes)
+    portes = [decoder_porte(c, k) for c in codes]
+
+    return {
+        "dimension": k,
+        "palindromes": nombre_palindromes(k),
+        "portes_K": len(codes_k),
+        "methode": methode,
+        "portes_palindromes": len(codes),
+        "exemples": [{"palindrome": palindrome_de_porte(p, k), "porte": list(p)} for p in portes[:20]],
+        "duree": time.time() - debut,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Palindromes et portes K_k")
+    sous = parser.add_subparsers(dest="commande", required=True)
+
+    p_gen = sous.add_parser("generer", help="palindromes (ou codes de portes) à k chiffres")
+    p_gen.add_argument("k", type=int)
+    p_gen.add_argument("--codes", action="store_true", help="codes de portes au lieu des nombres")
+    p_gen.add_argument("--limite", type=int, default=None)
+
+    p_ver = sous.add_parser("verifier", help="portes de K_k contenant un palindrome")
+    p_ver.add_argument("k", type=int, nargs="*", default=list(range(3, 13)))
+    p_ver.add_argument("--dossier", type=Path, default=DOSSIER_PORTES_DEFAUT)
+    p_ver.add_argument("--methode", choices=["palindromes", "portes"], default=None)
+    p_ver.add_argument("--taille-lot", type=int, default=TAILLE_LOT_DEFAUT)
+    p_ver.add_argument("--sortie", type=Path, default=None)
+
+    args = parser.parse_args()
+
+    if args.commande == "generer":
+        source = codes_palindromes(args.k) if args.codes else palindromes(args.k)
+        for valeur in itertools.islice(source, args.limite):
+            print(valeur)
+        return
+
+    print("\n" + "=" * 70)
+    print("🪞 PALINDROMES DANS LES PORTES K_k")
+    print("=" * 70 + "\n")
+
+    resultats = {}
+    for k in args.k:
+        resultat = palindromes_dans_K(k, args.dossier, args.taille_lot, args.methode)
+        if resultat is None:
+            print(f"   k={k}: K{k}_portes absent, ignoré")
+            continue
+        resultats[str(k)] = resultat
+        marque = "✅" if resultat["portes_palindromes"] == 0 else "⚠️ "
+        print(f"{marque} k={k}: {resultat['portes_palindromes']:,} portes à palindrome sur "
+              f"{resultat['portes_K']:,} ({resultat['palindromes']:,} palindromes, "
+              f"par {resultat['methode']}, {resultat['duree']:.2f}s)")
+        for exemple in resultat["exemples"][:3]:
+            print(f"      {exemple['palindrome']} : porte {exemple['porte']}")
+
+    total = sum(r["portes_palindromes"] for r in resultats.values())
+    print(f"\n{'✅ Aucune porte à palindrome' if total == 0 else f'⚠️  {total:,} portes à palindrome'} "
+          f"dans K{', K'.join(resultats)}")
+
+    if args.sortie:
+        with open(args.sortie, 'w', encoding='utf-8') as f:
+            json.dump(resultats, f, indent=2, ensure_ascii=False)
+        print(f"💾 Résultats : {args.sortie}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+POINTS DE REPRISE POUR LES LONGS SCANS
+======================================
+
+Un scan K9/K10 qui plante à 90% ne doit pas repartir de zéro.
+
+Fichier compagnon (sidecar) JSON, petit, réécrit périodiquement :
+- signature du scan (k, source de S) : refuse une reprise incompatible
+- bornes des tranches (la reprise les réutilise, quel que soit le
+  nombre de workers) et tranches terminées
+- compteurs cumulés, portes observées, échantillon de violations
+- durée cumulée et timestamp du premier lancement
+
+L'écriture est atomique (fichier temporaire + os.replace) : un arrêt
+pendant la sauvegarde laisse l'ancien point de reprise intact.
+
+Date : octobre 2025
+"""
+
+import json
+import os
+from pathlib import Path
+
+VERSION_POINT_REPRISE = 2
+
+
+def chemin_point_reprise_defaut(k: int) -> Path:
+    """Nom du fichier compagnon dans le dossier courant."""
+    return Path(f"reprise_scan_k{k}.json")
+
+
+def sauvegarder_point_reprise(chemin: Path, signature: dict, etat: dict):
+    """Écrit {version, signature, etat} de façon atomique."""
+    chemin = Path(chemin)
+    temporaire = chemin.with_name(chemin.name + ".tmp")
+    contenu = {
+        "version": VERSION_POINT_REPRISE,
+        "signature": signature,
+        "etat": etat,
+    }
+    with open(temporaire, 'w', encoding='utf-8') as f:
+        json.dump(contenu, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporaire, chemin)
+
+
+def charger_point_reprise(chemin: Path, signature: dict):
+    """
+    Relit l'état sauvegardé.
+
+    Returns: etat, ou None si aucun point de reprise n'existe
+    Raises: ValueError si le point de reprise vient d'un autre scan
+    """
+    chemin = Path(chemin)
+    if not chemin.exists():
+        return None
+
+    with open(chemin, 'r', encoding='utf-8') as f:
+        contenu = json.load(f)
+
+    if contenu.get("version") != VERSION_POINT_REPRISE:
+        raise ValueError(f"Version de point de reprise inconnue : {contenu.get('version')}")
+    if contenu.get("signature") != signature:
+        raise ValueError(f"Point de reprise {chemin} incompatible : "
+                         f"{contenu.get('signature')} != {signature}")
+    return contenu["etat"]
+
+
+def supprimer_point_reprise(chemin: Path):
+    """Retire le fichier compagnon une fois les résultats finaux écrits."""
+    chemin = Path(chemin)
+    if chemin.exists():
+        chemin.unlink()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PRÉIMAGES DE PORTES (opérateur inverse de image_porte)
+======================================================
+
+Quand une vérification de fermeture échoue (les 30 fermeture_probleme de
+verification_exhaustive_k9_20251024_120236.json, porte_Tn: null, tous
+de T(n) = 1794102596), la question est « quelles portes alimentent
+celle-ci ? ». Aujourd'hui : un nouveau scan de 900M nombres.
+
+Ici on résout directement les contraintes de retenues. Pour une porte
+cible q de longueur k', les préimages ont k = k' (pas de débordement)
+ou k = k'-1 (retenue finale, chiffre de tête 1). Paire par paire, de
+l'extérieur vers l'intérieur :
+- côté poids faible, la retenue entrante r_j est connue : s_j fixe le
+  chiffre d_j = (s_j + r_j) mod 10 et la retenue suivante
+- côté poids fort, la retenue SORTANTE R est connue (0, ou 1 s'il y a
+  débordement) : le chiffre opposé vaut q_j - d_j, ce qui impose la
+  retenue entrante de cette colonne (0 ou 1), nouvelle contrainte R
+- au milieu, les deux côtés doivent se raccorder
+
+Chaque niveau ne laisse passer qu'une ou deux valeurs de s_j sur 19 :
+le coût suit le nombre de solutions, pas 19^h. Chaque solution est
+revérifiée par image_porte.
+
+Pour un nombre cible m : préimages de sa porte avec valeur_T_porte = m
+(toutes les portes dont les n vérifient T(n) = m).
+
+Utilisation :
+    python preimages_portes.py --nombre 1794102596
+    python preimages_portes.py --porte 10 7 16 14 6 1
+    python preimages_portes.py --porte 8 10 8 9 9 --profondeur 3
+
+Date : octobre 2025
+"""
+
+import argparse
+import time
+from collections import deque
+
+from decouverte_portes import valeur_T_porte
+from moteur_fermeture_portes import image_porte, multiplicite_porte, porte_des_chiffres, representant_porte
+
+
+def _preimages_sans_debordement(q: tuple, k: int):
+    """Portes p de longueur k avec image_porte(p, k) == (k, q)."""
+    h = k // 2
+    s = [0] * h
+
+    def explorer(j, r, R):
+        # r : retenue entrant en position j ; R : retenue sortant de la position k-1-j
+        if j == h:
+            if k % 2 == 0:
+                if r == R:
+                    yield tuple(s)
+                return
+            for milieu in range(10):
+                t = 2 * milieu + r
+                if t % 10 == q[h] and t // 10 == R:
+                    yield tuple(s) + (milieu,)
+            return
+        for s_j in range(1 if j == 0 else 0, 19):
+            t = s_j + r
+            d_haut = q[j] - t % 10
+            if not 0 <= d_haut <= 9:
+                continue
+            r_haut = d_haut + 10 * R - s_j
+            if r_haut not in (0, 1):
+                continue
+            s[j] = s_j
+            yield from explorer(j + 1, t // 10, r_haut)
+
+    yield from explorer(0, 0, 0)
+
+
+def _preimages_avec_debordement(q: tuple, k: int):
+    """Portes p de longueur k avec image_porte(p, k) == (k+1, q)."""
+    h = k // 2
+    if h == 0:
+        return
+    s = [0] * h
+
+    def explorer(j, r, R):
+        # colonne haute de l'étape j : position k-j, somme s_{j-1}
+        if j == h:
+            s_haut = s[h - 1]
+            if k % 2 == 0:
+                t = s_haut + r
+                if t % 10 == q[h] and t // 10 == R:
+                    yield tuple(s)
+                return
+            for milieu in range(10):
+                t = 2 * milieu + r
+                u = s_haut + t // 10
+                if t % 10 + u % 10 == q[h] and u // 10 == R:
+                    yield tuple(s) + (milieu,)
+            return
+        for s_j in range(19):
+            t = s_j + r
+            d_haut = q[j] - t % 10
+            if not 0 <= d_haut <= 9:
+                continue
+            r_haut = d_haut + 10 * R - s[j - 1]
+            if r_haut not in (0, 1):
+                continue
+            s[j] = s_j
+            yield from explorer(j + 1, t // 10, r_haut)
+
+    # Position 0 : d_0 = s_0 mod 10 s'apparie avec le 1 de tête
+    for s_0 in range(1, 19):
+        if 1 + s_0 % 10 == q[0]:
+            s[0] = s_0
+            yield from explorer(1, s_0 // 10, 1)
+
+
+def preimages_porte(k_cible: int, porte_cible) -> list:
+    """
+    Toutes les portes non vides (k, p), k ∈ {k_cible, k_cible-1}, telles que
+    image_porte(p, k) == (k_cible, porte_cible).
+    """
+    q = tuple(porte_cible)
+    solutions = []
+    for k, generateur in ((k_cible - 1, _preimages_avec_debordement), (k_cible, _preimages_sans_debordement)):
+        if k < 2:
+            continue
+        for p in generateur(q, k):
+            if multiplicite_porte(p, k) and image_porte(p, k) == (k_cible, q):
+                solutions.append((k, p))
+    return solutions
+
+
+def preimages_nombre(m: int) -> list:
+    """Portes (k, p) dont tous les n vérifient T(n) = m."""
+    chiffres = [int(c) for c in str(m)]
+    return [(k, p) for k, p in preimages_porte(len(chiffres), porte_des_chiffres(chiffres))
+            if valeur_T_porte(p, k) == m]
+
+
+def ancetres_porte(k_cible: int, porte_cible, profondeur: int, limite: int = 1_000_000) -> dict:
+    """
+    Remontée en largeur : {(k, porte): distance} pour distance ≤ profondeur,
+    arrêtée à `limite` portes.
+    """
+    distances = {(k_cible, tuple(porte_cible)): 0}
+    file = deque(distances)
+    while file and len(distances) < limite:
+        noeud = file.popleft()
+        d = distances[noeud]
+        if d == profondeur:
+            continue
+        for pre in preimages_porte(*noeud):
+            if pre not in distances:
+                distances[pre] = d + 1
+                file.append(pre)
+    return distances
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Préimages d'une porte ou d'un nombre par T")
+    cible = parser.add_mutually_exclusive_group(required=True)
+    cible.add_argument("--porte", type=int, nargs="+", metavar="K C", help="k puis les composantes")
+    cible.add_argument("--nombre", type=int, help="nombre m : portes dont T(n) = m")
+    parser.add_argument("--profondeur", type=int, default=1, help="remonter plusieurs niveaux")
+    parser.add_argument("--afficher", type=int, default=20)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print("⏪ PRÉIMAGES PAR T")
+    print("=" * 70 + "\n")
+
+    debut = time.perf_counter()
+    if args.nombre is not None:
+        solutions = preimages_nombre(args.nombre)
+        duree = time.perf_counter() - debut
+        total = sum(multiplicite_porte(p, k) for k, p in solutions)
+        print(f"🎯 T(n) = {args.nombre} : {len(solutions)} portes, {total:,} nombres "
+              f"({duree * 1e6:.0f} µs)")
+        for k, p in solutions[:args.afficher]:
+            print(f"   k={k} {list(p)} : {multiplicite_porte(p, k):,} nombres, ex. {representant_porte(p, k)}")
+        print()
+        return
+
+    k, porte = args.porte[0], tuple(args.porte[1:])
+    if len(porte) != (k + 1) // 2:
+        parser.error(f"une porte k={k} a {(k + 1) // 2} composantes")
+
+    if args.profondeur == 1:
+        solutions = preimages_porte(k, porte)
+        duree = time.perf_counter() - debut
+        print(f"🎯 Porte k={k} {list(porte)} : {len(solutions)} préimages ({duree * 1e6:.0f} µs)")
+        for k_p, p in solutions[:args.afficher]:
+            print(f"   k={k_p} {list(p)} ({multiplicite_porte(p, k_p):,} nombres)")
+    else:
+        distances = ancetres_porte(k, porte, args.profondeur)
+        duree = time.perf_counter() - debut
+        par_niveau = {}
+        for d in distances.values():
+            par_niveau[d] = par_niveau.get(d, 0) + 1
+        print(f"🎯 Porte k={k} {list(porte)} : {len(distances) - 1:,} ancêtres ({duree:.3f}s)")
+        for d in sorted(par_niveau)[1:]:
+            print(f"   distance {d} : {par_niveau[d]:,} portes")
+    print()
+
+
+if __name__ == "__main__":
+    main()
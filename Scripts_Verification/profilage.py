@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PROFILAGE DES VÉRIFICATIONS (cProfile + échantillonnage de piles)
+=================================================================
+
+Quand le débit K8 est tombé de ~360k nb/s (prévu) à 317k nb/s, rien ne
+disait où partait le temps. Deux passes sur la même tranche :
+
+1. cProfile → fichier .pstats (python -m pstats, snakeviz...) : appels,
+   temps propre et cumulé par fonction
+2. échantillonnage → fichier .folded (piles repliées, une ligne
+   "racine;...;feuille nombre", pour flamegraph.pl / speedscope) : un
+   thread relève la pile du thread principal toutes les --intervalle
+   secondes. Chaque cadre porte sa ligne : le code en ligne de la boucle
+   chaude (porte par tables, reverse-and-add, test dans le bitmap), que
+   cProfile ne voit pas, est attribué ligne par ligne.
+
+Deux passes plutôt qu'une : le surcoût de cProfile à chaque appel
+fausserait les proportions de l'échantillonnage.
+
+Deux façons de profiler :
+- --profile (ajouter_options_profil) sur scanner_parallele.py,
+  verifier_fermeture_k5..k8 et scanner_trie.py : tranche [--profil-debut,
+  +--profil-taille) dans le processus courant, au lieu de la vérification
+  (scanner_trie : tranche du flux de candidats ; k9 : tranche de la
+  liste des palindromes)
+- n'importe quel autre point d'entrée : python profilage.py [options]
+  script.py arguments ; le script est interrompu après --secondes (la
+  tranche = les premiers nombres scannés), ou exécuté en entier sans
+  --secondes. Chaque mode relance le script entier : par défaut, seul
+  l'échantillonnage est fait (--modes cprofile,echantillons pour les
+  deux passes)
+
+Les options de profilage.py précèdent le script : tout ce qui suit le
+script (ou un -- explicite) lui est passé tel quel. Les modes sont donc
+séparés par des virgules, une liste nargs avalerait le nom du script.
+
+Utilisation :
+    python scanner_parallele.py 8 --profile --profil-taille 1000000
+    python verifier_fermeture_k8_exhaustif.py --profile --profil-modes echantillons
+    python profilage.py --secondes 5 --modes cprofile,echantillons verifier_fermeture_k4_exhaustif.py
+    python profilage.py --sortie profil_noyau noyau_portes.py 8 --sans-numpy
+
+Date : octobre 2025
+"""
+
+import _thread
+import argparse
+import cProfile
+import linecache
+import os
+import pstats
+import runpy
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+INTERVALLE_ECHANTILLONS = 0.001
+MODES = ("cprofile", "echantillons")
+
+
+class EchantillonneurPiles:
+    """Relève périodiquement la pile d'un thread (par défaut : le thread courant)."""
+
+    def __init__(self, intervalle: float = INTERVALLE_ECHANTILLONS, ident: int = None):
+        self.intervalle = intervalle
+        self.ident = ident if ident is not None else threading.get_ident()
+        self.piles = Counter()
+        self.fichiers = {}  # nom court → chemin, pour relire la source
+        self._arret = threading.Event()
+        self._thread = None
+        self._intervalle_gil = None
+
+    def _boucle(self):
+        while not self._arret.wait(self.intervalle):
+            cadre = sys._current_frames().get(self.ident)
+            pile = []
+            while cadre is not None:
+                code = cadre.f_code
+                nom_fichier = os.path.basename(code.co_filename)
+                self.fichiers.setdefault(nom_fichier, code.co_filename)
+                pile.append(f"{code.co_name} ({nom_fichier}:{cadre.f_lineno or 0})")
+                cadre = cadre.f_back
+            if pile:
+                self.piles[";".join(reversed(pile))] += 1
+
+    def demarrer(self):
+        # Rendre le GIL au moins aussi souvent qu'on échantillonne
+        self._intervalle_gil = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._intervalle_gil, self.intervalle))
+        self._thread = threading.Thread(target=self._boucle, daemon=True)
+        self._thread.start()
+
+    def arreter(self):
+        self._arret.set()
+        self._thread.join()
+        sys.setswitchinterval(self._intervalle_gil)
+
+    def ecrire_pile_repliee(self, chemin: Path):
+        with open(chemin, 'w', encoding='utf-8') as f:
+            for pile, nombre in self.piles.most_common():
+                f.write(f"{pile} {nombre}\n")
+
+    def lignes_chaudes(self, nombre: int = 10) -> list:
+        """[(cadre feuille, échantillons, source)] : où le thread se trouvait le plus souvent."""
+        feuilles = Counter()
+        for pile, n in self.piles.items():
+            feuilles[pile.rsplit(";", 1)[-1]] += n
+        chaudes = []
+        for feuille, n in feuilles.most_common(nombre):
+            fichier, ligne = feuille[feuille.rindex("(") + 1:-1].rsplit(":", 1)
+            source = linecache.getline(self.fichiers.get(fichier, ""), int(ligne)).strip()
+            chaudes.append((feuille, n, source))
+        return chaudes
+
+
+def _executer(fonction, args, kwargs, secondes):
+    """fonction(*args, **kwargs), interrompue après `secondes` ; (résultat, tronqué)."""
+    declenchee = threading.Event()
+
+    def interrompre():
+        declenchee.set()
+        _thread.interrupt_main()
+
+    minuterie = threading.Timer(secondes, interrompre) if secondes else None
+    if minuterie:
+        minuterie.start()
+    try:
+        return fonction(*args, **kwargs), False
+    except KeyboardInterrupt:
+        if not declenchee.is_set():
+            raise  # Ctrl+C de l'utilisateur, pas la minuterie
+        return None, True
+    finally:
+        if minuterie:
+            minuterie.cancel()
+
+
+def profiler(fonction, *args, prefixe: Path = Path("profil"), modes=MODES,
+             intervalle: float = INTERVALLE_ECHANTILLONS, secondes: float = None,
+             afficher: bool = True, **kwargs) -> dict:
+    """
+    Profile fonction(*args, **kwargs) : une passe par mode.
+
+    Écrit {prefixe}.pstats (cprofile) et {prefixe}.folded (echantillons).
+    Returns: {"resultat", "fichiers", "durees", "tronque"}
+    """
+    prefixe = Path(prefixe)
+    bilan = {"resultat": None, "fichiers": [], "durees": {}, "tronque": False}
+
+    if "cprofile" in modes:
+        profil = cProfile.Profile()
+        debut = time.perf_counter()
+        profil.enable()
+        try:
+            bilan["resultat"], tronque = _executer(fonction, args, kwargs, secondes)
+        finally:
+            profil.disable()
+        bilan["durees"]["cprofile"] = time.perf_counter() - debut
+        bilan["tronque"] |= tronque
+        chemin = prefixe.with_name(prefixe.name + ".pstats")
+        profil.dump_stats(chemin)
+        bilan["fichiers"].append(chemin)
+        if afficher:
+            afficher_fonctions(pstats.Stats(profil))
+
+    if "echantillons" in modes:
+        echantillonneur = EchantillonneurPiles(intervalle)
+        debut = time.perf_counter()
+        echantillonneur.demarrer()
+        try:
+            bilan["resultat"], tronque = _executer(fonction, args, kwargs, secondes)
+        finally:
+            echantillonneur.arreter()
+        bilan["durees"]["echantillons"] = time.perf_counter() - debut
+        bilan["tronque"] |= tronque
+        chemin = prefixe.with_name(prefixe.name + ".folded")
+        echantillonneur.ecrire_pile_repliee(chemin)
+        bilan["fichiers"].append(chemin)
+        if afficher:
+            afficher_lignes(echantillonneur)
+
+    if afficher:
+        for chemin in bilan["fichiers"]:
+            print(f"💾 {chemin}")
+        if bilan["tronque"]:
+            print(f"✂️  Exécution interrompue après {secondes}s (tranche de début)")
+    return bilan
+
+
+def afficher_fonctions(stats: pstats.Stats, nombre: int = 12):
+    """Fonctions par temps propre (tottime) : appels, temps propre, temps cumulé."""
+    total = stats.total_tt or 1.0
+    lignes = sorted(stats.stats.items(), key=lambda e: -e[1][2])[:nombre]
+    print(f"\n🔬 cProfile : {total:.2f}s, fonctions par temps propre")
+    for (fichier, ligne, nom), (_, appels, propre, cumule, _) in lignes:
+        lieu = f"{os.path.basename(fichier)}:{ligne}" if ligne else "~"
+        print(f"   {propre / total:>6.1%} {propre:>8.3f}s  cumul {cumule:>8.3f}s  {appels:>11,} appels  {nom} ({lieu})")
+
+
+def afficher_lignes(echantillonneur: EchantillonneurPiles, nombre: int = 12):
+    total = sum(echantillonneur.piles.values()) or 1
+    print(f"\n🔥 Échantillons : {total:,}, lignes les plus chaudes")
+    for feuille, n, source in echantillonneur.lignes_chaudes(nombre):
+        print(f"   {n / total:>6.1%} {feuille}")
+        if source:
+            print(f"          {source}")
+
+
+def liste_modes(texte: str) -> list:
+    """Type argparse : "cprofile,echantillons" -> ["cprofile", "echantillons"]."""
+    modes = [mode.strip() for mode in texte.split(",") if mode.strip()]
+    inconnus = [mode for mode in modes if mode not in MODES]
+    if not modes or inconnus:
+        raise argparse.ArgumentTypeError(f"modes inconnus {inconnus} (choix : {','.join(MODES)})")
+    return modes
+
+
+def ajouter_options_profil(parser: argparse.ArgumentParser, taille_defaut: int = 1_000_000,
+                           aide_debut: str = "premier nombre (défaut : 10^(k-1))"):
+    """Options communes des points d'entrée qui profilent une tranche de leur intervalle."""
+    groupe = parser.add_argument_group("profilage")
+    groupe.add_argument("--profile", action="store_true",
+                        help="profiler une tranche au lieu de lancer la vérification")
+    groupe.add_argument("--profil-debut", type=int, default=None, help=aide_debut)
+    groupe.add_argument("--profil-taille", type=int, default=taille_defaut, help="nombres de la tranche")
+    groupe.add_argument("--profil-sortie", type=Path, default=None, help="préfixe des fichiers .pstats/.folded")
+    groupe.add_argument("--profil-modes", type=liste_modes, default=list(MODES),
+                        help="passes séparées par des virgules (défaut : cprofile,echantillons)")
+    groupe.add_argument("--profil-intervalle", type=float, default=INTERVALLE_ECHANTILLONS,
+                        help="secondes entre deux échantillons")
+
+
+def tranche_profil(args, k: int) -> tuple:
+    """[debut, fin) des options --profil-debut/--profil-taille, bornée aux nombres à k chiffres."""
+    debut = args.profil_debut if args.profil_debut is not None else 10 ** (k - 1)
+    return debut, min(10 ** k, debut + args.profil_taille)
+
+
+def profiler_tranche(args, fonction, *fargs, prefixe: Path, nombres: int, **kwargs) -> dict:
+    """profiler() avec les options d'ajouter_options_profil, puis débit de chaque passe."""
+    bilan = profiler(fonction, *fargs, prefixe=args.profil_sortie or prefixe,
+                     modes=args.profil_modes, intervalle=args.profil_intervalle, **kwargs)
+    for mode, duree in bilan["durees"].items():
+        print(f"⏱️  {mode} : {duree:.2f}s ({nombres / duree:,.0f} nb/s sous profilage)")
+    return bilan
+
+
+def executer_script(script: Path, arguments: list):
+    """Exécute un script comme `python script arguments` (dossier du script dans sys.path)."""
+    script = Path(script).resolve()
+    ancien_argv, ancien_path = sys.argv, list(sys.path)
+    sys.argv = [str(script)] + list(arguments)
+    sys.path.insert(0, str(script.parent))
+    try:
+        runpy.run_path(str(script), run_name="__main__")
+    except SystemExit:
+        pass
+    finally:
+        sys.argv, sys.path[:] = ancien_argv, ancien_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profilage d'un point d'entrée (pstats + piles repliées)")
+    parser.add_argument("script", type=Path, help="options de profilage AVANT le script")
+    parser.add_argument("arguments", nargs=argparse.REMAINDER, help="arguments du script")
+    parser.add_argument("--secondes", type=float, default=None, help="interrompre après ce délai")
+    parser.add_argument("--sortie", type=Path, default=None, help="préfixe (défaut : profil_<script>)")
+    parser.add_argument("--modes", type=liste_modes, default=["echantillons"],
+                        help="passes séparées par des virgules, chacune relance le script entier "
+                             "(défaut : echantillons)")
+    parser.add_argument("--intervalle", type=float, default=INTERVALLE_ECHANTILLONS)
+    args = parser.parse_args()
+
+    arguments = args.arguments[1:] if args.arguments[:1] == ["--"] else args.arguments
+    prefixe = args.sortie or Path(f"profil_{args.script.stem}")
+
+    print("\n" + "=" * 70)
+    print(f"🔬 PROFILAGE - {args.script.name} {' '.join(arguments)}")
+    print("=" * 70 + "\n")
+
+    profiler(executer_script, args.script, arguments, prefixe=prefixe, modes=args.modes,
+             intervalle=args.intervalle, secondes=args.secondes)
+    print()
+
+
+if __name__ == "__main__":
+    main()
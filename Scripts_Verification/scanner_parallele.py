@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SCANNER PARALLÈLE PAR TRANCHES (shards)
+=======================================
+
+Pilote commun pour les vérifications exhaustives sur [10^(k-1), 10^k) :
+1. Découper l'intervalle en tranches
+2. Scanner chaque tranche dans un processus (ProcessPoolExecutor)
+   - code de porte par tables (noyau_portes), test par bitmap (codec_portes)
+   - pour chaque candidat : T(n), porte de l'image, test dans S
+3. Réduire les compteurs de chaque tranche dans le MÊME format JSON
+   que verification_k8_candidats_*.json :
+   candidats_testes, distribution_images, violations, portes_k9_observees...
+
+Les bitmaps (quelques KB) sont transmis une fois par processus via
+l'initialiseur ; seules les bornes de tranche circulent ensuite.
+
+Points de reprise (points_reprise) : l'état est sauvegardé périodiquement
+dans un fichier compagnon ; --reprendre repart des tranches non terminées
+(bornes relues dans le point de reprise : --workers peut changer).
+Avec --deterministe (sans durées ni timestamp), le JSON final d'un scan
+repris est identique octet pour octet à celui d'un scan d'une traite.
+
+Télémétrie (telemetrie.py) : phases chargement_portes / scan /
+ecriture_resultats, plus le temps cumulé des workers en calcul des portes
+et filtre K_k (portes_workers) et en T(n) + image + test dans S
+(images_workers), rangé à part (durees_workers : secondes CPU sommées
+sur les workers, pas du temps mural) ; avec --telemetrie, événements JSONL périodiques
+(débit, ETA, RSS du processus pilote, candidats/s). Le JSON de
+résultats ne change pas.
+
+Mémoire : RSS et pic par phase dans le JSON (clé memoire, à côté de
+duree_secondes), RSS et USS (pages privées) maximales d'un worker ;
+--budget-memoire 8G refuse d'avance un nombre de workers dont
+l'estimation dépasse le plafond, puis contrôle à chaque tranche la RSS
+du pilote + workers × USS mesurée (les pages partagées après fork ne
+sont comptées qu'une fois). Au dépassement : plus aucune tranche
+lancée, tranches finies intégrées, point de reprise sauvegardé, code
+de sortie 2.
+
+--profile (profilage.py) : au lieu du scan, une tranche de
+--profil-taille nombres passe par scanner_tranche dans le processus
+courant, sous cProfile (.pstats) puis sous échantillonnage (.folded).
+
+Utilisation :
+    python scanner_parallele.py 8 --workers 32
+    python scanner_parallele.py 9 --workers 64 --reprendre
+    python scanner_parallele.py 6 --ensemble-S ../ensemble_S_ferme.json
+    python scanner_parallele.py 9 --workers 64 --telemetrie telemetrie_k9.jsonl
+    python scanner_parallele.py 9 --workers 64 --budget-memoire 16G
+    python scanner_parallele.py 8 --profile --profil-debut 50000000 --profil-taille 1000000
+
+Date : octobre 2025
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from cache_portes import cache_ensemble_S, cache_portes_k
+from codec_portes import BitmapPortes, code_porte_nombre, decoder_porte
+from moteur_fermeture_portes import DOSSIER_PORTES_DEFAUT
+from noyau_portes import blocs_codes, tables_porte
+from points_reprise import (charger_point_reprise, chemin_point_reprise_defaut,
+                            sauvegarder_point_reprise, supprimer_point_reprise)
+from profilage import ajouter_options_profil, profiler_tranche, tranche_profil
+from telemetrie import (INTERVALLE_DEFAUT, BudgetMemoireDepasse, Telemetrie, formater_taille,
+                        lire_taille, rss_octets, uss_octets)
+
+MAX_VIOLATIONS = 100
+RSS_BASE_WORKER = 32 * 2 ** 20  # interpréteur + modules, avant les ensembles
+
+# État de chaque processus (rempli par _initialiser_worker)
+_ENSEMBLES_PAR_K = None
+_MEMBRES_K = None
+_TABLES_K = None
+
+
+def decouper_intervalle(debut: int, fin: int, nb_tranches: int) -> list:
+    """Découpe [debut, fin) en nb_tranches tranches contiguës [a, b)."""
+    nb_tranches = max(1, min(nb_tranches, fin - debut))
+    taille, reste = divmod(fin - debut, nb_tranches)
+    tranches = []
+    a = debut
+    for i in range(nb_tranches):
+        b = a + taille + (1 if i < reste else 0)
+        tranches.append((a, b))
+        a = b
+    return tranches
+
+
+def _octets_membres(ensemble):
+    """Un octet par code (accès direct dans la boucle) quand l'ensemble est un bitmap."""
+    if isinstance(ensemble, BitmapPortes):
+        membres = bytearray(ensemble.taille)
+        for code in ensemble.codes():
+            membres[code] = 1
+        return membres
+    return None
+
+
+def _initialiser_worker(k: int, ensembles_par_k: dict):
+    global _ENSEMBLES_PAR_K, _MEMBRES_K, _TABLES_K
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()  # hérité du pilote (fork, --tracemalloc) : coûteux dans la boucle
+    _ENSEMBLES_PAR_K = ensembles_par_k
+    _MEMBRES_K = _octets_membres(ensembles_par_k[k])
+    _TABLES_K = tables_porte(k)
+
+
+def compteurs_vides() -> dict:
+    return {
+        "nombres_scannes": 0,
+        "candidats_testes": 0,
+        "violations_count": 0,
+        "violations": [],
+        "distribution_images": {},
+        "portes_observees": {},
+    }
+
+
+def tester_images(candidats, k: int, ensembles_par_k: dict, compteurs: dict, observees: dict):
+    """
+    Pour chaque candidat n à k chiffres : T(n), porte de l'image, test dans S.
+
+    Met à jour compteurs (candidats_testes, distribution_images,
+    violations) ; les images dont la dimension n'est pas chargée dans S
+    sont observées (comme les portes k=9 de verifier_fermeture_k8()),
+    pas comptées en violation. Partagé avec scanner_trie.
+    """
+    distribution = compteurs["distribution_images"]
+    violations = compteurs["violations"]
+    testes = 0
+    for n in candidats:
+        testes += 1
+        image_n = n + int(str(n)[::-1])
+        k_image = len(str(image_n))
+        code_image = code_porte_nombre(image_n, k_image)
+        dim_image = (k_image + 1) // 2
+        distribution[dim_image] = distribution.get(dim_image, 0) + 1
+
+        if k_image not in ensembles_par_k:
+            observees.setdefault(k_image, set()).add(code_image)
+        elif code_image not in ensembles_par_k[k_image]:
+            compteurs["violations_count"] += 1
+            if len(violations) < MAX_VIOLATIONS:
+                violations.append({
+                    "n": n,
+                    "porte_n": list(decoder_porte(code_porte_nombre(n, k), k)),
+                    "image": image_n,
+                    "porte_image": list(decoder_porte(code_image, k_image))
+                })
+    compteurs["candidats_testes"] += testes
+
+
+def scanner_tranche(k: int, a: int, b: int) -> dict:
+    """
+    Scanne [a, b) dans le processus courant (images : tester_images).
+
+    compteurs["durees"] : secondes passées en portes + filtre K_k et en
+    images + test dans S (trois lectures d'horloge par bloc) ; hors
+    reduire_compteurs et hors JSON de résultats.
+    """
+    ensembles = _ENSEMBLES_PAR_K
+    ensemble_k = ensembles[k]
+    membres = _MEMBRES_K
+    compteurs = compteurs_vides()
+    observees = {}
+    duree_portes = duree_images = 0.0
+    horloge = time.perf_counter
+    t_bloc = horloge()
+
+    for n0, codes in blocs_codes(k, a, b, _TABLES_K):
+        compteurs["nombres_scannes"] += len(codes)
+        if membres is not None:
+            positions = [i for i, code in enumerate(codes) if membres[code]]
+        else:
+            positions = [i for i, code in enumerate(codes) if code in ensemble_k]
+        t_filtre = horloge()
+        duree_portes += t_filtre - t_bloc
+
+        tester_images([n0 + i for i in positions], k, ensembles, compteurs, observees)
+        t_bloc = horloge()
+        duree_images += t_bloc - t_filtre
+
+    compteurs["portes_observees"] = observees
+    compteurs["durees"] = {"portes_workers": duree_portes, "images_workers": duree_images}
+    compteurs["rss_worker"] = rss_octets()
+    compteurs["uss_worker"] = uss_octets()
+    return compteurs
+
+
+def _scanner_tranche_worker(args):
+    k, a, b = args
+    return a, scanner_tranche(k, a, b)
+
+
+def reduire_compteurs(total: dict, partiel: dict) -> dict:
+    """Ajoute les compteurs d'une tranche au total (en place)."""
+    total["nombres_scannes"] += partiel["nombres_scannes"]
+    total["candidats_testes"] += partiel["candidats_testes"]
+    total["violations_count"] += partiel["violations_count"]
+    total["violations"].extend(partiel["violations"])
+    # Les MAX_VIOLATIONS plus petits n : indépendant de l'ordre des tranches
+    total["violations"].sort(key=lambda v: v["n"])
+    del total["violations"][MAX_VIOLATIONS:]
+    for dim, count in partiel["distribution_images"].items():
+        total["distribution_images"][dim] = total["distribution_images"].get(dim, 0) + count
+    for k_obs, codes in partiel["portes_observees"].items():
+        total["portes_observees"].setdefault(k_obs, set()).update(codes)
+    return total
+
+
+def serialiser_compteurs(total: dict) -> dict:
+    """Compteurs → dict JSON (clés entières en texte, sets en listes triées)."""
+    return {
+        "nombres_scannes": total["nombres_scannes"],
+        "candidats_testes": total["candidats_testes"],
+        "violations_count": total["violations_count"],
+        "violations": total["violations"],
+        "distribution_images": {str(dim): c for dim, c in total["distribution_images"].items()},
+        "portes_observees": {str(k_obs): sorted(codes) for k_obs, codes in total["portes_observees"].items()},
+    }
+
+
+def deserialiser_compteurs(donnees: dict) -> dict:
+    """Inverse de serialiser_compteurs."""
+    total = compteurs_vides()
+    total["nombres_scannes"] = donnees["nombres_scannes"]
+    total["candidats_testes"] = donnees["candidats_testes"]
+    total["violations_count"] = donnees["violations_count"]
+    total["violations"] = donnees["violations"]
+    total["distribution_images"] = {int(dim): c for dim, c in donnees["distribution_images"].items()}
+    total["portes_observees"] = {int(k_obs): set(codes) for k_obs, codes in donnees["portes_observees"].items()}
+    return total
+
+
+def formater_resultats(k: int, total: dict, duree: float, workers: int, nb_tranches: int,
+                       timestamp: str = None, deterministe: bool = False, memoire: dict = None) -> dict:
+    """
+    Compteurs réduits → JSON au format verification_k8_candidats_*.json.
+
+    deterministe : omet durées, vitesses, mémoire, workers et timestamp,
+    pour que deux scans du même intervalle donnent le même fichier.
+    """
+    resultats = {
+        "dimension": k,
+        "nombres_scannes": total["nombres_scannes"],
+        "candidats_testes": total["candidats_testes"],
+        "intervalle": [10 ** (k - 1), 10 ** k - 1],
+    }
+    if not deterministe:
+        resultats["duree_secondes"] = duree
+        resultats["vitesse_scan_par_sec"] = total["nombres_scannes"] / duree if duree > 0 else 0
+        resultats["vitesse_test_par_sec"] = total["candidats_testes"] / duree if duree > 0 else 0
+        if memoire is not None:
+            resultats["memoire"] = memoire
+    resultats.update({
+        "fermeture_verifiee": total["violations_count"] == 0,
+        "violations_count": total["violations_count"],
+        "violations": total["violations"],
+        "distribution_images": dict(sorted(total["distribution_images"].items())),
+    })
+    for k_obs, codes in sorted(total["portes_observees"].items()):
+        resultats[f"portes_k{k_obs}_observees"] = [list(decoder_porte(c, k_obs)) for c in sorted(codes)]
+        resultats[f"portes_k{k_obs}_count"] = len(codes)
+    resultats["tranches"] = nb_tranches
+    if not deterministe:
+        resultats["workers"] = workers
+        resultats["timestamp"] = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    return resultats
+
+
+def octets_ensembles(k: int, ensembles_par_k: dict) -> int:
+    """Estimation de la mémoire des ensembles dans un worker (copie + octets de K_k)."""
+    octets = 0
+    for ensemble in ensembles_par_k.values():
+        if isinstance(ensemble, BitmapPortes):
+            octets += ensemble.nbytes
+        else:
+            octets += sys.getsizeof(ensemble._codes) + 32 * len(ensemble)  # set + entiers
+    if isinstance(ensembles_par_k[k], BitmapPortes):
+        octets += ensembles_par_k[k].taille  # _octets_membres
+    return octets
+
+
+def scanner_parallele(k: int, ensembles_par_k: dict, workers: int = None,
+                      nb_tranches: int = None, afficher: bool = True,
+                      point_reprise: Path = None, source: str = "",
+                      intervalle_sauvegarde: float = 60.0, deterministe: bool = False,
+                      telemetrie: Telemetrie = None) -> dict:
+    """
+    Scan exhaustif de [10^(k-1), 10^k) réparti sur `workers` processus.
+
+    ensembles_par_k : {k: BitmapPortes/CodesPortes} — K_k et le reste de S.
+    point_reprise   : fichier compagnon ; s'il existe, le scan reprend là
+                      où il s'était arrêté (même k et source, mêmes
+                      tranches quel que soit `workers`).
+    telemetrie      : progression, durées et mémoire des workers, budget
+                      mémoire (défaut : console seule, une ligne par tranche)
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if telemetrie is None:
+        telemetrie = Telemetrie(intervalle=0.0, afficher=afficher)
+
+    signature = {"k": k, "source": source}
+    etat = charger_point_reprise(point_reprise, signature) if point_reprise else None
+    if etat is not None:
+        # Bornes du premier lancement : la reprise peut changer --workers
+        tranches = [tuple(tranche) for tranche in etat["tranches"]]
+        total = deserialiser_compteurs(etat["compteurs"])
+        terminees = set(etat["tranches_terminees"])
+        duree_precedente = etat["duree_cumulee"]
+        timestamp = etat["timestamp"]
+        if afficher:
+            print(f"♻️  Reprise : {len(terminees)}/{len(tranches)} tranches déjà faites "
+                  f"({total['nombres_scannes']:,} nombres)\n")
+    else:
+        if nb_tranches is None:
+            nb_tranches = workers * 8  # tranches courtes : équilibrage + progression
+        tranches = decouper_intervalle(10 ** (k - 1), 10 ** k, nb_tranches)
+        total = compteurs_vides()
+        terminees = set()
+        duree_precedente = 0.0
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    def sauvegarder():
+        sauvegarder_point_reprise(point_reprise, signature, {
+            "tranches": tranches,
+            "tranches_terminees": sorted(terminees),
+            "compteurs": serialiser_compteurs(total),
+            "duree_cumulee": duree_precedente + time.time() - debut,
+            "timestamp": timestamp,
+        })
+
+    # Avant de lancer les processus : pilote + workers × (base de l'interpréteur + ensembles)
+    rss_pilote = rss_octets() or 0
+    octets_worker = RSS_BASE_WORKER + octets_ensembles(k, ensembles_par_k)
+    if afficher and telemetrie.budget_memoire is not None:
+        maximum = max(0, (telemetrie.budget_memoire - rss_pilote) // max(1, octets_worker))
+        print(f"🧠 Estimation : {formater_taille(rss_pilote + workers * octets_worker)} pour {workers} workers "
+              f"(budget {formater_taille(telemetrie.budget_memoire)} : au plus {maximum} workers)\n")
+    telemetrie.controler_memoire(rss_pilote + workers * octets_worker, f"{workers} workers, estimation a priori")
+    rss_max_worker = uss_max_worker = 0
+
+    restantes = [(a, b) for a, b in tranches if a not in terminees]
+    debut = time.time()
+    derniere_sauvegarde = debut
+    scannes_session = candidats_session = 0
+    telemetrie.demarrer_progression(sum(b - a for a, b in restantes))
+
+    def integrer(a, partiel):
+        nonlocal scannes_session, candidats_session
+        reduire_compteurs(total, partiel)
+        terminees.add(a)
+        scannes_session += partiel["nombres_scannes"]
+        candidats_session += partiel["candidats_testes"]
+        for nom, duree_phase in partiel["durees"].items():
+            telemetrie.ajouter_duree_workers(nom, duree_phase)
+
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_initialiser_worker,
+                                   initargs=(k, ensembles_par_k))
+    futures = []
+    try:
+        futures = [executor.submit(_scanner_tranche_worker, (k, a, b)) for a, b in restantes]
+        for future in as_completed(futures):
+            a, partiel = future.result()
+            integrer(a, partiel)
+            rss_max_worker = max(rss_max_worker, partiel["rss_worker"] or 0)
+            if partiel["uss_worker"]:
+                # Pilote (pages partagées comprises) + pages privées de chaque worker
+                uss_max_worker = max(uss_max_worker, partiel["uss_worker"])
+                telemetrie.controler_memoire((rss_octets() or 0) + workers * uss_max_worker,
+                                             f"{workers} workers à {formater_taille(uss_max_worker)} privés")
+
+            maintenant = time.time()
+            if point_reprise and maintenant - derniere_sauvegarde >= intervalle_sauvegarde:
+                sauvegarder()
+                derniere_sauvegarde = maintenant
+            telemetrie.progression(scannes_session, candidats_session,
+                                   forcer=len(terminees) == len(tranches),
+                                   tranches=len(terminees), violations=total["violations_count"])
+    except BaseException:
+        # Interruption (Ctrl+C, budget, erreur d'un worker) : plus aucune
+        # tranche lancée (celles en cours finissent, sans être attendues),
+        # les tranches finies mais pas encore dépilées comptent
+        executor.shutdown(wait=False, cancel_futures=True)
+        for future in futures:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                a, partiel = future.result()
+                if a not in terminees:
+                    integrer(a, partiel)
+        if point_reprise:
+            sauvegarder()
+            if afficher:
+                print(f"\n💾 Point de reprise sauvegardé : {point_reprise} "
+                      f"({len(terminees)}/{len(tranches)} tranches)")
+        raise
+    executor.shutdown()
+
+    duree = duree_precedente + time.time() - debut
+    memoire = telemetrie.memoire()
+    memoire["rss_max_worker_octets"] = rss_max_worker or None
+    memoire["uss_max_worker_octets"] = uss_max_worker or None
+    return formater_resultats(k, total, duree, workers, len(tranches), timestamp, deterministe, memoire)
+
+
+def charger_ensembles(k: int, dossier: Path = DOSSIER_PORTES_DEFAUT, fichier_S: Path = None) -> dict:
+    """
+    S depuis K3..K_(k+1) (K*_portes.json), ou depuis ensemble_S_ferme.json
+    (convention des scripts K3-K6) si fichier_S est donné. Les ensembles
+    prétraités sont relus depuis les fichiers .cache (cache_portes).
+    """
+    if fichier_S is not None:
+        return cache_ensemble_S(fichier_S).ensembles
+    ensembles = {}
+    for k_S in range(3, k + 2):
+        cache = cache_portes_k(k_S, dossier)
+        if cache is not None:
+            ensembles[k_S] = cache.ensembles[k_S]
+    return ensembles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vérification exhaustive répartie sur plusieurs cœurs")
+    parser.add_argument("k", type=int)
+    parser.add_argument("--workers", type=int, default=None, help="processus (défaut : tous les cœurs)")
+    parser.add_argument("--tranches", type=int, default=None, help="nombre de tranches (défaut : 8 par worker ; ignoré à la reprise)")
+    parser.add_argument("--dossier", type=Path, default=DOSSIER_PORTES_DEFAUT)
+    parser.add_argument("--ensemble-S", type=Path, default=None,
+                        help="utiliser ensemble_S_ferme.json comme S (scripts K3-K6)")
+    parser.add_argument("--point-reprise", type=Path, default=None,
+                        help="fichier compagnon (défaut : reprise_scan_k{k}.json)")
+    parser.add_argument("--reprendre", action="store_true",
+                        help="repartir du point de reprise existant au lieu de l'écraser")
+    parser.add_argument("--intervalle-sauvegarde", type=float, default=60.0,
+                        help="secondes entre deux points de reprise")
+    parser.add_argument("--deterministe", action="store_true",
+                        help="JSON final sans durées ni timestamp (comparable octet pour octet)")
+    parser.add_argument("--telemetrie", type=Path, default=None,
+                        help="fichier JSONL d'événements (phases, débit, ETA, RSS)")
+    parser.add_argument("--intervalle-progression", type=float, default=INTERVALLE_DEFAUT,
+                        help="secondes entre deux lignes de progression")
+    parser.add_argument("--budget-memoire", type=lire_taille, default=None,
+                        help="plafond mémoire total, pilote + workers (ex. 8G) : échec immédiat au-delà")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="allocations Python par phase dans le pilote (tracemalloc)")
+    ajouter_options_profil(parser)
+    args = parser.parse_args()
+
+    point_reprise = args.point_reprise or chemin_point_reprise_defaut(args.k)
+    if not args.reprendre and not args.profile:
+        supprimer_point_reprise(point_reprise)
+    if args.ensemble_S is not None:
+        source = f"ensemble_S:{args.ensemble_S.resolve()}"
+    else:
+        source = f"portes:{Path(args.dossier).resolve()}"
+
+    print("\n" + "=" * 70)
+    print(f"🚀 SCAN PARALLÈLE k={args.k}")
+    print("=" * 70 + "\n")
+
+    with Telemetrie(args.telemetrie, intervalle=args.intervalle_progression, contexte={
+        "script": "scanner_parallele", "k": args.k, "workers": args.workers or os.cpu_count(),
+        "source": source,
+    }, budget_memoire=args.budget_memoire, tracer_allocations=args.tracemalloc) as telemetrie:
+        def arret_budget(erreur):
+            telemetrie.terminer("budget_depasse")
+            print(f"\n❌ Budget mémoire dépassé : {erreur}\n")
+            sys.exit(2)
+
+        try:
+            with telemetrie.phase("chargement_portes"):
+                ensembles = charger_ensembles(args.k, args.dossier, args.ensemble_S)
+        except BudgetMemoireDepasse as e:
+            arret_budget(e)
+        if args.k not in ensembles:
+            raise FileNotFoundError(f"Aucune porte de dimension {args.k} dans S")
+        for k_S in sorted(ensembles):
+            if k_S <= args.k + 1:
+                print(f"   k={k_S}: {len(ensembles[k_S]):,} portes")
+        print()
+
+        if args.profile:
+            debut, fin = tranche_profil(args, args.k)
+            print(f"🔬 Profilage de la tranche [{debut:,}, {fin:,}) dans ce processus")
+            _initialiser_worker(args.k, ensembles)
+            profiler_tranche(args, scanner_tranche, args.k, debut, fin,
+                             prefixe=Path(f"profil_scan_k{args.k}"), nombres=fin - debut)
+            telemetrie.terminer("profilage")
+            print()
+            return
+
+        try:
+            with telemetrie.phase("scan"):
+                resultats = scanner_parallele(args.k, ensembles, args.workers, args.tranches,
+                                              point_reprise=point_reprise, source=source,
+                                              intervalle_sauvegarde=args.intervalle_sauvegarde,
+                                              deterministe=args.deterministe, telemetrie=telemetrie)
+        except BudgetMemoireDepasse as e:
+            arret_budget(e)
+
+        print()
+        print(f"📊 Nombres scannés : {resultats['nombres_scannes']:,}")
+        print(f"📌 Candidats K{args.k} testés : {resultats['candidats_testes']:,}")
+        if not args.deterministe:
+            print(f"⏱️  Durée : {resultats['duree_secondes']:.2f}s ({resultats['workers']} workers)")
+            print(f"🚀 Vitesse scan : {resultats['vitesse_scan_par_sec']:,.0f} nombres/sec")
+            memoire = resultats["memoire"]
+            print(f"🧠 Mémoire : pilote pic {formater_taille(memoire['rss_pic_octets'])}, "
+                  f"worker max {formater_taille(memoire['rss_max_worker_octets'])}")
+        print()
+
+        if resultats["fermeture_verifiee"]:
+            print("✅✅✅ FERMETURE 100% VÉRIFIÉE ! ✅✅✅\n")
+        else:
+            print(f"❌ VIOLATIONS DÉTECTÉES : {resultats['violations_count']}\n")
+            for v in resultats["violations"][:5]:
+                print(f"  • n={v['n']}, porte={v['porte_n']} → image={v['image']}, porte_image={v['porte_image']}")
+            print()
+
+        if args.deterministe:
+            fichier_resultats = f"verification_k{args.k}_parallele.json"
+        else:
+            fichier_resultats = f"verification_k{args.k}_parallele_{resultats['timestamp']}.json"
+        with telemetrie.phase("ecriture_resultats"):
+            with open(fichier_resultats, 'w', encoding='utf-8') as f:
+                json.dump(resultats, f, indent=2, ensure_ascii=False)
+        supprimer_point_reprise(point_reprise)
+        print(f"💾 Résultats sauvegardés : {fichier_resultats}\n")
+
+        bilan = telemetrie.terminer(violations=resultats["violations_count"], fichier_resultats=fichier_resultats)
+        print("⏱️  Phases : " + ", ".join(f"{nom} {duree:.2f}s" for nom, duree in bilan["phases"].items()))
+        print("⏱️  Workers (cumul) : " + ", ".join(f"{nom} {duree:.2f}s"
+                                                for nom, duree in bilan["durees_workers"].items()))
+        if args.telemetrie:
+            print(f"📈 Télémétrie : {args.telemetrie}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SCANNER PAR TRIE DE PRÉFIXES DE PORTES
+======================================
+
+verifier_fermeture_k8() teste les 90,000,000 nombres à 8 chiffres pour
+31,918,913 candidats. Or la somme extérieure A+H seule élimine déjà des
+blocs entiers : si aucune porte de K8 ne commence par s, aucun n avec
+A+H = s n'est candidat.
+
+Trie : niveau j = composante j de la porte (paire extérieure d'abord,
+puis vers l'intérieur, chiffre du milieu en dernier pour k impair).
+
+Le scanner descend paire par paire de l'extérieur vers l'intérieur :
+à chaque nœud, seuls les (a, b) dont la somme a un enfant sont développés,
+les autres sous-arbres (a·10^(k-1-j) + b·10^j + tout l'intérieur) sont
+sautés d'un bloc. Le travail suit le nombre de candidats, pas 10^k.
+
+Utilisation :
+    python scanner_trie.py 8                # fermeture sur les candidats K8
+    python scanner_trie.py 7 --compter      # énumération seule
+    python scanner_trie.py 5 --ensemble-S ../ensemble_S_ferme.json
+    python scanner_trie.py 8 --profile --profil-taille 1000000
+
+Date : octobre 2025
+"""
+
+import argparse
+import time
+from itertools import islice
+from pathlib import Path
+
+from enumeration_candidats import decompositions_paire
+from moteur_fermeture_portes import DOSSIER_PORTES_DEFAUT, charger_portes_k
+from profilage import ajouter_options_profil, profiler_tranche
+from scanner_parallele import charger_ensembles, compteurs_vides, tester_images
+
+# Décompositions (a, b) d'une somme de paire, a ≥ 1 pour la paire extérieure
+DECOMPOSITIONS = [[(a, s - a) for a in decompositions_paire(s)] for s in range(19)]
+DECOMPOSITIONS_EXTERIEURES = [[(a, s - a) for a in decompositions_paire(s, True)] for s in range(19)]
+
+
+class TriePortes:
+    """
+    Trie des portes d'une dimension (dictionnaires imbriqués).
+
+    Utilisation :
+        trie = TriePortes.depuis_portes(portes_k8, 8)
+        trie.sous_arbre((10, 8))    # portes commençant par (10, 8, ...)
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self.racine = {}
+        self.nombre = 0
+
+    @classmethod
+    def depuis_portes(cls, portes, k: int):
+        trie = cls(k)
+        for porte in portes:
+            trie.ajouter(porte)
+        return trie
+
+    def ajouter(self, porte):
+        noeud = self.racine
+        for composante in porte:
+            noeud = noeud.setdefault(composante, {})
+        self.nombre += 1
+
+    def sous_arbre(self, prefixe):
+        """Nœud atteint par le préfixe, ou None si aucune porte ne le prolonge."""
+        noeud = self.racine
+        for composante in prefixe:
+            noeud = noeud.get(composante)
+            if noeud is None:
+                return None
+        return noeud
+
+    def __contains__(self, porte) -> bool:
+        return len(porte) == (self.k + 1) // 2 and self.sous_arbre(porte) is not None
+
+    def __len__(self) -> int:
+        return self.nombre
+
+    def nombre_noeuds(self) -> int:
+        pile, total = [self.racine], 0
+        while pile:
+            noeud = pile.pop()
+            total += 1
+            pile.extend(noeud.values())
+        return total
+
+
+def parcourir_candidats(trie: TriePortes, statistiques: dict = None):
+    """
+    Génère les n à k chiffres dont la porte est dans le trie.
+
+    statistiques (optionnel) reçoit "noeuds_visites" et "paires_elaguees"
+    (paires (a, b) écartées d'un coup avec tout leur sous-arbre).
+    """
+    k = trie.k
+    h = k // 2
+    poids = [(10 ** (k - 1 - j), 10 ** j) for j in range(h)]
+    poids_milieu = 10 ** h
+    compte = {"noeuds_visites": 0, "paires_elaguees": 0}
+
+    def explorer(noeud, j, valeur):
+        compte["noeuds_visites"] += 1
+        if j == h:
+            if k % 2 == 1:
+                for milieu in sorted(noeud):
+                    yield valeur + milieu * poids_milieu
+            else:
+                yield valeur
+            return
+
+        table = DECOMPOSITIONS_EXTERIEURES if j == 0 else DECOMPOSITIONS
+        poids_haut, poids_bas = poids[j]
+        developpees = 0
+        for s in sorted(noeud):
+            enfant = noeud[s]
+            for a, b in table[s]:
+                developpees += 1
+                yield from explorer(enfant, j + 1, valeur + a * poids_haut + b * poids_bas)
+        compte["paires_elaguees"] += (90 if j == 0 else 100) - developpees
+
+    yield from explorer(trie.racine, 0, 0)
+    if statistiques is not None:
+        statistiques.update(compte)
+
+
+def scanner_fermeture_trie(trie: TriePortes, ensembles_par_k: dict, tranche: tuple = None) -> dict:
+    """
+    Vérifie image(n) ∈ S pour chaque candidat produit par le trie.
+
+    Mêmes compteurs que scanner_parallele.scanner_tranche (même test :
+    tester_images) ; les nombres scannés sont ici les seuls candidats.
+    tranche : (premier, fin) en rang dans le flux des candidats (profilage) ;
+    le parcours n'allant pas au bout, les statistiques du trie manquent alors.
+    """
+    compteurs = compteurs_vides()
+    observees = {}
+    statistiques = {}
+    candidats = parcourir_candidats(trie, statistiques)
+    if tranche is not None:
+        candidats = islice(candidats, *tranche)
+    tester_images(candidats, trie.k, ensembles_par_k, compteurs, observees)
+
+    compteurs["nombres_scannes"] = compteurs["candidats_testes"]
+    compteurs["portes_observees"] = observees
+    compteurs.update(statistiques)
+    return compteurs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fermeture sur les seuls candidats, par trie de portes")
+    parser.add_argument("k", type=int)
+    parser.add_argument("--dossier", type=Path, default=DOSSIER_PORTES_DEFAUT)
+    parser.add_argument("--ensemble-S", type=Path, default=None,
+                        help="ensemble_S_ferme.json au lieu de K3..K(k+1)")
+    parser.add_argument("--compter", action="store_true", help="énumérer sans tester les images")
+    ajouter_options_profil(parser, aide_debut="rang du premier candidat (défaut : 0)")
+    args = parser.parse_args()
+    k = args.k
+
+    print("\n" + "=" * 70)
+    print(f"🌳 SCANNER PAR TRIE - k={k}")
+    print("=" * 70 + "\n")
+
+    if args.ensemble_S:
+        ensembles = charger_ensembles(k, args.dossier, args.ensemble_S)
+        ensemble_k = ensembles.get(k)
+    else:
+        ensembles = None if args.compter and not args.profile else charger_ensembles(k, args.dossier)
+        ensemble_k, _ = charger_portes_k(k, args.dossier)
+    if not ensemble_k:
+        print(f"❌ Aucune porte pour k={k}")
+        return
+
+    trie = TriePortes.depuis_portes(ensemble_k.portes(), k)
+    print(f"🚪 Portes : {len(trie):,} ({trie.nombre_noeuds():,} nœuds)")
+
+    if args.profile:
+        premier = args.profil_debut or 0
+        fin = premier + args.profil_taille
+        print(f"🔬 Profilage des candidats de rang [{premier:,}, {fin:,}) dans ce processus")
+        profiler_tranche(args, scanner_fermeture_trie, trie, ensembles, (premier, fin),
+                         prefixe=Path(f"profil_trie_k{k}"), nombres=args.profil_taille)
+        print()
+        return
+
+    debut = time.time()
+    if args.compter:
+        statistiques = {}
+        total = sum(1 for _ in parcourir_candidats(trie, statistiques))
+        compteurs = {"candidats_testes": total, **statistiques}
+    else:
+        compteurs = scanner_fermeture_trie(trie, ensembles)
+    duree = time.time() - debut
+
+    candidats = compteurs["candidats_testes"]
+    print(f"📊 Candidats : {candidats:,} sur {9 * 10 ** (k - 1):,} nombres "
+          f"({100 * candidats / (9 * 10 ** (k - 1)):.1f}%)")
+    print(f"🌿 Nœuds visités : {compteurs['noeuds_visites']:,} - "
+          f"paires élaguées : {compteurs['paires_elaguees']:,}")
+    print(f"⏱️  Durée : {duree:.2f}s ({candidats / max(duree, 1e-9):,.0f} candidats/s)\n")
+
+    if args.compter:
+        return
+
+    if compteurs["violations_count"] == 0:
+        print("✅ FERMETURE VÉRIFIÉE sur tous les candidats")
+    else:
+        print(f"❌ {compteurs['violations_count']:,} violations")
+        for v in compteurs["violations"][:5]:
+            print(f"   n={v['n']}, porte {v['porte_n']} → {v['image']}, porte {v['porte_image']}")
+    total_images = sum(compteurs["distribution_images"].values())
+    for dim, nb in sorted(compteurs["distribution_images"].items()):
+        print(f"   Porte dim {dim} : {nb:,} images ({100 * nb / total_images:5.1f}%)")
+    for k_obs, codes in sorted(compteurs["portes_observees"].items()):
+        print(f"🔭 portes_k{k_obs}_count : {len(codes):,} (dimension non chargée)")
+    print()
+
+
+if __name__ == "__main__":
+    main()
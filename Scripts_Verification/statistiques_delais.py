@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HISTOGRAMMES DES DÉLAIS VERS UN PALINDROME (par dimension)
+==========================================================
+
+Au-delà du oui/non de la fermeture : pour chaque k,
+- combien de nombres atteignent un palindrome en 1, 2, 3... itérations
+- le délai record et le plus petit n qui l'atteint
+- combien survivent à chaque budget d'itérations
+
+Ce sont ces chiffres qui justifient le contenu de K*_portes.json : avec
+--seuil-chiffres 16 (défaut), les non résolus sont exactement les
+candidats nombre_lychrel (K7 : 2,246,721). Un palindrome atteint
+au-delà du seuil n'entre pas dans l'histogramme : il compte en non résolu.
+Dès qu'il y a des non résolus, le record n'est donc qu'un minorant (k=5 :
+29 affiché, alors que 10911 en demande 55) et survivants[B] les compte
+pour tout budget B : le JSON le signale par "tronque_au_seuil": true.
+
+Même principe que decouverte_portes : délai(n) = 1 + délai(T(n)) et
+T(n) ne dépend que de la porte, une trajectoire mémoïsée par porte.
+Les palindromes (délai 0) sont comptés à part, un au plus par porte.
+
+Sortie JSON en colonnes (une liste par grandeur), compacte même pour k=10.
+
+Utilisation :
+    python statistiques_delais.py histogrammes 3 4 5 6 7 8 9 10 --workers 8
+    python statistiques_delais.py afficher statistiques_delais.json
+
+Date : octobre 2025
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from decouverte_portes import (
+    SEUIL_CHIFFRES_DEFAUT,
+    TAILLE_MEMO_DEFAUT,
+    MemoTrajectoires,
+    palindromes_porte,
+    portes_espace,
+    valeur_T_porte,
+)
+from enumeration_candidats import nombres_porte
+from moteur_fermeture_portes import multiplicite_porte
+
+
+def _est_palindrome(n: int) -> bool:
+    s = str(n)
+    return s == s[::-1]
+
+
+def plus_petit_non_palindrome(porte: tuple, k: int):
+    """Plus petit n non palindrome de la porte (None si la porte n'a que son palindrome)."""
+    for n in nombres_porte(porte, k):
+        if not _est_palindrome(n):
+            return n
+    return None
+
+
+def delais_portes(k: int, premieres=None, seuil_chiffres: int = SEUIL_CHIFFRES_DEFAUT,
+                  memo: MemoTrajectoires = None) -> dict:
+    """
+    Histogramme des délais pour les portes à k chiffres (paire extérieure
+    dans `premieres`, toutes par défaut).
+
+    Returns: {"histogramme": {délai: nombres}, "non_resolus", "palindromes",
+              "portes", "record_delai", "record_portes"}
+    """
+    if memo is None:
+        memo = MemoTrajectoires(seuil_chiffres)
+
+    histogramme = {}
+    non_resolus = 0
+    palindromes = 0
+    portes = 0
+    record_delai, record_portes = -1, []
+
+    for porte in portes_espace(k, premieres):
+        portes += 1
+        p = palindromes_porte(porte, k)
+        m = multiplicite_porte(porte, k) - p
+        palindromes += p
+        if m == 0:
+            continue
+
+        candidat, longueur = memo.issue(valeur_T_porte(porte, k))
+        if candidat:
+            non_resolus += m
+            continue
+
+        delai = 1 + longueur
+        histogramme[delai] = histogramme.get(delai, 0) + m
+        if delai > record_delai:
+            record_delai, record_portes = delai, [porte]
+        elif delai == record_delai:
+            record_portes.append(porte)
+
+    return {
+        "histogramme": histogramme,
+        "non_resolus": non_resolus,
+        "palindromes": palindromes,
+        "portes": portes,
+        "record_delai": record_delai,
+        "record_portes": record_portes,
+    }
+
+
+def _delais_portes_worker(args):
+    k, premieres, seuil_chiffres = args
+    debut = time.time()
+    resultat = delais_portes(k, premieres, seuil_chiffres)
+    return k, resultat, time.time() - debut
+
+
+def fusionner_delais(total: dict, partiel: dict) -> dict:
+    """Cumule deux résultats de delais_portes (records : garde le plus long)."""
+    if not total:
+        return {**partiel, "histogramme": dict(partiel["histogramme"]),
+                "record_portes": list(partiel["record_portes"])}
+    for delai, c in partiel["histogramme"].items():
+        total["histogramme"][delai] = total["histogramme"].get(delai, 0) + c
+    for cle in ("non_resolus", "palindromes", "portes"):
+        total[cle] += partiel[cle]
+    if partiel["record_delai"] > total["record_delai"]:
+        total["record_delai"], total["record_portes"] = partiel["record_delai"], list(partiel["record_portes"])
+    elif partiel["record_delai"] == total["record_delai"]:
+        total["record_portes"].extend(partiel["record_portes"])
+    return total
+
+
+def colonnes_dimension(k: int, resultat: dict, duree: float) -> dict:
+    """Mise en colonnes : délais/nombres (creux), budgets/survivants (denses)."""
+    delais = sorted(resultat["histogramme"])
+    nombres = [resultat["histogramme"][d] for d in delais]
+
+    # survivants[B] : n non palindromes sans palindrome en B itérations
+    survivants = []
+    reste = sum(nombres) + resultat["non_resolus"]
+    i = 0
+    for budget in range(resultat["record_delai"] + 1 if delais else 1):
+        while i < len(delais) and delais[i] <= budget:
+            reste -= nombres[i]
+            i += 1
+        survivants.append(reste)
+
+    record_n = None
+    if resultat["record_portes"]:
+        record_n = min(n for n in (plus_petit_non_palindrome(p, k) for p in resultat["record_portes"])
+                       if n is not None)
+
+    # non résolu = trajectoire coupée au seuil, pas forcément un Lychrel
+    tronque = resultat["non_resolus"] > 0
+    return {
+        "dimension": k,
+        "nombres_testes": 9 * 10 ** (k - 1),
+        "portes": resultat["portes"],
+        "palindromes": resultat["palindromes"],
+        "non_resolus": resultat["non_resolus"],
+        "record": {"delai": resultat["record_delai"], "n": record_n,
+                   "portes": len(resultat["record_portes"]), "tronque_au_seuil": tronque},
+        "delais": delais,
+        "nombres": nombres,
+        "survivants": survivants,
+        "tronque_au_seuil": tronque,
+        "duree": round(duree, 3),
+    }
+
+
+def calculer_histogrammes(dimensions, seuil_chiffres: int = SEUIL_CHIFFRES_DEFAUT,
+                          workers: int = 1, afficher: bool = True) -> dict:
+    """
+    Histogrammes de toutes les dimensions demandées.
+
+    workers=1 : une seule mémoire partagée entre les k (croissants).
+    workers>1 : l'espace de chaque k est découpé par paire extérieure ;
+                la durée d'un k est alors la somme des durées de ses
+                tâches (temps de worker, pas temps écoulé).
+    """
+    dimensions = sorted(dimensions)
+    resultats = {k: {} for k in dimensions}
+    durees = {}
+
+    if workers == 1:
+        memo = MemoTrajectoires(seuil_chiffres, TAILLE_MEMO_DEFAUT)
+        for k in dimensions:
+            debut = time.time()
+            resultats[k] = delais_portes(k, None, seuil_chiffres, memo)
+            durees[k] = time.time() - debut
+            if afficher:
+                print(f"   ✓ k={k} ({durees[k]:.1f}s)")
+    else:
+        taches = [(k, [s], seuil_chiffres) for k in dimensions for s in range(1, 19)]
+        debut = time.time()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_delais_portes_worker, t) for t in taches]
+            for terminees, future in enumerate(as_completed(futures), 1):
+                k, partiel, duree = future.result()
+                resultats[k] = fusionner_delais(resultats[k], partiel)
+                durees[k] = durees.get(k, 0.0) + duree
+                if afficher and terminees % 18 == 0:
+                    print(f"   ⏳ {terminees}/{len(taches)} tâches - {time.time() - debut:.1f}s")
+
+    return {
+        "seuil_chiffres": seuil_chiffres,
+        "date_generation": datetime.now().isoformat(),
+        "dimensions": {str(k): colonnes_dimension(k, resultats[k], durees[k]) for k in dimensions},
+    }
+
+
+def afficher_statistiques(donnees: dict, budgets=(10, 20, 30, 50)):
+    print(f"Seuil : {donnees['seuil_chiffres']} chiffres")
+    print("≥ : tronqué au seuil, record minorant et survivants comptant les non résolus\n")
+    print(f"{'k':>3} {'record':>7} {'plus petit n':>14} {'non résolus':>14}  survivants après "
+          + " / ".join(str(b) for b in budgets) + " itérations")
+    for k, d in donnees["dimensions"].items():
+        survivants = [d["survivants"][b] if b < len(d["survivants"]) else d["non_resolus"] for b in budgets]
+        # anciens fichiers sans le drapeau : tronqués dès qu'il reste des non résolus
+        tronque = d.get("tronque_au_seuil", d["non_resolus"] > 0)
+        record = ("≥" if tronque else "") + str(d["record"]["delai"])
+        print(f"{k:>3} {record:>7} {str(d['record']['n']):>14} {d['non_resolus']:>14,}  "
+              + " / ".join(f"{s:,}" for s in survivants))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Histogrammes des délais vers un palindrome")
+    sous = parser.add_subparsers(dest="commande", required=True)
+
+    p_hist = sous.add_parser("histogrammes", help="calculer les histogrammes par dimension")
+    p_hist.add_argument("k", type=int, nargs="*", default=list(range(3, 11)))
+    p_hist.add_argument("--seuil-chiffres", type=int, default=SEUIL_CHIFFRES_DEFAUT)
+    p_hist.add_argument("--workers", type=int, default=1, help="0 : tous les cœurs")
+    p_hist.add_argument("--sortie", type=Path, default=Path("statistiques_delais.json"))
+
+    p_aff = sous.add_parser("afficher", help="relire un fichier de statistiques")
+    p_aff.add_argument("fichier", type=Path)
+
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print("⏳ DÉLAIS VERS UN PALINDROME PAR DIMENSION")
+    print("=" * 70 + "\n")
+
+    if args.commande == "afficher":
+        with open(args.fichier, 'r', encoding='utf-8') as f:
+            afficher_statistiques(json.load(f))
+        print()
+        return
+
+    workers = args.workers or os.cpu_count() or 1
+    debut = time.time()
+    donnees = calculer_histogrammes(args.k, args.seuil_chiffres, workers)
+    duree = time.time() - debut
+
+    with open(args.sortie, 'w', encoding='utf-8') as f:
+        json.dump(donnees, f, ensure_ascii=False, separators=(",", ":"))
+
+    print()
+    afficher_statistiques(donnees)
+    print(f"\n⏱️  Durée : {duree:.2f}s")
+    print(f"💾 Statistiques : {args.sortie}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+STOCKAGE BINAIRE COMPACT DES PORTES (lecture par mmap)
+======================================================
+
+K8_portes.json : 276k lignes de JSON indenté pour 46,036 portes.
+K9_portes.json : 601,051 portes, trop gros pour le dépôt.
+
+Format K{k}_portes.bin (petit-boutiste) :
+- en-tête fixe : b"LYPORTES", version, k, largeur (4 ou 8 octets), nombre
+- bloc `metadata` du JSON d'origine (JSON UTF-8), complété à 8 octets
+- les codes de portes (codec_portes), triés, un entier par porte
+
+K8 : 184 KB, K9 : 2.4 MB. La lecture ne parse rien : le fichier est
+projeté en mémoire (mmap) et les codes sont lus en place ; le test
+d'appartenance est une recherche dichotomique sur le tableau trié.
+
+Utilisation :
+    python stockage_portes.py convertir            # K3..K9 de Donnees_portes
+    python stockage_portes.py convertir 8 9 --dossier F:/.../Listes_Portes
+    python stockage_portes.py info ../Donnees_portes/K8/K8_portes.bin
+
+Date : octobre 2025
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+from codec_portes import BitmapPortes, decoder_porte, encoder_porte, taille_espace
+
+MAGIC = b"LYPORTES"
+VERSION_STORE = 1
+# magic, version, k, largeur, réservé, nombre, taille_metadata
+FORMAT_ENTETE = "<8sHHHHQI"
+TAILLE_ENTETE = struct.calcsize(FORMAT_ENTETE)
+
+
+def largeur_codes(k: int) -> int:
+    """Octets par code : 4 tant que l'espace des codes tient sur 32 bits."""
+    return 4 if taille_espace(k) <= 2 ** 32 else 8
+
+
+def _type_array(largeur: int) -> str:
+    return 'I' if largeur == 4 else 'Q'
+
+
+def ecrire_store(chemin: Path, k: int, codes, metadata: dict = None) -> int:
+    """
+    Écrit un fichier .bin à partir de codes de portes (doublons retirés, triés).
+
+    Returns: nombre de portes écrites
+    """
+    largeur = largeur_codes(k)
+    tableau = array(_type_array(largeur), sorted(set(codes)))
+    if sys.byteorder != "little":
+        tableau.byteswap()
+
+    bloc_metadata = json.dumps(metadata or {}, ensure_ascii=False).encode("utf-8")
+    entete = struct.pack(FORMAT_ENTETE, MAGIC, VERSION_STORE, k, largeur, 0,
+                         len(tableau), len(bloc_metadata))
+    remplissage = (-(TAILLE_ENTETE + len(bloc_metadata))) % 8
+
+    with open(chemin, 'wb') as f:
+        f.write(entete)
+        f.write(bloc_metadata)
+        f.write(b"\0" * remplissage)
+        f.write(tableau.tobytes())
+
+    return len(tableau)
+
+
+class StorePortes:
+    """
+    Lecteur mmap d'un fichier K{k}_portes.bin.
+
+    Utilisation :
+        with StorePortes("K9_portes.bin") as store:
+            store.contient_porte((16, 18, 14, 1, 0))
+            bitmap = store.vers_bitmap()
+    """
+
+    def __init__(self, chemin: Path):
+        self.chemin = Path(chemin)
+        self._fichier = open(self.chemin, 'rb')
+        self._mm = mmap.mmap(self._fichier.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, k, largeur, _, nombre, taille_metadata = struct.unpack_from(FORMAT_ENTETE, self._mm, 0)
+        if magic != MAGIC:
+            self.fermer()
+            raise ValueError(f"{self.chemin} n'est pas un fichier de portes")
+        if version != VERSION_STORE:
+            self.fermer()
+            raise ValueError(f"Version de fichier de portes inconnue : {version}")
+
+        self.k = k
+        self.largeur = largeur
+        self.nombre = nombre
+        debut_metadata = TAILLE_ENTETE
+        self.metadata = json.loads(self._mm[debut_metadata:debut_metadata + taille_metadata].decode("utf-8"))
+
+        debut_codes = debut_metadata + taille_metadata
+        debut_codes += (-debut_codes) % 8
+        fin_codes = debut_codes + nombre * largeur
+        if sys.byteorder == "little":
+            self._vue = memoryview(self._mm)[debut_codes:fin_codes]
+            self.codes = self._vue.cast(_type_array(largeur))
+        else:
+            self._vue = None
+            self.codes = array(_type_array(largeur), self._mm[debut_codes:fin_codes])
+            self.codes.byteswap()
+
+    def __len__(self) -> int:
+        return self.nombre
+
+    def __contains__(self, code: int) -> bool:
+        i = bisect_left(self.codes, code)
+        return i < self.nombre and self.codes[i] == code
+
+    def contient_porte(self, porte) -> bool:
+        return encoder_porte(porte, self.k) in self
+
+    def portes(self):
+        """Itère les portes dans l'ordre lexicographique."""
+        for code in self.codes:
+            yield decoder_porte(code, self.k)
+
+    def vers_bitmap(self) -> BitmapPortes:
+        bitmap = BitmapPortes(self.k)
+        for code in self.codes:
+            bitmap.ajouter(code)
+        return bitmap
+
+    def fermer(self):
+        if getattr(self, "codes", None) is not None and isinstance(self.codes, memoryview):
+            self.codes.release()
+        if getattr(self, "_vue", None) is not None:
+            self._vue.release()
+        self.codes = None
+        self._vue = None
+        self._mm.close()
+        self._fichier.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+    def __repr__(self) -> str:
+        return f"StorePortes(k={self.k}, portes={self.nombre:,}, fichier={self.chemin.name})"
+
+
+def lire_portes_json(json_path: Path):
+    """
+    Lit un K*_portes.json (listes, ou entrées dict {"porte": [...]} comme K8).
+
+    Returns: (k, liste de portes, metadata)
+    """
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    metadata = data.get("metadata", {}) if isinstance(data, dict) else {}
+    portes_list = data.get("portes", []) if isinstance(data, dict) else data
+
+    portes = []
+    for entry in portes_list:
+        if isinstance(entry, dict):
+            entry = entry["porte"]
+        portes.append(tuple(entry))
+
+    k = metadata.get("dimension")
+    if k is None:
+        k = int(Path(json_path).stem.split("_")[0].lstrip("Kk"))
+    return k, portes, metadata
+
+
+def convertir_json(json_path: Path, bin_path: Path = None) -> Path:
+    """K{k}_portes.json → K{k}_portes.bin (même dossier par défaut)."""
+    json_path = Path(json_path)
+    if bin_path is None:
+        bin_path = json_path.with_suffix(".bin")
+    k, portes, metadata = lire_portes_json(json_path)
+    ecrire_store(bin_path, k, (encoder_porte(p, k) for p in portes), metadata)
+    return bin_path
+
+
+def chemin_store(k: int, dossier: Path) -> Path:
+    return Path(dossier) / f"K{k}" / f"K{k}_portes.bin"
+
+
+def main():
+    from moteur_fermeture_portes import DOSSIER_PORTES_DEFAUT
+
+    parser = argparse.ArgumentParser(description="Stockage binaire des portes")
+    sous = parser.add_subparsers(dest="commande", required=True)
+
+    p_conv = sous.add_parser("convertir", help="K*_portes.json → K*_portes.bin")
+    p_conv.add_argument("k", type=int, nargs="*", default=list(range(3, 10)))
+    p_conv.add_argument("--dossier", type=Path, default=DOSSIER_PORTES_DEFAUT)
+
+    p_info = sous.add_parser("info", help="en-tête et temps d'ouverture d'un .bin")
+    p_info.add_argument("fichier", type=Path)
+
+    args = parser.parse_args()
+
+    if args.commande == "convertir":
+        for k in args.k:
+            json_path = Path(args.dossier) / f"K{k}" / f"K{k}_portes.json"
+            if not json_path.exists():
+                print(f"   k={k}: {json_path.name} absent, ignoré")
+                continue
+            debut = time.time()
+            bin_path = convertir_json(json_path)
+            with StorePortes(bin_path) as store:
+                print(f"✅ k={k}: {len(store):,} portes → {bin_path.name} "
+                      f"({bin_path.stat().st_size:,} octets, {time.time() - debut:.2f}s)")
+    else:
+        debut = time.perf_counter()
+        with StorePortes(args.fichier) as store:
+            duree = time.perf_counter() - debut
+            print(f"📂 {store}")
+            print(f"   largeur : {store.largeur} octets/porte")
+            print(f"   ouverture : {duree * 1000:.2f} ms")
+            print(f"   metadata : {json.dumps(store.metadata, ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TÉLÉMÉTRIE DES LONGS CALCULS (phases, compteurs, événements JSONL)
+=================================================================
+
+Les scripts verifier_fermeture_k* calculent vitesse et ETA en ligne
+(print "⏳ ... nb/s - ETA") : les chiffres disparaissent avec le
+terminal. Ici :
+
+- phases chronométrées : with telemetrie.phase("scan"): ...
+  (ou ajouter_duree pour une durée du processus mesurée ailleurs)
+- durées des workers : ajouter_duree_workers, secondes CPU sommées sur
+  tous les workers, rangées à part (durees_workers) : avec 8 workers,
+  elles dépassent l'horloge murale des phases et ne s'y comparent pas
+- compteurs : telemetrie.compter("violations", 3)
+- progression(traites, candidats) : appelable dans la boucle chaude, ne
+  fait qu'une comparaison d'horloge tant que l'intervalle n'est pas écoulé ;
+  ensuite un événement JSONL (débit moyen et instantané, ETA, RSS,
+  candidats/s) et une ligne console
+- un fichier JSONL par exécution, une ligne par événement (debut,
+  phase_debut, phase_fin, progression, fin) : relisible après coup
+
+RSS : psutil s'il est installé, sinon /proc/self/statm (Linux), sinon le
+pic de resource.getrusage ; None si rien n'est disponible (Windows sans
+psutil). USS (uss_octets, pages privées du processus) pour les workers :
+la RSS d'un processus forké compte aussi les pages partagées avec le
+pilote, qu'une somme sur N workers compterait N fois.
+
+Mémoire par phase : RSS et pic de RSS à la fin de chaque phase, plus
+(tracer_allocations=True) les allocations Python de la phase selon
+tracemalloc (courant et pic, remis à zéro à chaque phase ; ralentit les
+allocations, à réserver au processus pilote). memoire() résume le tout
+pour le JSON de résultats.
+
+Budget : avec budget_memoire (octets, ou "4G" via lire_taille), la
+RSS est contrôlée à chaque fin de phase et à chaque événement de
+progression, et controler_memoire(estimation) refuse d'avance une étape
+dont l'estimation dépasse le plafond : BudgetMemoireDepasse.
+
+Utilisation :
+    with Telemetrie("telemetrie_k9.jsonl", total=900_000_000, budget_memoire=lire_taille("8G")) as telemetrie:
+        with telemetrie.phase("chargement_portes"):
+            ...
+        for ...:
+            telemetrie.progression(nombres, candidats)
+
+    python telemetrie.py resume telemetrie_k9.jsonl
+
+Date : octobre 2025
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import psutil
+except ImportError:  # psutil optionnel : /proc ou resource à la place
+    psutil = None
+
+INTERVALLE_DEFAUT = 5.0
+UNITES_TAILLE = {"": 1, "K": 2 ** 10, "M": 2 ** 20, "G": 2 ** 30, "T": 2 ** 40}
+
+
+class BudgetMemoireDepasse(MemoryError):
+    """Mémoire mesurée ou estimée au-delà du plafond fixé."""
+
+
+def lire_taille(texte: str) -> int:
+    """'512M', '4G', '1.5G', '1000000' → octets (puissances de 1024)."""
+    texte = texte.strip().upper().removesuffix("O").removesuffix("B")
+    unite = texte[-1] if texte and texte[-1] in UNITES_TAILLE else ""
+    try:
+        return int(float(texte[:len(texte) - len(unite)]) * UNITES_TAILLE[unite])
+    except ValueError:
+        raise ValueError(f"Taille illisible : {texte!r} (ex. 512M, 4G)") from None
+
+
+def formater_taille(octets) -> str:
+    if octets is None:
+        return "?"
+    return f"{octets / 2 ** 20:,.0f} Mo"
+
+
+def rss_octets():
+    """Mémoire résidente du processus courant (octets), ou None."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pic if sys.platform == "darwin" else pic * 1024
+
+
+def uss_octets():
+    """
+    Mémoire propre du processus courant (octets) : pages privées, sans
+    les pages partagées (héritées du fork, bibliothèques). RSS à défaut.
+    """
+    if psutil is not None:
+        try:
+            return psutil.Process().memory_full_info().uss
+        except psutil.Error:
+            pass
+    try:
+        prive = None
+        with open("/proc/self/smaps_rollup", 'r') as f:
+            for ligne in f:
+                if ligne.startswith(("Private_Clean:", "Private_Dirty:")):
+                    prive = (prive or 0) + int(ligne.split()[1]) * 1024
+        if prive is not None:
+            return prive
+    except (OSError, ValueError):
+        pass
+    return rss_octets()
+
+
+def pic_rss_octets():
+    """Pic de mémoire résidente du processus courant (octets), ou None."""
+    try:
+        with open("/proc/self/status", 'r') as f:
+            for ligne in f:
+                if ligne.startswith("VmHWM:"):
+                    return int(ligne.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return rss_octets()
+    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pic if sys.platform == "darwin" else pic * 1024
+
+
+class Telemetrie:
+    """
+    Instrumentation d'un calcul : phases, compteurs, progression.
+
+    chemin=None : console seule (aucun fichier) ; afficher=False : fichier seul.
+    budget_memoire : plafond en octets (None : pas de contrôle).
+    """
+
+    def __init__(self, chemin: Path = None, total: int = None, unite: str = "nb",
+                 intervalle: float = INTERVALLE_DEFAUT, afficher: bool = True, contexte: dict = None,
+                 budget_memoire: int = None, tracer_allocations: bool = False):
+        self.chemin = Path(chemin) if chemin else None
+        self.budget_memoire = budget_memoire
+        self.memoire_phases = {}
+        self.tracer_allocations = tracer_allocations
+        if tracer_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.unite = unite
+        self.intervalle = intervalle
+        self.afficher = afficher
+        self.phases = {}
+        self.durees_workers = {}
+        self.compteurs = {}
+        self._fichier = open(self.chemin, 'a', encoding='utf-8') if self.chemin else None
+        self.debut = time.time()
+        self.demarrer_progression(total)
+        self.evenement("debut", total=total, contexte=contexte or {}, budget_memoire=budget_memoire)
+
+    def demarrer_progression(self, total: int = None):
+        """Repart de zéro pour le débit et l'ETA (après le chargement, ou à la reprise d'un scan)."""
+        self.total = total
+        self.traites = 0
+        self.candidats = 0
+        self._debut_progression = time.time()
+        self._prochain = self._debut_progression + self.intervalle
+        self._dernier_instant, self._derniers_traites = self._debut_progression, 0
+
+    # ------------------------------------------------------------------
+
+    def evenement(self, type_evenement: str, **donnees):
+        if self._fichier is None:
+            return
+        ligne = {"t": round(time.time(), 3), "evenement": type_evenement, **donnees}
+        self._fichier.write(json.dumps(ligne, ensure_ascii=False) + "\n")
+        self._fichier.flush()
+
+    @contextmanager
+    def phase(self, nom: str):
+        self.evenement("phase_debut", phase=nom, rss=rss_octets())
+        if self.tracer_allocations:
+            tracemalloc.reset_peak()
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            duree = time.perf_counter() - debut
+            self.ajouter_duree(nom, duree)
+            memoire = {"rss": rss_octets(), "rss_pic": pic_rss_octets()}
+            if self.tracer_allocations:
+                memoire["alloc_courant"], memoire["alloc_pic"] = tracemalloc.get_traced_memory()
+            self.memoire_phases[nom] = memoire
+            self.evenement("phase_fin", phase=nom, duree=round(duree, 6), **memoire)
+        self.controler_memoire(contexte=f"fin de la phase {nom}")
+
+    def controler_memoire(self, estimation: int = None, contexte: str = ""):
+        """
+        Lève BudgetMemoireDepasse si la RSS, ou l'estimation donnée pour
+        l'étape à venir, dépasse budget_memoire.
+        """
+        if self.budget_memoire is None:
+            return
+        rss = rss_octets()
+        for valeur, nature in ((rss, "RSS"), (estimation, "estimation")):
+            if valeur is not None and valeur > self.budget_memoire:
+                message = (f"{nature} {formater_taille(valeur)} > budget "
+                           f"{formater_taille(self.budget_memoire)} ({contexte})")
+                self.evenement("budget_depasse", nature=nature, octets=valeur,
+                               budget=self.budget_memoire, contexte=contexte)
+                raise BudgetMemoireDepasse(message)
+
+    def memoire(self) -> dict:
+        """Résumé pour le JSON de résultats (octets)."""
+        resume = {
+            "rss_octets": rss_octets(),
+            "rss_pic_octets": pic_rss_octets(),
+            "budget_octets": self.budget_memoire,
+            "phases": {nom: dict(m) for nom, m in self.memoire_phases.items()},
+        }
+        if self.tracer_allocations:
+            resume["alloc_pic_octets"] = tracemalloc.get_traced_memory()[1]
+        return resume
+
+    def ajouter_duree(self, nom: str, secondes: float):
+        self.phases[nom] = self.phases.get(nom, 0.0) + secondes
+
+    def ajouter_duree_workers(self, nom: str, secondes: float):
+        self.durees_workers[nom] = self.durees_workers.get(nom, 0.0) + secondes
+
+    def compter(self, nom: str, n: int = 1):
+        self.compteurs[nom] = self.compteurs.get(nom, 0) + n
+
+    def progression(self, traites: int, candidats: int = None, forcer: bool = False, **extra):
+        """
+        Met à jour l'avancement ; n'émet rien avant l'intervalle (une
+        seule lecture d'horloge dans la boucle chaude).
+        """
+        self.traites = traites
+        if candidats is not None:
+            self.candidats = candidats
+        maintenant = time.time()
+        if not forcer and maintenant < self._prochain:
+            return
+        self._prochain = maintenant + self.intervalle
+        etat = self.etat(maintenant)
+        self._dernier_instant, self._derniers_traites = maintenant, traites
+        self.evenement("progression", **etat, **extra)
+        if self.afficher:
+            self.rendre(etat)
+        self.controler_memoire(contexte=f"{traites:,} {self.unite} traités")
+
+    def etat(self, maintenant: float = None) -> dict:
+        if maintenant is None:
+            maintenant = time.time()
+        ecoule = maintenant - self.debut
+        actif = maintenant - self._debut_progression
+        debit = self.traites / actif if actif > 0 else 0.0
+        fenetre = maintenant - self._dernier_instant
+        instantane = (self.traites - self._derniers_traites) / fenetre if fenetre > 0 else debit
+        eta = (self.total - self.traites) / debit if self.total and debit > 0 else None
+        return {
+            "ecoule": round(ecoule, 3),
+            "traites": self.traites,
+            "total": self.total,
+            "debit": round(debit, 1),
+            "debit_instantane": round(instantane, 1),
+            "eta": round(eta, 1) if eta is not None else None,
+            "candidats": self.candidats,
+            "candidats_par_sec": round(self.candidats / actif, 1) if actif > 0 else 0.0,
+            "rss": rss_octets(),
+        }
+
+    def rendre(self, etat: dict):
+        """Ligne console, au format des anciens affichages."""
+        avancement = f"{etat['traites']:,}"
+        if self.total:
+            avancement += f" ({100 * etat['traites'] / self.total:.1f}%)"
+        eta = f" - ETA: {etat['eta']:.0f}s" if etat["eta"] is not None else ""
+        rss = f" - RSS {formater_taille(etat['rss'])}" if etat["rss"] else ""
+        print(f"   ⏳ {avancement} - {etat['debit']:,.0f} {self.unite}/s{eta} - "
+              f"Candidats: {etat['candidats']:,}{rss}")
+
+    def terminer(self, statut: str = "termine", **resume) -> dict:
+        """Événement final (phases, compteurs, débit) ; ferme le fichier."""
+        bilan = {
+            "statut": statut,
+            **self.etat(),
+            "phases": {nom: round(d, 6) for nom, d in self.phases.items()},
+            "durees_workers": {nom: round(d, 6) for nom, d in self.durees_workers.items()},
+            "compteurs": dict(self.compteurs),
+            "memoire": self.memoire(),
+            **resume,
+        }
+        self.evenement("fin", **bilan)
+        if self._fichier is not None:
+            self._fichier.close()
+            self._fichier = None
+        if self.tracer_allocations:
+            tracemalloc.stop()
+        return bilan
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type_exc, exc, tb):
+        if self._fichier is not None:
+            self.terminer("termine" if type_exc is None else f"interrompu:{type_exc.__name__}")
+
+
+def lire_evenements(chemin: Path) -> list:
+    """Événements d'un fichier JSONL (une ligne tronquée en fin de fichier est ignorée)."""
+    evenements = []
+    with open(chemin, 'r', encoding='utf-8') as f:
+        for ligne in f:
+            try:
+                evenements.append(json.loads(ligne))
+            except json.JSONDecodeError:
+                break
+    return evenements
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Relecture d'un fichier de télémétrie")
+    sous = parser.add_subparsers(dest="commande", required=True)
+    p_res = sous.add_parser("resume", help="phases, débits et mémoire d'une exécution")
+    p_res.add_argument("fichier", type=Path)
+    args = parser.parse_args()
+
+    evenements = lire_evenements(args.fichier)
+    progressions = [e for e in evenements if e["evenement"] == "progression"]
+    fins = [e for e in evenements if e["evenement"] == "fin"]
+
+    print("\n" + "=" * 70)
+    print(f"📈 TÉLÉMÉTRIE - {args.fichier.name}")
+    print("=" * 70 + "\n")
+    print(f"📋 {len(evenements):,} événements, {len(progressions):,} points de progression")
+    if progressions:
+        debits = [p["debit_instantane"] for p in progressions]
+        rss = [p["rss"] for p in progressions if p.get("rss")]
+        print(f"🚀 Débit instantané : min {min(debits):,.0f} - max {max(debits):,.0f}")
+        if rss:
+            print(f"🧠 RSS max : {formater_taille(max(rss))}")
+    if fins:
+        fin = fins[-1]
+        print(f"🏁 {fin['statut']} après {fin['ecoule']:.1f}s : {fin['traites']:,} traités, "
+              f"{fin['debit']:,.0f}/s, {fin['candidats']:,} candidats")
+        memoire_phases = fin.get("memoire", {}).get("phases", {})
+        for nom, duree in sorted(fin["phases"].items(), key=lambda e: -e[1]):
+            memoire = memoire_phases.get(nom, {})
+            details = f"  RSS {formater_taille(memoire['rss'])}" if memoire.get("rss") else ""
+            if "alloc_pic" in memoire:
+                details += f", allocations pic {formater_taille(memoire['alloc_pic'])}"
+            print(f"   {nom:<28} {duree:>10.2f}s{details}")
+        for nom, duree in sorted(fin.get("durees_workers", {}).items(), key=lambda e: -e[1]):
+            print(f"   {nom:<28} {duree:>10.2f}s  (cumul des workers)")
+    else:
+        print("⚠️  Pas d'événement de fin : exécution interrompue ou en cours")
+    for depassement in (e for e in evenements if e["evenement"] == "budget_depasse"):
+        print(f"❌ Budget dépassé : {depassement['nature']} {formater_taille(depassement['octets'])} "
+              f"> {formater_taille(depassement['budget'])} ({depassement['contexte']})")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Reprise de flux_portes.py après un arrêt brutal (membre gzip tronqué).
+
+Utilisation :
+    python -m pytest test_flux_portes.py
+
+Date : octobre 2025
+"""
+
+import sys
+
+from flux_portes import EcrivainFlux, lire_flux, main, reparer_flux
+
+
+def _lancer(monkeypatch, *arguments):
+    monkeypatch.setattr(sys, "argv", ["flux_portes.py", *map(str, arguments)])
+    main()
+
+
+def test_reprise_apres_troncature(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    flux, reprise = tmp_path / "portes.bin.gz", tmp_path / "traj.ckpt"
+
+    _lancer(monkeypatch, "--iterations", 2000, "--flux", flux, "--point-reprise", reprise)
+    with open(flux, "r+b") as f:
+        f.truncate(flux.stat().st_size - 40)
+    prefixe = [iteration for iteration, _, _ in lire_flux(flux)]
+    assert 0 < len(prefixe) < 2001
+
+    _lancer(monkeypatch, "--iterations", 2500, "--flux", flux, "--point-reprise", reprise, "--reprendre")
+
+    # Préfixe lisible puis toute la session reprise : plus rien derrière un membre tronqué
+    iterations = [iteration for iteration, _, _ in lire_flux(flux)]
+    assert iterations == prefixe + list(range(2000, 2501))
+    assert prefixe == list(range(len(prefixe)))
+
+
+def test_reparer_flux_intact(tmp_path):
+    flux = tmp_path / "portes.bin.gz"
+    with EcrivainFlux(flux) as ecrivain:
+        ecrivain.ecrire(0, 3, bytes((7, 14)))
+    taille = flux.stat().st_size
+
+    assert not reparer_flux(flux)
+    assert flux.stat().st_size == taille
+    assert list(lire_flux(flux)) == [(0, 3, (7, 14))]
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TRAJECTOIRE DE 196 SUR DES MILLIONS DE CHIFFRES
+===============================================
+
+Le calcul de l'article s'arrête à 458 itérations (201 chiffres) :
+int(str(n)[::-1]) est quadratique en nombre de chiffres en CPython.
+
+Ici le nombre reste un tableau de chiffres (poids faible en tête) et
+T(n) = n + reverse(n) se fait en place :
+1. d[i] ← d[i] + d[L-1-i]   (sommes de paires, symétriques, ≤ 18)
+2. UNE passe de retenues
+3. test de palindrome sur le tableau obtenu
+
+Coût par itération linéaire en L : on peut viser 10^6+ chiffres,
+l'échelle des calculs de VanLandingham cités dans l'article.
+
+Deux chemins :
+- NumPy (si disponible) : tableau uint8, retenues par « dernière position
+  ≠ 9 » (np.maximum.accumulate), sans boucle Python
+- pur Python : bytearray et boucle de retenues
+
+Point de reprise : une ligne d'en-tête JSON puis les chiffres en ASCII
+(poids fort en tête), réécrit de façon atomique.
+
+Utilisation :
+    python trajectoire_grands_nombres.py --iterations 100000
+    python trajectoire_grands_nombres.py --iterations 1000000 --point-reprise traj_196.ckpt --reprendre
+
+Date : octobre 2025
+"""
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # NumPy optionnel : chemin bytearray sinon
+    np = None
+
+
+# ============================================================================
+# CHEMIN PUR PYTHON (bytearray, poids faible en tête)
+# ============================================================================
+
+def reverse_and_add_bytearray(d: bytearray) -> bool:
+    """
+    Remplace d par T(d) en place.
+
+    Returns: True si le résultat est un palindrome
+    """
+    L = len(d)
+    for i in range(L // 2):
+        s = d[i] + d[L - 1 - i]
+        d[i] = s
+        d[L - 1 - i] = s
+    if L % 2 == 1:
+        d[L // 2] *= 2
+
+    retenue = 0
+    for i in range(L):
+        t = d[i] + retenue
+        if t >= 10:
+            d[i] = t - 10
+            retenue = 1
+        else:
+            d[i] = t
+            retenue = 0
+    if retenue:
+        d.append(1)
+
+    return d == d[::-1]
+
+
+# ============================================================================
+# CHEMIN NUMPY (uint8, poids faible en tête)
+# ============================================================================
+
+class _TamponsNumpy:
+    """Tampons réutilisés d'une itération à l'autre (indices 0..capacité)."""
+
+    def __init__(self):
+        self.indices = np.arange(0, dtype=np.int64)
+
+    def indices_jusqua(self, L: int):
+        if len(self.indices) < L:
+            self.indices = np.arange(max(L, 2 * len(self.indices)), dtype=np.int64)
+        return self.indices[:L]
+
+
+def reverse_and_add_numpy(d, tampons: _TamponsNumpy = None):
+    """
+    T(d) pour un tableau uint8 de chiffres (poids faible en tête).
+
+    La retenue entrant en position i vient de la dernière position j < i
+    dont la somme n'est pas 9 : elle vaut 1 si cette somme est ≥ 10.
+
+    Returns: (nouveau tableau, est_palindrome)
+    """
+    if tampons is None:
+        tampons = _TamponsNumpy()
+    L = len(d)
+    d += d[::-1]  # NumPy gère le recouvrement : d[i] + d[L-1-i] pour tout i
+
+    indices = tampons.indices_jusqua(L)
+    pos_non9 = np.where(d != 9, indices, -1)
+    derniere = np.maximum.accumulate(pos_non9)
+    genere = d >= 10
+
+    retenue_entrante = np.zeros(L, dtype=np.uint8)
+    amont = derniere[:-1]
+    retenue_entrante[1:] = (amont >= 0) & genere[np.maximum(amont, 0)]
+    retenue_sortante = derniere[-1] >= 0 and genere[derniere[-1]]
+
+    d += retenue_entrante
+    d[d >= 10] -= 10
+    if retenue_sortante:
+        d = np.append(d, np.uint8(1))
+
+    return d, bool(np.array_equal(d, d[::-1]))
+
+
+# ============================================================================
+# TRAJECTOIRE
+# ============================================================================
+
+class TrajectoireChiffres:
+    """
+    Nombre courant d'une trajectoire reverse-and-add, en tableau de chiffres.
+
+    Utilisation :
+        traj = TrajectoireChiffres.depuis_entier(196)
+        for _ in range(1000):
+            if traj.etape():
+                print("palindrome à l'itération", traj.iteration)
+    """
+
+    def __init__(self, chiffres_poids_faible, iteration: int = 0, graine=None, utiliser_numpy: bool = None):
+        if utiliser_numpy is None:
+            utiliser_numpy = np is not None
+        self.utiliser_numpy = utiliser_numpy
+        if utiliser_numpy:
+            self.chiffres = np.asarray(bytearray(chiffres_poids_faible), dtype=np.uint8).copy()
+            self._tampons = _TamponsNumpy()
+        else:
+            self.chiffres = bytearray(chiffres_poids_faible)
+        self.iteration = iteration
+        self.graine = graine
+
+    @classmethod
+    def depuis_chaine(cls, texte: str, iteration: int = 0, graine=None, utiliser_numpy: bool = None):
+        chiffres = bytes(ord(c) - 48 for c in reversed(texte.strip()))
+        return cls(chiffres, iteration, graine if graine is not None else texte.strip(), utiliser_numpy)
+
+    @classmethod
+    def depuis_entier(cls, n: int, utiliser_numpy: bool = None):
+        return cls.depuis_chaine(str(n), graine=n, utiliser_numpy=utiliser_numpy)
+
+    def __len__(self) -> int:
+        return len(self.chiffres)
+
+    def etape(self) -> bool:
+        """Applique T une fois. Returns: True si le résultat est un palindrome."""
+        if self.utiliser_numpy:
+            self.chiffres, palindrome = reverse_and_add_numpy(self.chiffres, self._tampons)
+        else:
+            palindrome = reverse_and_add_bytearray(self.chiffres)
+        self.iteration += 1
+        return palindrome
+
+    def chiffres_poids_fort(self) -> bytes:
+        """Chiffres en ASCII, poids fort en tête (sans passer par int)."""
+        if self.utiliser_numpy:
+            return (self.chiffres[::-1] + 48).tobytes()
+        return bytes(c + 48 for c in reversed(self.chiffres))
+
+    def vers_entier(self) -> int:
+        """Valeur entière (à réserver aux petits nombres : conversion quadratique)."""
+        return int(self.chiffres_poids_fort())
+
+    def sauvegarder(self, chemin: Path):
+        """Point de reprise : en-tête JSON + chiffres ASCII, écriture atomique."""
+        chemin = Path(chemin)
+        temporaire = chemin.with_name(chemin.name + ".tmp")
+        entete = {
+            "graine": self.graine,
+            "iteration": self.iteration,
+            "longueur": len(self),
+            "format": "chiffres_ascii_poids_fort",
+        }
+        with open(temporaire, 'wb') as f:
+            f.write(json.dumps(entete).encode("utf-8") + b"\n")
+            f.write(self.chiffres_poids_fort())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporaire, chemin)
+
+    @classmethod
+    def charger(cls, chemin: Path, utiliser_numpy: bool = None):
+        with open(chemin, 'rb') as f:
+            entete = json.loads(f.readline().decode("utf-8"))
+            texte = f.read()
+        if len(texte) != entete["longueur"]:
+            raise ValueError(f"Point de reprise tronqué : {len(texte)} chiffres au lieu de {entete['longueur']}")
+        chiffres = bytes(c - 48 for c in reversed(texte))
+        return cls(chiffres, entete["iteration"], entete["graine"], utiliser_numpy)
+
+
+def executer_trajectoire(traj: TrajectoireChiffres, iterations: int, point_reprise: Path = None,
+                         intervalle_sauvegarde: float = 300.0, intervalle_affichage: float = 10.0):
+    """
+    Itère jusqu'à `iterations` (nombre total depuis la graine) ou un palindrome.
+
+    Returns: itération du palindrome trouvé, ou None
+    """
+    debut = time.time()
+    iteration_depart = traj.iteration
+    derniere_sauvegarde = derniere_affichage = debut
+    palindrome_a = None
+
+    try:
+        while traj.iteration < iterations:
+            if traj.etape():
+                palindrome_a = traj.iteration
+                break
+
+            maintenant = time.time()
+            if maintenant - derniere_affichage >= intervalle_affichage:
+                vitesse = (traj.iteration - iteration_depart) / (maintenant - debut)
+                print(f"   ⏳ itération {traj.iteration:,} - {len(traj):,} chiffres - "
+                      f"{vitesse:,.1f} it/s")
+                derniere_affichage = maintenant
+            if point_reprise and maintenant - derniere_sauvegarde >= intervalle_sauvegarde:
+                traj.sauvegarder(point_reprise)
+                derniere_sauvegarde = maintenant
+    finally:
+        if point_reprise:
+            traj.sauvegarder(point_reprise)
+
+    return palindrome_a
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trajectoire reverse-and-add sur tableau de chiffres")
+    parser.add_argument("--graine", type=str, default="196")
+    parser.add_argument("--iterations", type=int, default=10_000)
+    parser.add_argument("--point-reprise", type=Path, default=None)
+    parser.add_argument("--reprendre", action="store_true")
+    parser.add_argument("--intervalle-sauvegarde", type=float, default=300.0)
+    parser.add_argument("--sans-numpy", action="store_true")
+    args = parser.parse_args()
+
+    utiliser_numpy = np is not None and not args.sans_numpy
+
+    print("\n" + "=" * 70)
+    print(f"🌀 TRAJECTOIRE DE {args.graine} - objectif {args.iterations:,} itérations")
+    print("=" * 70 + "\n")
+
+    if args.reprendre and args.point_reprise and args.point_reprise.exists():
+        traj = TrajectoireChiffres.charger(args.point_reprise, utiliser_numpy)
+        print(f"♻️  Reprise à l'itération {traj.iteration:,} ({len(traj):,} chiffres)\n")
+    else:
+        traj = TrajectoireChiffres.depuis_chaine(args.graine, utiliser_numpy=utiliser_numpy)
+
+    debut = time.time()
+    iteration_depart = traj.iteration
+    palindrome_a = executer_trajectoire(traj, args.iterations, args.point_reprise, args.intervalle_sauvegarde)
+    duree = time.time() - debut
+
+    print()
+    print(f"🔢 Itérations : {traj.iteration:,} ({traj.iteration - iteration_depart:,} cette session)")
+    print(f"📏 Chiffres : {len(traj):,}")
+    print(f"⏱️  Durée : {duree:.2f}s")
+    if palindrome_a is not None:
+        print(f"🎯 PALINDROME atteint à l'itération {palindrome_a:,}")
+    else:
+        print("✅ Aucun palindrome")
+    if args.point_reprise:
+        print(f"💾 Point de reprise : {args.point_reprise}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
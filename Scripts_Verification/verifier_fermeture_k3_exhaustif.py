@@ -25,7 +25,10 @@ Auteur: Assistant (suggestion Claude)
 import json
 import time
 from datetime import datetime
-from pathlib import Path
+
+from cache_portes import cache_ensemble_S
+from codec_portes import code_porte_nombre, decoder_porte_S
+from noyau_portes import tables_porte
 
 
 def reverse_number(n: int) -> int:
@@ -71,76 +74,6 @@ def calculer_porte_apres_T(n: int) -> tuple:
     return calculer_porte_k3(T_n)
 
 
-def charger_ensemble_S(fichier_json: str = "Scripts/ensemble_S_ferme.json") -> dict:
-    """Charge l'ensemble S depuis JSON."""
-    with open(fichier_json, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return data
-
-
-def extraire_portes_par_k(S_data: dict, k: int) -> set:
-    """
-    Extrait toutes les portes de dimension k.
-    
-    Note: Le JSON stocke seulement la moitié de la porte (symétrique).
-    On reconstruit la porte complète.
-    
-    Returns: set de tuples
-    """
-    portes = set()
-    
-    # Structure: ensemble_S -> portes_par_longueur -> k -> liste de portes
-    k_str = str(k)
-    if k_str in S_data['ensemble_S']['portes_par_longueur']:
-        for porte_half in S_data['ensemble_S']['portes_par_longueur'][k_str]:
-            # Reconstruire porte complète (symétrique)
-            # Si k impair: (a, b, c) → (a, b, c, b, a) mais stocké (a, b)
-            # Si k pair: (a, b, c, d) → (a, b, c, d, c, b, a) mais stocké (a, b, c)
-            
-            if k % 2 == 1:
-                # k impair: porte_half + [middle] + reverse(porte_half)
-                # Mais middle n'est pas dans porte_half
-                # En fait pour k=3: stocké (7, 18) mais complet est (7, 18, 7)
-                # Donc: porte_half[:-1] + reverse(porte_half)
-                milieu = porte_half[-1]
-                debut = porte_half[:-1]
-                porte_complete = debut + [milieu] + list(reversed(debut))
-            else:
-                # k pair: porte_half + reverse(porte_half)
-                porte_complete = porte_half + list(reversed(porte_half))
-            
-            porte_tuple = tuple(porte_complete)
-            portes.add(porte_tuple)
-    
-    return portes
-
-
-def extraire_toutes_portes_S(S_data: dict) -> set:
-    """
-    Extrait TOUTES les portes de S (tous k).
-    Reconstruit les portes complètes depuis leur format symétrique.
-    """
-    toutes_portes = set()
-    
-    for k_str, portes_list in S_data['ensemble_S']['portes_par_longueur'].items():
-        k = int(k_str)
-        for porte_half in portes_list:
-            # Reconstruire porte complète
-            if k % 2 == 1:
-                # k impair
-                milieu = porte_half[-1]
-                debut = porte_half[:-1]
-                porte_complete = debut + [milieu] + list(reversed(debut))
-            else:
-                # k pair
-                porte_complete = porte_half + list(reversed(porte_half))
-            
-            porte_tuple = tuple(porte_complete)
-            toutes_portes.add(porte_tuple)
-    
-    return toutes_portes
-
-
 def verifier_fermeture_k3_exhaustif():
     """
     Vérifie EXHAUSTIVEMENT la fermeture pour k=3.
@@ -154,10 +87,13 @@ def verifier_fermeture_k3_exhaustif():
     
     # Charger S
     print("📂 Chargement ensemble S...")
-    S_data = charger_ensemble_S()
+    # Portes déjà reconstruites (cache_portes) : le JSON n'est reparsé que s'il a changé
+    cache_S = cache_ensemble_S("Scripts/ensemble_S_ferme.json")
     
-    S_k3 = extraire_portes_par_k(S_data, k=3)
-    S_toutes = extraire_toutes_portes_S(S_data)
+    S_k3 = cache_S.portes_S_completes(3)
+    S_toutes = cache_S.toutes_portes_S_completes()
+    bitmap_S3 = cache_S.ensembles[3]
+    bitmaps_S = cache_S.ensembles
     
     print(f"✅ Portes S₃ (k=3) : {len(S_k3)} portes")
     print(f"✅ Portes S (tous k) : {len(S_toutes)} portes")
@@ -167,6 +103,9 @@ def verifier_fermeture_k3_exhaustif():
     print("🔍 Vérification exhaustive [100, 999]...")
     print()
     
+    # Tables demi-nombres : code(n) = TABLE_HAUT[haut] + TABLE_BAS[bas]
+    table_haut, table_bas, diviseur = tables_porte(3)
+    
     debut = time.time()
     
     nombres_testes = 0
@@ -178,27 +117,27 @@ def verifier_fermeture_k3_exhaustif():
         nombres_testes += 1
         
         # Calculer porte de n
-        porte_n = calculer_porte_k3(n)
+        code_n = table_haut[n // diviseur] + table_bas[n % diviseur]
         
         # Si n a une porte dans S₃
-        if porte_n in S_k3:
+        if code_n in bitmap_S3:
             nombres_dans_S3 += 1
             
             # Calculer T(n) et sa porte
             T_n = reverse_and_add(n)
-            porte_T_n = calculer_porte_k3(T_n)
+            k_image = len(str(T_n))
+            code_T_n = code_porte_nombre(T_n, k_image)
             
             # Vérifier si porte_T_n ∈ S
-            if porte_T_n not in S_toutes:
+            if k_image not in bitmaps_S or code_T_n not in bitmaps_S[k_image]:
                 fermeture_violee.append({
                     'n': n,
-                    'porte_n': porte_n,
+                    'porte_n': decoder_porte_S(code_n, 3),
                     'T_n': T_n,
-                    'porte_T_n': porte_T_n
+                    'porte_T_n': decoder_porte_S(code_T_n, k_image)
                 })
             
             # Statistiques: dimension de l'image
-            k_image = len(porte_T_n)
             distributions_k_images[k_image] = distributions_k_images.get(k_image, 0) + 1
         
         # Affichage progression
@@ -15,6 +15,10 @@ import json
 import time
 from datetime import datetime
 
+from cache_portes import cache_ensemble_S
+from codec_portes import code_porte_nombre, decoder_porte_S
+from noyau_portes import tables_porte
+
 
 def reverse_number(n: int) -> int:
     """Inverse un nombre."""
@@ -40,53 +44,6 @@ def calculer_porte(n: int) -> tuple:
     return tuple(sommes)
 
 
-def charger_ensemble_S(fichier_json: str = "Scripts/ensemble_S_ferme.json") -> dict:
-    """Charge l'ensemble S depuis JSON."""
-    with open(fichier_json, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return data
-
-
-def extraire_portes_par_k(S_data: dict, k: int) -> set:
-    """Extrait toutes les portes de dimension k. Reconstruit portes symétriques."""
-    portes = set()
-    
-    k_str = str(k)
-    if k_str in S_data['ensemble_S']['portes_par_longueur']:
-        for porte_half in S_data['ensemble_S']['portes_par_longueur'][k_str]:
-            if k % 2 == 1:
-                milieu = porte_half[-1]
-                debut = porte_half[:-1]
-                porte_complete = debut + [milieu] + list(reversed(debut))
-            else:
-                porte_complete = porte_half + list(reversed(porte_half))
-            
-            porte_tuple = tuple(porte_complete)
-            portes.add(porte_tuple)
-    
-    return portes
-
-
-def extraire_toutes_portes_S(S_data: dict) -> set:
-    """Extrait TOUTES les portes de S (tous k). Reconstruit portes symétriques."""
-    toutes_portes = set()
-    
-    for k_str, portes_list in S_data['ensemble_S']['portes_par_longueur'].items():
-        k = int(k_str)
-        for porte_half in portes_list:
-            if k % 2 == 1:
-                milieu = porte_half[-1]
-                debut = porte_half[:-1]
-                porte_complete = debut + [milieu] + list(reversed(debut))
-            else:
-                porte_complete = porte_half + list(reversed(porte_half))
-            
-            porte_tuple = tuple(porte_complete)
-            toutes_portes.add(porte_tuple)
-    
-    return toutes_portes
-
-
 def verifier_fermeture_k4_exhaustif():
     """
     Vérifie EXHAUSTIVEMENT la fermeture pour k=4.
@@ -99,10 +56,13 @@ def verifier_fermeture_k4_exhaustif():
     
     # Charger S
     print("📂 Chargement ensemble S...")
-    S_data = charger_ensemble_S()
+    # Portes déjà reconstruites (cache_portes) : le JSON n'est reparsé que s'il a changé
+    cache_S = cache_ensemble_S("Scripts/ensemble_S_ferme.json")
     
-    S_k4 = extraire_portes_par_k(S_data, k=4)
-    S_toutes = extraire_toutes_portes_S(S_data)
+    S_k4 = cache_S.portes_S_completes(4)
+    S_toutes = cache_S.toutes_portes_S_completes()
+    bitmap_S4 = cache_S.ensembles[4]
+    bitmaps_S = cache_S.ensembles
     
     print(f"✅ Portes S₄ (k=4) : {len(S_k4)} portes")
     print(f"✅ Portes S (tous k) : {len(S_toutes)} portes")
@@ -113,6 +73,9 @@ def verifier_fermeture_k4_exhaustif():
     print("⏳ Attention : ~9000 nombres, peut prendre quelques minutes...")
     print()
     
+    # Tables demi-nombres : code(n) = TABLE_HAUT[haut] + TABLE_BAS[bas]
+    table_haut, table_bas, diviseur = tables_porte(4)
+    
     debut = time.time()
     
     nombres_testes = 0
@@ -123,23 +86,23 @@ def verifier_fermeture_k4_exhaustif():
     for n in range(1000, 10000):
         nombres_testes += 1
         
-        porte_n = calculer_porte(n)
+        code_n = table_haut[n // diviseur] + table_bas[n % diviseur]
         
-        if porte_n in S_k4:
+        if code_n in bitmap_S4:
             nombres_dans_S4 += 1
             
             T_n = reverse_and_add(n)
-            porte_T_n = calculer_porte(T_n)
+            k_image = len(str(T_n))
+            code_T_n = code_porte_nombre(T_n, k_image)
             
-            if porte_T_n not in S_toutes:
+            if k_image not in bitmaps_S or code_T_n not in bitmaps_S[k_image]:
                 fermeture_violee.append({
                     'n': n,
-                    'porte_n': porte_n,
+                    'porte_n': decoder_porte_S(code_n, 4),
                     'T_n': T_n,
-                    'porte_T_n': porte_T_n
+                    'porte_T_n': decoder_porte_S(code_T_n, k_image)
                 })
             
-            k_image = len(porte_T_n)
             distributions_k_images[k_image] = distributions_k_images.get(k_image, 0) + 1
         
         # Affichage progression
@@ -14,9 +14,18 @@ Suite aux suggestions de Claude.AI :
 Date: 10 octobre 2025, 19:45
 """
 
+import argparse
 import json
+import sys
 import time
 from datetime import datetime
+from pathlib import Path
+
+from cache_portes import cache_ensemble_S
+from codec_portes import code_porte_nombre, decoder_porte_S
+from noyau_portes import tables_porte
+from profilage import ajouter_options_profil, profiler_tranche, tranche_profil
+from telemetrie import Telemetrie
 
 
 def reverse_number(n: int) -> int:
@@ -43,60 +52,19 @@ def calculer_porte(n: int) -> tuple:
     return tuple(sommes)
 
 
-def charger_ensemble_S(fichier_json: str = "Scripts/ensemble_S_ferme.json") -> dict:
-    """Charge l'ensemble S depuis JSON."""
-    with open(fichier_json, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return data
-
-
-def extraire_portes_par_k(S_data: dict, k: int) -> set:
-    """Extrait toutes les portes de dimension k. Reconstruit portes symétriques."""
-    portes = set()
-    
-    k_str = str(k)
-    if k_str in S_data['ensemble_S']['portes_par_longueur']:
-        for porte_half in S_data['ensemble_S']['portes_par_longueur'][k_str]:
-            if k % 2 == 1:
-                milieu = porte_half[-1]
-                debut = porte_half[:-1]
-                porte_complete = debut + [milieu] + list(reversed(debut))
-            else:
-                porte_complete = porte_half + list(reversed(porte_half))
-            
-            porte_tuple = tuple(porte_complete)
-            portes.add(porte_tuple)
-    
-    return portes
-
-
-def extraire_toutes_portes_S(S_data: dict) -> set:
-    """Extrait TOUTES les portes de S (tous k). Reconstruit portes symétriques."""
-    toutes_portes = set()
-    
-    for k_str, portes_list in S_data['ensemble_S']['portes_par_longueur'].items():
-        k = int(k_str)
-        for porte_half in portes_list:
-            if k % 2 == 1:
-                milieu = porte_half[-1]
-                debut = porte_half[:-1]
-                porte_complete = debut + [milieu] + list(reversed(debut))
-            else:
-                porte_complete = porte_half + list(reversed(porte_half))
-            
-            porte_tuple = tuple(porte_complete)
-            toutes_portes.add(porte_tuple)
-    
-    return toutes_portes
-
-
-def verifier_fermeture_k5_exhaustif():
+def verifier_fermeture_k5_exhaustif(telemetrie: Telemetrie = None, tranche: tuple = None):
     """
     Vérifie EXHAUSTIVEMENT la fermeture pour k=5.
     Teste TOUS les nombres 10000-99999.
     
+    telemetrie : progression, ETA et phases (défaut : console seule)
+    tranche : (premier, fin) à scanner (défaut : tous les nombres à 5 chiffres)
+    
     ⚠️ Long calcul : ~1-2 heures
     """
+    if telemetrie is None:
+        telemetrie = Telemetrie(intervalle=0.0)
+    premier, fin = tranche or (10000, 100000)
     print("="*70)
     print("VÉRIFICATION EXHAUSTIVE - FERMETURE k=5")
     print("="*70)
@@ -104,20 +72,28 @@ def verifier_fermeture_k5_exhaustif():
     
     # Charger S
     print("📂 Chargement ensemble S...")
-    S_data = charger_ensemble_S()
+    # Portes déjà reconstruites (cache_portes) : le JSON n'est reparsé que s'il a changé
+    with telemetrie.phase("chargement_portes"):
+        cache_S = cache_ensemble_S("Scripts/ensemble_S_ferme.json")
     
-    S_k5 = extraire_portes_par_k(S_data, k=5)
-    S_toutes = extraire_toutes_portes_S(S_data)
+    S_k5 = cache_S.portes_S_completes(5)
+    S_toutes = cache_S.toutes_portes_S_completes()
+    bitmap_S5 = cache_S.ensembles[5]
+    bitmaps_S = cache_S.ensembles
     
     print(f"✅ Portes S₅ (k=5) : {len(S_k5)} portes")
     print(f"✅ Portes S (tous k) : {len(S_toutes)} portes")
     print()
     
     # Vérification exhaustive
-    print("🔍 Vérification exhaustive [10000, 99999]...")
+    print(f"🔍 Vérification exhaustive [{premier}, {fin - 1}]...")
     print("⏳ ATTENTION : ~90000 nombres, calcul peut prendre 1-2 heures...")
     print()
     
+    # Tables demi-nombres : code(n) = TABLE_HAUT[haut] + TABLE_BAS[bas]
+    table_haut, table_bas, diviseur = tables_porte(5)
+    
+    telemetrie.demarrer_progression(fin - premier)
     debut = time.time()
     
     nombres_testes = 0
@@ -127,40 +103,35 @@ def verifier_fermeture_k5_exhaustif():
     
     checkpoint_interval = 10000  # Sauvegarde intermédiaire tous les 10k
     
-    for n in range(10000, 100000):
+    for n in range(premier, fin):
         nombres_testes += 1
         
-        porte_n = calculer_porte(n)
+        code_n = table_haut[n // diviseur] + table_bas[n % diviseur]
         
-        if porte_n in S_k5:
+        if code_n in bitmap_S5:
             nombres_dans_S5 += 1
             
             T_n = reverse_and_add(n)
-            porte_T_n = calculer_porte(T_n)
+            k_image = len(str(T_n))
+            code_T_n = code_porte_nombre(T_n, k_image)
             
-            if porte_T_n not in S_toutes:
+            if k_image not in bitmaps_S or code_T_n not in bitmaps_S[k_image]:
                 fermeture_violee.append({
                     'n': n,
-                    'porte_n': porte_n,
+                    'porte_n': decoder_porte_S(code_n, 5),
                     'T_n': T_n,
-                    'porte_T_n': porte_T_n
+                    'porte_T_n': decoder_porte_S(code_T_n, k_image)
                 })
             
-            k_image = len(porte_T_n)
             distributions_k_images[k_image] = distributions_k_images.get(k_image, 0) + 1
         
-        # Affichage progression
-        if (n - 10000 + 1) % checkpoint_interval == 0:
-            pct = 100 * (n - 10000 + 1) / 90000
-            temps_ecoule = time.time() - debut
-            vitesse = (n - 10000 + 1) / temps_ecoule  # nombres/sec
-            temps_restant = (90000 - (n - 10000 + 1)) / vitesse
-            
-            print(f"  Progression: {n - 10000 + 1}/90000 ({pct:.1f}%) - "
-                  f"Vitesse: {vitesse:.0f} nb/s - "
-                  f"Temps restant: ~{temps_restant/60:.0f} min")
+        # Affichage progression (débit, ETA, RSS : événement de télémétrie)
+        if (n - premier + 1) % checkpoint_interval == 0:
+            telemetrie.progression(nombres_testes, nombres_dans_S5, forcer=True)
     
     duree = time.time() - debut
+    telemetrie.ajouter_duree("scan", duree)
+    telemetrie.compter("violations", len(fermeture_violee))
     
     # Résultats
     print()
@@ -196,7 +167,7 @@ def verifier_fermeture_k5_exhaustif():
     resultats = {
         'dimension_testee': 5,
         'methode': 'exhaustive',
-        'intervalle': [10000, 99999],
+        'intervalle': [premier, fin - 1],
         'nombres_testes': nombres_testes,
         'nombres_dans_S5': nombres_dans_S5,
         'fermeture_verifiee': fermeture_ok,
@@ -204,6 +175,7 @@ def verifier_fermeture_k5_exhaustif():
         'exemples_violations': fermeture_violee[:10] if fermeture_violee else [],
         'distribution_k_images': distributions_k_images,
         'duree_secondes': duree,
+        'memoire': telemetrie.memoire(),
         'timestamp': datetime.now().isoformat(),
         'portes_S5': list(S_k5),
         'nombre_portes_S5': len(S_k5),
@@ -211,8 +183,9 @@ def verifier_fermeture_k5_exhaustif():
     }
     
     fichier_sortie = f"verification_exhaustive_k5_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(fichier_sortie, 'w', encoding='utf-8') as f:
-        json.dump(resultats, f, indent=2, ensure_ascii=False)
+    with telemetrie.phase("ecriture_resultats"):
+        with open(fichier_sortie, 'w', encoding='utf-8') as f:
+            json.dump(resultats, f, indent=2, ensure_ascii=False)
     
     print(f"💾 Résultats sauvegardés : {fichier_sortie}")
     print()
@@ -221,13 +194,26 @@ def verifier_fermeture_k5_exhaustif():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vérification exhaustive de la fermeture pour k=5")
+    ajouter_options_profil(parser, taille_defaut=90_000)
+    args = parser.parse_args()
+    if args.profile:
+        premier, fin = tranche_profil(args, 5)
+        print(f"🔬 Profilage de la tranche [{premier:,}, {fin:,}) dans ce processus")
+        profiler_tranche(args, verifier_fermeture_k5_exhaustif, prefixe=Path("profil_k5"),
+                         nombres=fin - premier, tranche=(premier, fin))
+        sys.exit(0)
+
     print("⚠️  AVERTISSEMENT : Calcul long (~1-2 heures)")
     print()
     
     reponse = input("Voulez-vous continuer ? (oui/non) : ").strip().lower()
     
     if reponse in ['oui', 'o', 'y', 'yes']:
-        resultats = verifier_fermeture_k5_exhaustif()
+        fichier_telemetrie = f"telemetrie_k5_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        with Telemetrie(fichier_telemetrie, contexte={"script": "verifier_fermeture_k5_exhaustif", "k": 5}) as telemetrie:
+            resultats = verifier_fermeture_k5_exhaustif(telemetrie)
+        print(f"📈 Télémétrie : {fichier_telemetrie}")
         
         print("="*70)
         print("✅ VÉRIFICATION k=5 TERMINÉE")
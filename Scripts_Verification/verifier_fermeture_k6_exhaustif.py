@@ -13,9 +13,18 @@ Objectif : Prouver exhaustivement que image(S₆) ⊆ S
 Date: 10 octobre 2025, 20h50
 """
 
+import argparse
 import json
+import sys
 import time
 from datetime import datetime
+from pathlib import Path
+
+from cache_portes import cache_ensemble_S
+from codec_portes import code_porte_nombre, decoder_porte_S
+from noyau_portes import tables_porte
+from profilage import ajouter_options_profil, profiler_tranche, tranche_profil
+from telemetrie import Telemetrie
 
 
 def reverse_number(n: int) -> int:
@@ -42,60 +51,19 @@ def calculer_porte(n: int) -> tuple:
     return tuple(sommes)
 
 
-def charger_ensemble_S(fichier_json: str = "Scripts/ensemble_S_ferme.json") -> dict:
-    """Charge l'ensemble S depuis JSON."""
-    with open(fichier_json, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return data
-
-
-def extraire_portes_par_k(S_data: dict, k: int) -> set:
-    """Extrait toutes les portes de dimension k. Reconstruit portes symétriques."""
-    portes = set()
-    
-    k_str = str(k)
-    if k_str in S_data['ensemble_S']['portes_par_longueur']:
-        for porte_half in S_data['ensemble_S']['portes_par_longueur'][k_str]:
-            if k % 2 == 1:
-                milieu = porte_half[-1]
-                debut = porte_half[:-1]
-                porte_complete = debut + [milieu] + list(reversed(debut))
-            else:
-                porte_complete = porte_half + list(reversed(porte_half))
-            
-            porte_tuple = tuple(porte_complete)
-            portes.add(porte_tuple)
-    
-    return portes
-
-
-def extraire_toutes_portes_S(S_data: dict) -> set:
-    """Extrait TOUTES les portes de S (tous k). Reconstruit portes symétriques."""
-    toutes_portes = set()
-    
-    for k_str, portes_list in S_data['ensemble_S']['portes_par_longueur'].items():
-        k = int(k_str)
-        for porte_half in portes_list:
-            if k % 2 == 1:
-                milieu = porte_half[-1]
-                debut = porte_half[:-1]
-                porte_complete = debut + [milieu] + list(reversed(debut))
-            else:
-                porte_complete = porte_half + list(reversed(porte_half))
-            
-            porte_tuple = tuple(porte_complete)
-            toutes_portes.add(porte_tuple)
-    
-    return toutes_portes
-
-
-def verifier_fermeture_k6_exhaustif():
+def verifier_fermeture_k6_exhaustif(telemetrie: Telemetrie = None, tranche: tuple = None):
     """
     Vérifie EXHAUSTIVEMENT la fermeture pour k=6.
     Teste TOUS les 900,000 nombres (100000-999999).
     
+    telemetrie : progression, ETA et phases (défaut : console seule)
+    tranche : (premier, fin) à scanner (défaut : tous les nombres à 6 chiffres)
+    
     Prédiction Claude : ~2.4s à 380k nombres/sec
     """
+    if telemetrie is None:
+        telemetrie = Telemetrie(intervalle=0.0)
+    premier, fin = tranche or (100000, 1000000)
     print("="*70)
     print("VÉRIFICATION EXHAUSTIVE - FERMETURE k=6")
     print("="*70)
@@ -103,21 +71,29 @@ def verifier_fermeture_k6_exhaustif():
     
     # Charger S
     print("📂 Chargement ensemble S...")
-    S_data = charger_ensemble_S()
+    # Portes déjà reconstruites (cache_portes) : le JSON n'est reparsé que s'il a changé
+    with telemetrie.phase("chargement_portes"):
+        cache_S = cache_ensemble_S("Scripts/ensemble_S_ferme.json")
     
-    S_k6 = extraire_portes_par_k(S_data, k=6)
-    S_toutes = extraire_toutes_portes_S(S_data)
+    S_k6 = cache_S.portes_S_completes(6)
+    S_toutes = cache_S.toutes_portes_S_completes()
+    bitmap_S6 = cache_S.ensembles[6]
+    bitmaps_S = cache_S.ensembles
     
     print(f"✅ Portes S₆ (k=6) : {len(S_k6)} portes")
     print(f"✅ Portes S (tous k) : {len(S_toutes)} portes")
     print()
     
     # Vérification exhaustive
-    print("🔍 Vérification exhaustive [100000, 999999]...")
+    print(f"🔍 Vérification exhaustive [{premier}, {fin - 1}]...")
     print("⏳ ATTENTION : ~900,000 nombres")
     print("🎯 Prédiction Claude : ~2.4s à 380k nombres/sec")
     print()
     
+    # Tables demi-nombres : code(n) = TABLE_HAUT[haut] + TABLE_BAS[bas]
+    table_haut, table_bas, diviseur = tables_porte(6)
+    
+    telemetrie.demarrer_progression(fin - premier)
     debut = time.time()
     
     nombres_testes = 0
@@ -127,40 +103,35 @@ def verifier_fermeture_k6_exhaustif():
     
     checkpoint_interval = 100000  # Affichage tous les 100k
     
-    for n in range(100000, 1000000):
+    for n in range(premier, fin):
         nombres_testes += 1
         
-        porte_n = calculer_porte(n)
+        code_n = table_haut[n // diviseur] + table_bas[n % diviseur]
         
-        if porte_n in S_k6:
+        if code_n in bitmap_S6:
             nombres_dans_S6 += 1
             
             T_n = reverse_and_add(n)
-            porte_T_n = calculer_porte(T_n)
+            k_image = len(str(T_n))
+            code_T_n = code_porte_nombre(T_n, k_image)
             
-            if porte_T_n not in S_toutes:
+            if k_image not in bitmaps_S or code_T_n not in bitmaps_S[k_image]:
                 fermeture_violee.append({
                     'n': n,
-                    'porte_n': porte_n,
+                    'porte_n': decoder_porte_S(code_n, 6),
                     'T_n': T_n,
-                    'porte_T_n': porte_T_n
+                    'porte_T_n': decoder_porte_S(code_T_n, k_image)
                 })
             
-            k_image = len(porte_T_n)
             distributions_k_images[k_image] = distributions_k_images.get(k_image, 0) + 1
         
-        # Affichage progression
-        if (n - 100000 + 1) % checkpoint_interval == 0:
-            pct = 100 * (n - 100000 + 1) / 900000
-            temps_ecoule = time.time() - debut
-            vitesse = (n - 100000 + 1) / temps_ecoule  # nombres/sec
-            temps_restant = (900000 - (n - 100000 + 1)) / vitesse
-            
-            print(f"  Progression: {n - 100000 + 1}/900000 ({pct:.1f}%) - "
-                  f"Vitesse: {vitesse:.0f} nb/s - "
-                  f"Temps restant: ~{temps_restant:.0f}s")
+        # Affichage progression (débit, ETA, RSS : événement de télémétrie)
+        if (n - premier + 1) % checkpoint_interval == 0:
+            telemetrie.progression(nombres_testes, nombres_dans_S6, forcer=True)
     
     duree = time.time() - debut
+    telemetrie.ajouter_duree("scan", duree)
+    telemetrie.compter("violations", len(fermeture_violee))
     vitesse_moyenne = nombres_testes / duree
     
     # Résultats
@@ -220,7 +191,7 @@ def verifier_fermeture_k6_exhaustif():
     resultats = {
         'dimension_testee': 6,
         'methode': 'exhaustive',
-        'intervalle': [100000, 999999],
+        'intervalle': [premier, fin - 1],
         'nombres_testes': nombres_testes,
         'nombres_dans_S6': nombres_dans_S6,
         'fermeture_verifiee': fermeture_ok,
@@ -228,6 +199,7 @@ def verifier_fermeture_k6_exhaustif():
         'exemples_violations': fermeture_violee[:10] if fermeture_violee else [],
         'distribution_k_images': distributions_k_images,
         'duree_secondes': duree,
+        'memoire': telemetrie.memoire(),
         'vitesse_moyenne_nb_sec': vitesse_moyenne,
         'prediction_claude_sec': prediction_claude,
         'timestamp': datetime.now().isoformat(),
@@ -237,8 +209,9 @@ def verifier_fermeture_k6_exhaustif():
     }
     
     fichier_sortie = f"verification_exhaustive_k6_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(fichier_sortie, 'w', encoding='utf-8') as f:
-        json.dump(resultats, f, indent=2, ensure_ascii=False)
+    with telemetrie.phase("ecriture_resultats"):
+        with open(fichier_sortie, 'w', encoding='utf-8') as f:
+            json.dump(resultats, f, indent=2, ensure_ascii=False)
     
     print(f"💾 Résultats sauvegardés : {fichier_sortie}")
     print()
@@ -247,12 +220,25 @@ def verifier_fermeture_k6_exhaustif():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vérification exhaustive de la fermeture pour k=6")
+    ajouter_options_profil(parser, taille_defaut=900_000)
+    args = parser.parse_args()
+    if args.profile:
+        premier, fin = tranche_profil(args, 6)
+        print(f"🔬 Profilage de la tranche [{premier:,}, {fin:,}) dans ce processus")
+        profiler_tranche(args, verifier_fermeture_k6_exhaustif, prefixe=Path("profil_k6"),
+                         nombres=fin - premier, tranche=(premier, fin))
+        sys.exit(0)
+
     print("🎯 Suite à l'enthousiasme de Claude pour k=3,4,5 !")
     print()
     print("Claude dit : 'LANCER k=6 MAINTENANT (très important !)'")
     print()
     
-    resultats = verifier_fermeture_k6_exhaustif()
+    fichier_telemetrie = f"telemetrie_k6_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    with Telemetrie(fichier_telemetrie, contexte={"script": "verifier_fermeture_k6_exhaustif", "k": 6}) as telemetrie:
+        resultats = verifier_fermeture_k6_exhaustif(telemetrie)
+    print(f"📈 Télémétrie : {fichier_telemetrie}")
     
     print("="*70)
     print("✅ VÉRIFICATION k=6 TERMINÉE")
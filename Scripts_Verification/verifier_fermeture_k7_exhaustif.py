@@ -13,15 +13,21 @@ APPROCHE CORRECTE :
 Date : 10 octobre 2025, 21h45
 """
 
+import argparse
 import json
+import sys
 import time
 from pathlib import Path
 from datetime import datetime
 
+from codec_portes import BitmapPortes, code_porte_nombre, decoder_porte, encoder_porte
+from noyau_portes import tables_porte
+from profilage import ajouter_options_profil, profiler_tranche, tranche_profil
+from telemetrie import Telemetrie
+
 def charger_toutes_portes():
-    """Charge toutes les portes K3-K8 correctement"""
-    toutes_portes = set()
-    portes_par_k = {}
+    """Charge toutes les portes K3-K8 correctement (un bitmap de codes par k)"""
+    bitmaps_par_k = {}
     
     base_dir = Path(r"F:/Dossier_Lychrel_Important/Dossier_Complet/Listes_Portes")
     for k in range(3, 9):
@@ -34,27 +40,18 @@ def charger_toutes_portes():
             data = json.load(f)
         
         portes_list = data.get("portes", [])
-        portes_k = set()
+        bitmap_k = BitmapPortes(k)
         
         # Format différent pour K8
-        if k == 8:
-            for entry in portes_list:
-                if isinstance(entry, dict):
-                    porte_tuple = tuple(entry["porte"])
-                else:
-                    porte_tuple = tuple(entry)
-                portes_k.add(porte_tuple)
-                toutes_portes.add(porte_tuple)
-        else:
-            for p in portes_list:
-                porte_tuple = tuple(p)
-                portes_k.add(porte_tuple)
-                toutes_portes.add(porte_tuple)
+        for entry in portes_list:
+            if isinstance(entry, dict):
+                entry = entry["porte"]
+            bitmap_k.ajouter(encoder_porte(entry, k))
         
-        portes_par_k[k] = portes_k
-        print(f"   k={k}: {len(portes_k):,} portes")
+        bitmaps_par_k[k] = bitmap_k
+        print(f"   k={k}: {len(bitmap_k):,} portes")
     
-    return toutes_portes, portes_par_k
+    return bitmaps_par_k
 
 def calculer_porte_k7(n):
     """Calcule la porte pour k=7 : (A+G, B+F, C+E, D)"""
@@ -89,12 +86,17 @@ def reverse_add(n):
     """T(n) = n + reverse(n)"""
     return n + int(str(n)[::-1])
 
-def verifier_fermeture_k7_correct():
+def verifier_fermeture_k7_correct(telemetrie: Telemetrie = None, tranche: tuple = None):
     """
     🌟 VÉRIFICATION k=7 CORRECTE 🌟
     
     Teste SEULEMENT les nombres avec porte ∈ K7
+    telemetrie : progression, ETA et phases (défaut : console seule)
+    tranche : (premier, fin) à scanner (défaut : tous les nombres à 7 chiffres)
     """
+    if telemetrie is None:
+        telemetrie = Telemetrie(intervalle=0.0)
+    premier, fin = tranche or (1_000_000, 10_000_000)
     print("\n" + "="*70)
     print("🌟🌟🌟 VÉRIFICATION k=7 CORRECTE - Seulement Lychrel ! 🌟🌟🌟")
     print("="*70 + "\n")
@@ -106,17 +108,22 @@ def verifier_fermeture_k7_correct():
     
     # Charger les portes
     print("📂 Chargement des portes...")
-    toutes_portes, portes_par_k = charger_toutes_portes()
+    with telemetrie.phase("chargement_portes"):
+        bitmaps_par_k = charger_toutes_portes()
     
-    portes_k7 = portes_par_k[7]
-    print(f"\n✅ Total portes dans S : {len(toutes_portes):,}")
-    print(f"✅ Portes K7 (candidats Lychrel) : {len(portes_k7):,}\n")
+    bitmap_k7 = bitmaps_par_k[7]
+    print(f"\n✅ Total portes dans S : {sum(len(b) for b in bitmaps_par_k.values()):,}")
+    print(f"✅ Portes K7 (candidats Lychrel) : {len(bitmap_k7):,}\n")
     
     # Vérification
     print("🚀 DÉBUT VÉRIFICATION CORRECTE k=7")
     print(f"📊 Nombres à tester : 9,000,000 (mais seulement ceux avec porte ∈ K7)")
     print(f"⏱️  Estimation : ~30-40 secondes\n")
     
+    # Tables demi-nombres : code(n) = TABLE_HAUT[haut] + TABLE_BAS[bas]
+    table_haut, table_bas, diviseur = tables_porte(7)
+    
+    telemetrie.demarrer_progression(fin - premier)
     debut = time.time()
     
     nombres_testes = 0
@@ -131,49 +138,43 @@ def verifier_fermeture_k7_correct():
     prochain_affichage = intervalle
     
     # Tester tous les nombres de 7 chiffres
-    for n in range(1_000_000, 10_000_000):
+    for n in range(premier, fin):
         nombres_testes += 1
         
-        # Progression
+        # Progression (débit, ETA, RSS : événement de télémétrie)
         if nombres_testes >= prochain_affichage:
-            temps_ecoule = time.time() - debut
-            vitesse = nombres_testes / temps_ecoule if temps_ecoule > 0 else 0
-            pourcentage = (nombres_testes / 9_000_000) * 100
-            temps_restant = (9_000_000 - nombres_testes) / vitesse if vitesse > 0 else 0
-            
-            print(f"   ⏳ {nombres_testes:,} testés ({pourcentage:.1f}%) - "
-                  f"{vitesse:,.0f} nb/s - "
-                  f"ETA: {temps_restant:.0f}s - "
-                  f"Candidats K7: {candidats_lychrel_k7:,}")
-            
+            telemetrie.progression(nombres_testes, candidats_lychrel_k7, forcer=True)
             prochain_affichage += intervalle
         
         # Calculer porte de n
-        porte_n = calculer_porte_k7(n)
+        code_n = table_haut[n // diviseur] + table_bas[n % diviseur]
         
         # SEULEMENT si porte ∈ K7 (candidat Lychrel)
-        if porte_n in portes_k7:
+        if code_n in bitmap_k7:
             candidats_lychrel_k7 += 1
             
             # Calculer image
             image_n = reverse_add(n)
-            porte_image = calculer_porte_generale(image_n)
+            k_image = len(str(image_n))
+            code_image = code_porte_nombre(image_n, k_image)
             
-            # Vérifier si image ∈ S
-            if porte_image not in toutes_portes:
+            # Vérifier si image ∈ S (dans K_k de sa propre dimension)
+            if k_image not in bitmaps_par_k or code_image not in bitmaps_par_k[k_image]:
                 violations.append({
                     "n": n,
-                    "porte_n": list(porte_n) if porte_n is not None else [],
+                    "porte_n": list(decoder_porte(code_n, 7)),
                     "image": image_n,
-                    "k_image": len(str(image_n)),
-                    "porte_image": list(porte_image)
+                    "k_image": k_image,
+                    "porte_image": list(decoder_porte(code_image, k_image))
                 })
             else:
                 # Statistique : dimension de l'image
-                dim_porte_image = len(porte_image)
+                dim_porte_image = (k_image + 1) // 2
                 distribution_images[dim_porte_image] = distribution_images.get(dim_porte_image, 0) + 1
     
     duree = time.time() - debut
+    telemetrie.ajouter_duree("scan", duree)
+    telemetrie.compter("violations", len(violations))
     vitesse_finale = nombres_testes / duree
     
     # RÉSULTATS
@@ -217,8 +218,9 @@ def verifier_fermeture_k7_correct():
         "dimension": 7,
         "nombres_testes": nombres_testes,
         "candidats_lychrel": candidats_lychrel_k7,
-        "intervalle": [1_000_000, 9_999_999],
+        "intervalle": [premier, fin - 1],
         "duree_secondes": duree,
+        "memoire": telemetrie.memoire(),
         "vitesse_nombres_par_sec": vitesse_finale,
         "fermeture_verifiee": fermeture,
         "violations_count": len(violations),
@@ -228,8 +230,9 @@ def verifier_fermeture_k7_correct():
     }
     
     fichier_resultats = f"verification_k7_CORRECT_{timestamp}.json"
-    with open(fichier_resultats, 'w', encoding='utf-8') as f:
-        json.dump(resultats, f, indent=2, ensure_ascii=False)
+    with telemetrie.phase("ecriture_resultats"):
+        with open(fichier_resultats, 'w', encoding='utf-8') as f:
+            json.dump(resultats, f, indent=2, ensure_ascii=False)
     
     print(f"💾 Résultats sauvegardés : {fichier_resultats}\n")
     
@@ -258,8 +261,21 @@ def verifier_fermeture_k7_correct():
     return fermeture, resultats
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fermeture des candidats K7")
+    ajouter_options_profil(parser, taille_defaut=1_000_000)
+    args = parser.parse_args()
+    if args.profile:
+        premier, fin = tranche_profil(args, 7)
+        print(f"🔬 Profilage de la tranche [{premier:,}, {fin:,}) dans ce processus")
+        profiler_tranche(args, verifier_fermeture_k7_correct, prefixe=Path("profil_k7"),
+                         nombres=fin - premier, tranche=(premier, fin))
+        sys.exit(0)
+
     try:
-        succes, resultats = verifier_fermeture_k7_correct()
+        fichier_telemetrie = f"telemetrie_k7_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        with Telemetrie(fichier_telemetrie, contexte={"script": "verifier_fermeture_k7_exhaustif", "k": 7}) as telemetrie:
+            succes, resultats = verifier_fermeture_k7_correct(telemetrie)
+        print(f"📈 Télémétrie : {fichier_telemetrie}")
         
         if succes:
             print("\n✅ Script terminé avec succès !")
@@ -18,15 +18,22 @@ Prédiction Claude : ~90 secondes à 360k nb/s
 Date : 10 octobre 2025, 22h00
 """
 
+import argparse
 import json
+import sys
 import time
 from pathlib import Path
 from datetime import datetime
 
+from codec_portes import BitmapPortes, code_porte_nombre, decoder_porte, encoder_porte
+from noyau_portes import tables_porte
+from profilage import ajouter_options_profil, profiler_tranche, tranche_profil
+from telemetrie import Telemetrie
+
+
 def charger_toutes_portes():
-    """Charge TOUTES les portes en gérant les deux formats"""
-    toutes_portes = set()
-    portes_par_k = {}
+    """Charge TOUTES les portes en gérant les deux formats (un bitmap de codes par k)"""
+    bitmaps_par_k = {}
     
     base_dir = Path(r"F:/Dossier_Lychrel_Important/Dossier_Complet/Listes_Portes")
     for k in range(3, 9):
@@ -39,30 +46,20 @@ def charger_toutes_portes():
             data = json.load(f)
         
         portes_list = data.get("portes", [])
+        bitmap_k = BitmapPortes(k)
         
         # Format différent pour K8
-        if k == 8:
-            portes_k = set()
-            for entry in portes_list:
-                if isinstance(entry, dict):
-                    porte = tuple(entry["porte"])
-                    portes_k.add(porte)
-                    toutes_portes.add(porte)
-                else:
-                    porte = tuple(entry)
-                    portes_k.add(porte)
-                    toutes_portes.add(porte)
-            portes_par_k[k] = portes_k
-        else:
-            portes_k = set(tuple(p) for p in portes_list)
-            portes_par_k[k] = portes_k
-            toutes_portes.update(portes_k)
+        for entry in portes_list:
+            if isinstance(entry, dict):
+                entry = entry["porte"]
+            bitmap_k.ajouter(encoder_porte(entry, k))
+        bitmaps_par_k[k] = bitmap_k
     
-    print(f"✅ Chargé {len(toutes_portes):,} portes uniques")
-    for k in sorted(portes_par_k.keys()):
-        print(f"   k={k}: {len(portes_par_k[k]):,} portes")
+    print(f"✅ Chargé {sum(len(b) for b in bitmaps_par_k.values()):,} portes uniques")
+    for k in sorted(bitmaps_par_k.keys()):
+        print(f"   k={k}: {len(bitmaps_par_k[k]):,} portes")
     
-    return toutes_portes, portes_par_k
+    return bitmaps_par_k
 
 def calculer_porte_k8(n):
     """Calcule la porte K8 : (A+H, B+G, C+F, D+E)"""
@@ -101,12 +98,17 @@ def reverse_add(n):
     """Applique T(n) = n + reverse(n)"""
     return n + int(str(n)[::-1])
 
-def verifier_fermeture_k8():
+def verifier_fermeture_k8(telemetrie: Telemetrie = None, tranche: tuple = None):
     """
     🌟 VÉRIFICATION k=8 : CANDIDATS LYCHREL 🌟
     
     Teste TOUS les candidats Lychrel de k=8
+    telemetrie : progression, ETA et phases (défaut : console seule)
+    tranche : (premier, fin) à scanner (défaut : tous les nombres à 8 chiffres)
     """
+    if telemetrie is None:
+        telemetrie = Telemetrie(intervalle=0.0)
+    premier, fin = tranche or (10_000_000, 100_000_000)
     print("\n" + "="*70)
     print("🌟🌟🌟 VÉRIFICATION k=8 - SIXIÈME DIMENSION ! 🌟🌟🌟")
     print("="*70 + "\n")
@@ -117,11 +119,12 @@ def verifier_fermeture_k8():
     
     # Charger toutes les portes
     print("📂 Chargement des portes...")
-    toutes_portes, portes_par_k = charger_toutes_portes()
+    with telemetrie.phase("chargement_portes"):
+        bitmaps_par_k = charger_toutes_portes()
     print()
     
-    portes_k8 = portes_par_k[8]
-    print(f"✅ K8 contient {len(portes_k8):,} portes\n")
+    bitmap_k8 = bitmaps_par_k[8]
+    print(f"✅ K8 contient {len(bitmap_k8):,} portes\n")
     
     # Vérification
     print("🚀 DÉBUT VÉRIFICATION k=8")
@@ -129,6 +132,10 @@ def verifier_fermeture_k8():
     print(f"📊 Tester uniquement les nombres avec porte ∈ K8")
     print(f"⏱️  Prédiction Claude : ~90 secondes\n")
     
+    # Tables demi-nombres : code(n) = TABLE_HAUT[haut] + TABLE_BAS[bas]
+    table_haut, table_bas, diviseur = tables_porte(8)
+    
+    telemetrie.demarrer_progression(fin - premier)
     debut = time.time()
     
     nombres_scannes = 0
@@ -139,42 +146,39 @@ def verifier_fermeture_k8():
     intervalle = 5_000_000  # Toutes les 5M
     prochain_affichage = intervalle
     # Scanner tous les nombres de 8 chiffres
-    for n in range(10_000_000, 100_000_000):
+    for n in range(premier, fin):
         nombres_scannes += 1
-        # Progression
+        # Progression (débit, ETA, RSS : événement de télémétrie)
         if nombres_scannes >= prochain_affichage:
-            temps_ecoule = time.time() - debut
-            vitesse = nombres_scannes / temps_ecoule if temps_ecoule > 0 else 0
-            pourcentage = (nombres_scannes / 90_000_000) * 100
-            temps_restant = (90_000_000 - nombres_scannes) / vitesse if vitesse > 0 else 0
-            print(f"   ⏳ {nombres_scannes:,} scannés ({pourcentage:.1f}%) - "
-                  f"{vitesse:,.0f} nb/s - "
-                  f"ETA: {temps_restant:.0f}s - "
-                  f"Candidats K8: {candidats_testes:,} - Portes k=9: {len(portes_k9_observees):,}")
+            telemetrie.progression(nombres_scannes, candidats_testes, forcer=True,
+                                   portes_k9=len(portes_k9_observees))
             prochain_affichage += intervalle
         # Calculer porte de n
-        porte_n = calculer_porte_k8(n)
+        code_n = table_haut[n // diviseur] + table_bas[n % diviseur]
         # Vérifier si c'est un candidat Lychrel K8
-        if porte_n in portes_k8:
+        if code_n in bitmap_k8:
             candidats_testes += 1
             # Calculer image
             image_n = reverse_add(n)
-            porte_image = calculer_porte_generale(image_n)
-            dim_image = len(porte_image)
+            k_image = len(str(image_n))
+            code_image = code_porte_nombre(image_n, k_image)
+            dim_image = (k_image + 1) // 2
             distribution_images[dim_image] = distribution_images.get(dim_image, 0) + 1
-            # Vérifier si image ∈ S
-            if porte_image not in toutes_portes:
-                if dim_image == 5:
-                    portes_k9_observees.add(tuple(porte_image))
+            # Vérifier si image ∈ S (dans K_k de sa propre dimension)
+            if k_image not in bitmaps_par_k or code_image not in bitmaps_par_k[k_image]:
+                if k_image == 9:
+                    portes_k9_observees.add(code_image)
                 else:
                     violations.append({
                         "n": n,
-                        "porte_n": list(porte_n) if porte_n is not None else [],
+                        "porte_n": list(decoder_porte(code_n, 8)),
                         "image": image_n,
-                        "porte_image": list(porte_image)
+                        "porte_image": list(decoder_porte(code_image, k_image))
                     })
     
     duree = time.time() - debut
+    telemetrie.ajouter_duree("scan", duree)
+    telemetrie.compter("violations", len(violations))
     vitesse_scan = nombres_scannes / duree
     vitesse_test = candidats_testes / duree
     
@@ -245,8 +249,9 @@ def verifier_fermeture_k8():
         "dimension": 8,
         "nombres_scannes": nombres_scannes,
         "candidats_testes": candidats_testes,
-        "intervalle": [10_000_000, 99_999_999],
+        "intervalle": [premier, fin - 1],
         "duree_secondes": duree,
+        "memoire": telemetrie.memoire(),
         "vitesse_scan_par_sec": vitesse_scan,
         "vitesse_test_par_sec": vitesse_test,
         "prediction_claude_sec": prediction_claude,
@@ -254,16 +259,17 @@ def verifier_fermeture_k8():
         "violations_count": len(violations),
         "violations": violations[:100] if violations else [],
         "distribution_images": distribution_images,
-        "portes_k9_observees": [list(p) for p in sorted(portes_k9_observees)],
+        "portes_k9_observees": [list(decoder_porte(c, 9)) for c in sorted(portes_k9_observees)],
         "portes_k9_count": len(portes_k9_observees),
         "timestamp": timestamp
     }
     fichier_resultats = f"verification_k8_candidats_{timestamp}.json"
-    with open(fichier_resultats, 'w', encoding='utf-8') as f:
-        json.dump(resultats, f, indent=2, ensure_ascii=False)
-    # Sauvegarde séparée des portes k=9
-    with open(f"portes_k9_observees_{timestamp}.json", 'w', encoding='utf-8') as f:
-        json.dump([list(p) for p in sorted(portes_k9_observees)], f, indent=2, ensure_ascii=False)
+    with telemetrie.phase("ecriture_resultats"):
+        with open(fichier_resultats, 'w', encoding='utf-8') as f:
+            json.dump(resultats, f, indent=2, ensure_ascii=False)
+        # Sauvegarde séparée des portes k=9
+        with open(f"portes_k9_observees_{timestamp}.json", 'w', encoding='utf-8') as f:
+            json.dump([list(decoder_porte(c, 9)) for c in sorted(portes_k9_observees)], f, indent=2, ensure_ascii=False)
     print(f"💾 Résultats sauvegardés : {fichier_resultats}")
     print(f"💾 Portes k=9 sauvegardées : portes_k9_observees_{timestamp}.json\n")
     
@@ -294,8 +300,21 @@ def verifier_fermeture_k8():
     return fermeture, resultats
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fermeture des candidats K8")
+    ajouter_options_profil(parser, taille_defaut=1_000_000)
+    args = parser.parse_args()
+    if args.profile:
+        premier, fin = tranche_profil(args, 8)
+        print(f"🔬 Profilage de la tranche [{premier:,}, {fin:,}) dans ce processus")
+        profiler_tranche(args, verifier_fermeture_k8, prefixe=Path("profil_k8"),
+                         nombres=fin - premier, tranche=(premier, fin))
+        sys.exit(0)
+
     try:
-        succes, resultats = verifier_fermeture_k8()
+        fichier_telemetrie = f"telemetrie_k8_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        with Telemetrie(fichier_telemetrie, contexte={"script": "verifier_fermeture_k8_exhaustif", "k": 8}) as telemetrie:
+            succes, resultats = verifier_fermeture_k8(telemetrie)
+        print(f"📈 Télémétrie : {fichier_telemetrie}")
         
         if succes:
             print("\n✅ Script terminé avec succès !")
@@ -12,10 +12,16 @@ Auteur: Stéphane Lefebvre
 Date: Octobre 2025
 """
 
+import argparse
 import json
+import time
 from typing import Tuple, List, Dict, Set
 from pathlib import Path
 
+from codec_portes import BitmapPortes, encoder_porte
+from profilage import ajouter_options_profil, profiler_tranche
+from telemetrie import Telemetrie
+
 # ============================================================================
 # FONCTIONS UTILITAIRES
 # ============================================================================
@@ -46,25 +52,35 @@ def est_palindrome(n: int) -> bool:
 # ============================================================================
 
 def verifier_palindromes_dans_k9(chemin_k9: str, 
-                                 chemin_palindromes: str) -> Dict:
+                                 chemin_palindromes: str,
+                                 telemetrie: Telemetrie = None,
+                                 tranche: Tuple[int, int] = None) -> Dict:
     """
     Vérifie si les palindromes trouvés sont dans les portes K9 réelles
+    telemetrie : durée et mémoire (RSS) par phase (défaut : console seule)
+    tranche : (premier, fin) en rang dans la liste des palindromes (défaut : tous)
     """
+    if telemetrie is None:
+        telemetrie = Telemetrie(intervalle=0.0)
     print("\n" + "="*70)
     print("🔬 VÉRIFICATION FINALE : PALINDROMES DANS LA SÉQUENCE DE 196 ?")
     print("="*70 + "\n")
     
     # Charger K9
     print("Chargement de K9_portes.json...")
-    with open(chemin_k9, 'r', encoding='utf-8') as f:
-        k9 = json.load(f)
-    
-    # Convertir les portes en set pour recherche rapide
-    portes_k9_set = set()
-    for porte_list in k9['portes']:
-        portes_k9_set.add(tuple(porte_list))
+    with telemetrie.phase("chargement_k9"):
+        with open(chemin_k9, 'r', encoding='utf-8') as f:
+            k9 = json.load(f)
+        
+        # Convertir les portes en bitmap de codes pour recherche rapide
+        bitmap_k9 = BitmapPortes(9)
+        for porte_list in k9['portes']:
+            if isinstance(porte_list, dict):
+                porte_list = porte_list['porte']
+            bitmap_k9.ajouter(encoder_porte(porte_list, 9))
+        del k9
     
-    print(f"  ✓ {len(portes_k9_set):,} portes uniques chargées\n")
+    print(f"  ✓ {len(bitmap_k9):,} portes uniques chargées ({bitmap_k9.nbytes:,} octets)\n")
     
     # Charger les palindromes
     print("Chargement des palindromes trouvés...")
@@ -72,6 +88,8 @@ def verifier_palindromes_dans_k9(chemin_k9: str,
         resultats_pal = json.load(f)
     
     palindromes = resultats_pal['palindromes']
+    if tranche is not None:
+        palindromes = palindromes[tranche[0]:tranche[1]]
     print(f"  ✓ {len(palindromes)} palindromes à vérifier\n")
     
     # Vérification
@@ -86,6 +104,7 @@ def verifier_palindromes_dans_k9(chemin_k9: str,
         'erreurs': []
     }
     
+    debut = time.perf_counter()
     for i, pal_info in enumerate(palindromes, 1):
         palindrome = pal_info['nombre']
         porte_declaree = tuple(pal_info['porte'])
@@ -110,7 +129,7 @@ def verifier_palindromes_dans_k9(chemin_k9: str,
             continue
         
         # Vérifier si dans K9
-        if porte_calculee in portes_k9_set:
+        if bitmap_k9.contient_porte(porte_calculee):
             resultats['dans_k9'].append({
                 'palindrome': palindrome,
                 'porte': porte_calculee
@@ -127,6 +146,7 @@ def verifier_palindromes_dans_k9(chemin_k9: str,
         if i % 50 == 0:
             print(f"  Vérifié {i}/{len(palindromes)} palindromes...")
     
+    telemetrie.ajouter_duree("verification", time.perf_counter() - debut)
     print(f"\n  ✓ Vérification terminée !\n")
     
     return resultats
@@ -269,6 +289,9 @@ def analyser_distribution_palindromes(resultats: Dict):
 
 def main():
     """Programme principal"""
+    parser = argparse.ArgumentParser(description="Palindromes dans les portes K9 de la séquence de 196")
+    ajouter_options_profil(parser, taille_defaut=260, aide_debut="rang du premier palindrome (défaut : 0)")
+    args = parser.parse_args()
     
     print("\n" + "="*70)
     print("🔬 VÉRIFICATION FINALE : CONJECTURE DE LYCHREL")
@@ -290,8 +313,19 @@ def main():
         print("   Exécutez d'abord analyse_palindrome_approfondie.py")
         return
     
+    if args.profile:
+        premier = args.profil_debut or 0
+        fin = premier + args.profil_taille
+        print(f"🔬 Profilage des palindromes de rang [{premier}, {fin}) dans ce processus")
+        profiler_tranche(args, verifier_palindromes_dans_k9, chemin_k9, chemin_palindromes,
+                         tranche=(premier, fin), prefixe=Path("profil_k9"), nombres=args.profil_taille)
+        return
+    
     # Vérification
-    resultats = verifier_palindromes_dans_k9(chemin_k9, chemin_palindromes)
+    telemetrie = Telemetrie(intervalle=0.0)
+    debut = time.time()
+    resultats = verifier_palindromes_dans_k9(chemin_k9, chemin_palindromes, telemetrie)
+    duree = time.time() - debut
     
     # Rapport final
     generer_rapport_final(resultats)
@@ -308,8 +342,11 @@ def main():
         'nb_erreurs': len(resultats['erreurs']),
         'palindromes_dans_k9': resultats['dans_k9'],
         'palindromes_hors_k9': [p['palindrome'] for p in resultats['hors_k9'][:100]],
-        'verdict': 'PALINDROMES_DANS_K9' if len(resultats['dans_k9']) > 0 else 'AUCUN_PALINDROME_DANS_K9'
+        'verdict': 'PALINDROMES_DANS_K9' if len(resultats['dans_k9']) > 0 else 'AUCUN_PALINDROME_DANS_K9',
+        'duree_secondes': duree,
+        'memoire': telemetrie.memoire()
     }
+    telemetrie.terminer()
     
     with open('verification_finale.json', 'w', encoding='utf-8') as f:
         json.dump(resultats_json, f, indent=2)